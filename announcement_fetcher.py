@@ -1,14 +1,18 @@
 # announcement_fetcher.py
 
-import feedparser
+import json
 import logging
 from datetime import datetime
 import re
+from utils.rss_poller import entry_guid, get_rss_poller
+from utils.listing_symbols import LISTING_KEYWORDS, is_listing_title, extract_listing_symbols
 
-BINANCE_RSS_FEED = "https://www.binance.com/en/support/announcement/rss"
+# Load config
+CONFIG_FILE = "config.json"
+with open(CONFIG_FILE, "r") as file:
+    CONFIG = json.load(file)
 
-# Keywords that usually indicate new listings
-LISTING_KEYWORDS = ["will list", "lists", "Binance listing", "listed on Binance"]
+BINANCE_RSS_FEED = CONFIG["dexscreener"].get("rss_feed_url", "https://www.binance.com/en/support/announcement/rss")
 
 # Setup logging
 logging.basicConfig(level=logging.INFO)
@@ -16,22 +20,23 @@ logging.basicConfig(level=logging.INFO)
 
 def fetch_rss_announcements():
     """
-    Fetch and parse announcements from Binance RSS feed.
+    Fetch and parse announcements from Binance RSS feed. The feed is requested
+    conditionally and entries acknowledged on an earlier call are skipped. Listings
+    keep being returned until they are passed to acknowledge_rss_announcements().
 
     Returns:
-        List of dicts with title, link, and published date for listing-related announcements.
+        List of dicts with guid, title, link, published date and the symbols read from
+        the title (None when the title alone is ambiguous) for listing-related announcements.
     """
     logging.info(f"📡 Fetching Binance RSS feed from {BINANCE_RSS_FEED}")
     try:
-        feed = feedparser.parse(BINANCE_RSS_FEED)
-
-        if feed.bozo:
-            logging.error(f"❌ Error parsing RSS feed: {feed.bozo_exception}")
-            return []
+        poller = get_rss_poller("announcement_fetcher", BINANCE_RSS_FEED)
+        entries = poller.poll_sync()
 
         new_listings = []
+        ignored = []
 
-        for entry in feed.entries:
+        for entry in entries:
             title = entry.get("title", "").strip()
             link = entry.get("link", "").strip()
             published = entry.get("published", "")
@@ -42,13 +47,18 @@ def fetch_rss_announcements():
             except Exception as e:
                 logging.warning(f"⚠️ Failed to parse publish date for entry: {title}")
 
-            if any(keyword.lower() in title.lower() for keyword in LISTING_KEYWORDS):
+            if is_listing_title(title):
                 logging.info(f"🆕 New listing found: {title}")
                 new_listings.append({
+                    "guid": entry_guid(entry),
                     "title": title,
                     "link": link,
-                    "published": published_dt
+                    "published": published_dt,
+                    "symbols": extract_listing_symbols(title)
                 })
+            else:
+                ignored.append(entry_guid(entry))
+        poller.acknowledge_sync(ignored)
 
         logging.info(f"✅ Total new listings found: {len(new_listings)}")
         return new_listings
@@ -56,3 +66,8 @@ def fetch_rss_announcements():
     except Exception as e:
         logging.error(f"❌ Exception while fetching RSS feed: {e}")
         return []
+
+
+def acknowledge_rss_announcements(listings):
+    """Mark listings returned by fetch_rss_announcements() as handled."""
+    get_rss_poller("announcement_fetcher", BINANCE_RSS_FEED).acknowledge_sync(listing.get("guid") for listing in listings)
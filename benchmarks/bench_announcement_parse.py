@@ -0,0 +1,96 @@
+# benchmarks/bench_announcement_parse.py
+# CPU time and bytes read per announcement page: the streaming title fast path in
+# parse_announcement_details against downloading the whole page and parsing it with
+# BeautifulSoup, served by the local stand-in from fake_services.py.
+#
+# Usage (from the repository root):
+#   python benchmarks/bench_announcement_parse.py --pages 50
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BENCHMARKS_DIR = os.path.join(REPO_ROOT, "benchmarks")
+sys.path[:0] = [REPO_ROOT, os.path.join(REPO_ROOT, "dexscreener_monitoring"), BENCHMARKS_DIR]
+os.chdir(REPO_ROOT)
+
+from fake_services import FakeServices  # noqa: E402
+import binance_announcement_utils  # noqa: E402
+from utils.http_client import get_http_session, close_http_session  # noqa: E402
+
+
+async def full_page_parse(url):
+    """The previous approach: read the whole body, then build the full soup."""
+    session = get_http_session()
+    async with session.get(url) as response:
+        body = await response.read()
+    symbol = binance_announcement_utils._symbol_from_page(body.decode("utf-8", errors="replace"))
+    return len(body), symbol
+
+
+async def fast_path_parse(url):
+    stats = binance_announcement_utils.PAGE_PARSE_STATS
+    before = stats["bytes_read"]
+    result = await binance_announcement_utils.parse_announcement_details(url)
+    return stats["bytes_read"] - before, result.get("symbol")
+
+
+async def measure(parse, urls):
+    # thread_time only counts this thread, not the stand-in services on their own thread
+    cpu_started = time.thread_time()
+    started = time.perf_counter()
+    total_bytes = 0
+    symbols = []
+    for url in urls:
+        read, symbol = await parse(url)
+        total_bytes += read
+        symbols.append(symbol)
+    return {
+        "cpu_ms_per_page": round((time.thread_time() - cpu_started) * 1000 / len(urls), 3),
+        "wall_ms_per_page": round((time.perf_counter() - started) * 1000 / len(urls), 3),
+        "bytes_read_per_page": total_bytes // len(urls),
+        "symbols": symbols,
+    }
+
+
+async def run(args):
+    urls = [f"{services.http_url}/en/support/announcement/{i}" for i in range(args.pages)]
+    try:
+        # Warm up the connection pool so neither path pays for connection setup
+        await full_page_parse(urls[0])
+        results = {
+            "full_page": await measure(full_page_parse, urls),
+            "fast_path": await measure(fast_path_parse, urls),
+        }
+    finally:
+        await close_http_session()
+    assert results["full_page"].pop("symbols") == results["fast_path"].pop("symbols")
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Announcement page parsing: fast path vs full parse")
+    parser.add_argument("--pages", type=int, default=50)
+    parser.add_argument("--output", help="Optional JSON results path")
+    args = parser.parse_args()
+
+    services = FakeServices(latency=0)
+    services.start_background()
+    try:
+        results = asyncio.run(run(args))
+    finally:
+        services.stop_background()
+
+    for name, summary in results.items():
+        print(
+            f"{name:<10} {summary['cpu_ms_per_page']:>8} ms CPU/page  "
+            f"{summary['wall_ms_per_page']:>8} ms wall/page  {summary['bytes_read_per_page']:>9} bytes/page"
+        )
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+            f.write("\n")
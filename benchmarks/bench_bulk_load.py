@@ -0,0 +1,99 @@
+# benchmarks/bench_bulk_load.py
+# Compares the execute_values insert path with the COPY staging path for coins and
+# token_profiles against the PostgreSQL configured in config.json. Every run happens
+# inside a transaction that is rolled back, so no rows are left behind.
+#
+# Usage (from the repository root):
+#   python benchmarks/bench_bulk_load.py --sizes 100 1000 10000 50000
+
+import argparse
+import json
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [REPO_ROOT, os.path.join(REPO_ROOT, "dexscreener_monitoring")]
+os.chdir(REPO_ROOT)
+
+from db import get_connection, close_db_pool  # noqa: E402
+import db_operations  # noqa: E402
+import dexscreener_api  # noqa: E402
+
+
+def coin_rows(count):
+    started = datetime(2024, 1, 1)
+    return [
+        (
+            f"BENCH{i}USDT", f"Bench {i}", "benchmark", (started + timedelta(seconds=i)).isoformat(),
+            "solana", f"bench{i:036d}", "", None, "", "", json.dumps([])
+        )
+        for i in range(count)
+    ]
+
+
+def profile_rows(count):
+    fetched_at = datetime.utcnow()
+    rows = []
+    for i in range(count):
+        row = (
+            f"bench{i:036d}", f"BENCH{i}", f"Bench {i}", "solana", datetime(2024, 1, 1), fetched_at,
+            None, None, None, f"Benchmark token {i}", json.dumps({}), json.dumps({"website": None})
+        )
+        rows.append(row + (dexscreener_api.profile_fingerprint(row),))
+    return rows
+
+
+def timed_rollback(write, rows, bulk):
+    with get_connection() as conn:
+        with conn.cursor() as cursor:
+            started = time.perf_counter()
+            write(cursor, rows, bulk=bulk)
+            elapsed = time.perf_counter() - started
+        conn.rollback()
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="execute_values vs COPY bulk load")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000, 50000])
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per size and path; the best is reported")
+    parser.add_argument("--output", help="Optional JSON results path")
+    args = parser.parse_args()
+
+    # The column is added outside the measured (rolled back) transactions
+    dexscreener_api._ensure_content_hash_column()
+
+    targets = {
+        "coins": (db_operations._write_coins, coin_rows),
+        "token_profiles": (dexscreener_api._write_token_profiles, profile_rows),
+    }
+    results = {}
+    try:
+        for table, (write, make_rows) in targets.items():
+            for size in args.sizes:
+                rows = make_rows(size)
+                timings = {}
+                for path, bulk in (("execute_values", False), ("copy", True)):
+                    timings[path] = min(timed_rollback(write, rows, bulk) for _ in range(args.repeat))
+                speedup = timings["execute_values"] / timings["copy"] if timings["copy"] else 0.0
+                results.setdefault(table, {})[size] = {
+                    path: {"seconds": round(t, 4), "rows_per_s": round(size / t, 1)} for path, t in timings.items()
+                }
+                print(
+                    f"{table:<15} {size:>7} rows  execute_values {size / timings['execute_values']:>10.0f} rows/s  "
+                    f"copy {size / timings['copy']:>10.0f} rows/s  ({speedup:.2f}x)",
+                    flush=True,
+                )
+    finally:
+        close_db_pool()
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+            f.write("\n")
+
+
+if __name__ == "__main__":
+    main()
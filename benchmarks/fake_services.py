@@ -0,0 +1,249 @@
+# benchmarks/fake_services.py
+# Local stand-ins for the Dexscreener API, the Binance announcement RSS feed and
+# pages, and the Binance WebSocket stream. Responses are built from the recorded
+# payloads in benchmarks/fixtures and scaled up to the requested sizes. The services
+# run on their own event loop thread so blocking client code (feedparser downloads)
+# cannot stall them.
+
+import asyncio
+import copy
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import Counter
+from email.utils import formatdate
+from aiohttp import web
+import websockets
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+
+def _load_fixture(name):
+    with open(os.path.join(FIXTURES_DIR, name), "r", encoding="utf-8") as f:
+        return f.read()
+
+
+def token_symbol(i):
+    return f"TK{i}"
+
+
+def token_address(i):
+    return f"0x{i:040x}"
+
+
+class FakeServices:
+    """
+    Serves the recorded payloads over HTTP and WebSocket on localhost.
+    `latency` seconds are added to every HTTP response to mimic the network.
+    """
+
+    def __init__(self, latency=0.02, trending_pairs=300, search_pairs=10, rss_items=20,
+                 ws_frames=500, coins_per_frame=50, missing_profile_every=5):
+        self.latency = latency
+        self.trending_pairs = trending_pairs
+        self.search_pairs = search_pairs
+        self.rss_items = rss_items
+        self.ws_frames = ws_frames
+        self.coins_per_frame = coins_per_frame
+        self.missing_profile_every = missing_profile_every
+
+        self.pair_template = json.loads(_load_fixture("pair.json"))
+        self.profile_template = json.loads(_load_fixture("token_profile.json"))
+        self.frame_template = json.loads(_load_fixture("websocket_frame.json"))
+        self.rss_feed_template = _load_fixture("rss_feed.xml")
+        self.rss_item_template = _load_fixture("rss_item.xml")
+        self.page_template = _load_fixture("announcement_page.html")
+
+        self.request_counts = Counter()
+        self.bytes_sent = Counter()
+        self.http_url = None
+        self.ws_url = None
+        self._runner = None
+        self._ws_server = None
+
+    # --------------------------------------------------------
+    # Payload builders
+    # --------------------------------------------------------
+    def make_pair(self, i, symbol=None, with_created_at=True):
+        pair = copy.deepcopy(self.pair_template)
+        pair["baseToken"]["symbol"] = symbol or token_symbol(i)
+        pair["baseToken"]["name"] = f"Token {i}"
+        pair["baseToken"]["address"] = token_address(i)
+        pair["pairAddress"] = f"pair{i:036d}"
+        pair["url"] = f"https://dexscreener.com/{pair['chainId']}/{pair['pairAddress']}"
+        pair["liquidity"]["usd"] = 1000 * (i % 20)
+        pair["fdv"] = 250_000 * (i % 10)
+        pair["pairCreatedAt"] = self.pair_template["pairCreatedAt"] + i * 60_000
+        if not with_created_at:
+            del pair["pairCreatedAt"]
+        return pair
+
+    def announcement_title(self, i):
+        return f"Binance Will List Token{i} ({token_symbol(i)})"
+
+    def render_rss(self):
+        items = []
+        for i in range(self.rss_items):
+            items.append(
+                self.rss_item_template
+                .replace("__TITLE__", self.announcement_title(i))
+                .replace("__LINK__", f"{self.http_url}/en/support/announcement/{i}")
+                .replace("__GUID__", f"announcement-{i}")
+                .replace("__PUBDATE__", formatdate(1717000000 + i * 3600, usegmt=True))
+            )
+        return self.rss_feed_template.replace("__ITEMS__", "".join(items))
+
+    def render_announcement(self, i):
+        head_padding = "\n".join(
+            f'<script id="chunk-{n}">window.__CHUNK_{n} = {json.dumps({"k": "v" * 1000, "n": n})};</script>'
+            for n in range(120)
+        )
+        body_padding = "\n".join(
+            f"<p>Risk warning paragraph {n}: trading involves significant risk and may not be suitable for all investors.</p>"
+            for n in range(400)
+        )
+        return (
+            self.page_template
+            .replace("__HEAD_PADDING__", head_padding)
+            .replace("__BODY_PADDING__", body_padding)
+            .replace("__TITLE__", self.announcement_title(i))
+            .replace("__NAME__", f"Token{i}")
+            .replace("__SYMBOL__", token_symbol(i))
+        )
+
+    def ws_frames_payload(self):
+        frames = []
+        for f in range(self.ws_frames):
+            frame = []
+            for c in range(self.coins_per_frame):
+                coin = dict(self.frame_template)
+                coin["s"] = f"C{(f * self.coins_per_frame + c) % 5000}USDT"
+                coin["E"] = 0  # event time, stamped when the frame is sent
+                frame.append(coin)
+            frames.append(json.dumps(frame))
+        return frames
+
+    # --------------------------------------------------------
+    # HTTP handlers
+    # --------------------------------------------------------
+    async def _respond(self, route, body, content_type="application/json", status=200):
+        self.request_counts[route] += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        if not isinstance(body, str):
+            body = json.dumps(body)
+        self.bytes_sent[route] += len(body)
+        return web.Response(text=body, content_type=content_type, status=status)
+
+    async def _search(self, request):
+        query = request.query.get("q", "")
+        pairs = [self.make_pair(i, symbol=query) for i in range(self.search_pairs)]
+        return await self._respond("search", {"schemaVersion": "1.0.0", "pairs": pairs})
+
+    async def _trending(self, request):
+        pairs = [self.make_pair(i, with_created_at=i % 2 == 0) for i in range(self.trending_pairs)]
+        return await self._respond("trending_pairs", {"schemaVersion": "1.0.0", "pairs": pairs})
+
+    async def _token_profile(self, request):
+        address = request.match_info["address"]
+        index = int(address, 16)
+        if self.missing_profile_every and index % self.missing_profile_every == 0:
+            return await self._respond("token_profiles", {}, status=404)
+        profile = copy.deepcopy(self.profile_template)
+        profile["tokenAddress"] = address
+        return await self._respond("token_profiles", profile)
+
+    async def _tokens(self, request):
+        addresses = request.match_info["addresses"].split(",")
+        pairs = [self.make_pair(int(address, 16)) for address in addresses]
+        return await self._respond("tokens", pairs)
+
+    async def _rss(self, request):
+        body = self.render_rss()
+        etag = f'"{hashlib.md5(body.encode("utf-8")).hexdigest()}"'
+        if request.headers.get("If-None-Match") == etag:
+            self.request_counts["rss"] += 1
+            return web.Response(status=304, headers={"ETag": etag})
+        response = await self._respond("rss", body, content_type="application/rss+xml")
+        response.headers["ETag"] = etag
+        return response
+
+    async def _announcement(self, request):
+        return await self._respond(
+            "announcement_page", self.render_announcement(int(request.match_info["id"])), content_type="text/html"
+        )
+
+    async def _ws_handler(self, websocket):
+        for frame in self.ws_frames_payload():
+            await websocket.send(frame.replace('"E": 0', f'"E": {int(time.time() * 1000)}'))
+        await websocket.wait_closed()
+
+    # --------------------------------------------------------
+    # Lifecycle
+    # --------------------------------------------------------
+    async def start(self):
+        app = web.Application()
+        app.router.add_get("/latest/dex/search", self._search)
+        app.router.add_get("/latest/dex/pairs", self._trending)
+        app.router.add_get("/token-profiles/latest/v1/{address}", self._token_profile)
+        app.router.add_get("/tokens/v1/{chain}/{addresses}", self._tokens)
+        app.router.add_get("/en/support/announcement/rss", self._rss)
+        app.router.add_get("/en/support/announcement/{id}", self._announcement)
+
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.http_url = f"http://127.0.0.1:{port}"
+
+        self._ws_server = await websockets.serve(self._ws_handler, "127.0.0.1", 0, close_timeout=0.1)
+        ws_port = self._ws_server.sockets[0].getsockname()[1]
+        self.ws_url = f"ws://127.0.0.1:{ws_port}"
+
+    async def stop(self):
+        if self._ws_server is not None:
+            self._ws_server.close()
+            await self._ws_server.wait_closed()
+        if self._runner is not None:
+            await self._runner.cleanup()
+
+    def start_background(self):
+        """Run the services on a dedicated event loop thread; returns once they are listening."""
+        self._loop = asyncio.new_event_loop()
+        ready = threading.Event()
+
+        def run():
+            asyncio.set_event_loop(self._loop)
+            self._loop.run_until_complete(self.start())
+            ready.set()
+            self._loop.run_forever()
+
+        self._thread = threading.Thread(target=run, name="fake-services", daemon=True)
+        self._thread.start()
+        ready.wait()
+
+    def stop_background(self):
+        asyncio.run_coroutine_threadsafe(self.stop(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+
+    def config_overrides(self):
+        """URL settings pointing every fetcher at these local services."""
+        return {
+            "dexscreener": {
+                "token_profiles_url": f"{self.http_url}/token-profiles/latest/v1",
+                "search_pairs_url": f"{self.http_url}/latest/dex/search?q=",
+                "trending_pairs_url": f"{self.http_url}/latest/dex/pairs",
+                "tokens_url": f"{self.http_url}/tokens/v1",
+                "rss_feed_url": f"{self.http_url}/en/support/announcement/rss",
+                "announcements_url": f"{self.http_url}/en/support/announcement/c-48",
+            },
+            "api": {
+                "binance": {"websocket_url": self.ws_url},
+                "dexscreener_url": f"{self.http_url}/latest/dex/search?q=USDT",
+            },
+        }
@@ -0,0 +1,427 @@
+# benchmarks/run_benchmarks.py
+# Offline benchmark suite. Starts the local stand-ins from fake_services.py, points
+# every fetcher at them through a generated config.json, drives the ingestion and
+# orchestration entry points and records throughput, peak memory and p50/p99 latency
+# over per-item samples (one per profile, symbol lookup, alert or WebSocket frame).
+#
+# Usage (from the repository root):
+#   python benchmarks/run_benchmarks.py --label baseline
+#   python benchmarks/run_benchmarks.py --compare benchmarks/results/baseline.json benchmarks/results/new.json
+#
+# Database writes are replaced with no-ops unless --database is given, in which case
+# the database block of the repository config.json is used.
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BENCHMARKS_DIR = os.path.join(REPO_ROOT, "benchmarks")
+sys.path[:0] = [REPO_ROOT, os.path.join(REPO_ROOT, "dexscreener_monitoring"), BENCHMARKS_DIR]
+
+from fake_services import FakeServices, token_address, token_symbol  # noqa: E402
+
+RESULTS_DIR = os.path.join(BENCHMARKS_DIR, "results")
+
+WORKLOADS = {}
+
+
+class LatencyRecorder:
+    """Per-item latency samples, collected only while a timed iteration runs."""
+
+    def __init__(self):
+        self.samples = None
+
+    def start(self):
+        self.samples = []
+
+    def stop(self):
+        samples, self.samples = self.samples or [], None
+        return samples
+
+    def record(self, seconds):
+        if self.samples is not None:
+            self.samples.append(seconds)
+
+
+LATENCY = LatencyRecorder()
+FRAME_EVENT_TIME_RE = re.compile(r'"E": (\d+)')
+
+
+def workload(name):
+    def register(func):
+        WORKLOADS[name] = func
+        return func
+    return register
+
+
+# --------------------------------------------------------
+# Workloads: each returns the number of items it processed.
+# Per-item latencies come from the hooks in instrument().
+# --------------------------------------------------------
+@workload("ingest_dexscreener_top_tokens")
+async def bench_ingest_top_tokens(modules, services, args):
+    await modules["dex_screener_ingest"].ingest_dexscreener_top_tokens()
+    return services.trending_pairs
+
+
+@workload("store_token_profiles")
+async def bench_store_token_profiles(modules, services, args):
+    tokens = [
+        {
+            "token_address": token_address(i),
+            "symbol": token_symbol(i),
+            "name": f"Token {i}",
+            "chain_id": "solana",
+            "links": {},
+        }
+        for i in range(services.trending_pairs)
+    ]
+    await modules["dexscreener_api"].store_token_profiles(tokens)
+    return len(tokens)
+
+
+@workload("orchestrate_binance_announcement_workflow")
+async def bench_binance_workflow(modules, services, args):
+    await modules["binance_announcement_orchestrator"].orchestrate_binance_announcement_workflow()
+    return services.rss_items
+
+
+@workload("orchestrate_dexscreener_discovery")
+async def bench_dexscreener_discovery(modules, services, args):
+    symbols = [token_symbol(i) for i in range(args.symbols)]
+    await modules["dexscreener_orchestrator"].orchestrate_dexscreener_discovery(symbols)
+    return len(symbols)
+
+
+@workload("binance_websocket_ingest")
+async def bench_websocket_ingest(modules, services, args):
+    coin_launch_monitor = modules["coin_launch_monitor"]
+    stats = coin_launch_monitor.WebSocketIngestStats()
+    ingest = asyncio.create_task(coin_launch_monitor.start_binance_websocket(services.ws_url, stats=stats))
+    try:
+        while stats.frames_processed + stats.frames_dropped < services.ws_frames:
+            if ingest.done():
+                ingest.result()
+            await asyncio.sleep(0.005)
+    finally:
+        ingest.cancel()
+        await asyncio.gather(ingest, return_exceptions=True)
+    return services.ws_frames
+
+
+# --------------------------------------------------------
+# Harness
+# --------------------------------------------------------
+def percentile(values, pct):
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    rank = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered) + 0.5) - 1))
+    return ordered[rank]
+
+
+def _deep_update(target, overrides):
+    for key, value in overrides.items():
+        if isinstance(value, dict) and isinstance(target.get(key), dict):
+            _deep_update(target[key], value)
+        else:
+            target[key] = value
+
+
+def prepare_workdir(services, args):
+    """Write a config.json pointing at the fake services into a scratch directory and chdir there."""
+    with open(os.path.join(REPO_ROOT, "config.json"), "r") as f:
+        config = json.load(f)
+    _deep_update(config, services.config_overrides())
+    config.setdefault("cache", {}).setdefault("persistent", {})["enabled"] = False
+    if args.rate_limit is None:
+        config["rate_limits"] = {"default": {"rate": 1_000_000, "burst": 1_000_000}}
+
+    workdir = tempfile.mkdtemp(prefix="cgcryptobot-bench-")
+    with open(os.path.join(workdir, "config.json"), "w") as f:
+        json.dump(config, f, indent=2)
+    os.chdir(workdir)
+    return workdir
+
+
+def import_modules(args):
+    # Imported only after the scratch config.json is in place; modules read it at import time
+    import coin_launch_monitor
+    import db_operations
+    import dex_screener_ingest
+    import dexscreener_api
+    import dexscreener_orchestrator
+    import binance_announcement_orchestrator
+
+    if not args.database:
+        dexscreener_api._upsert_token_profiles = lambda values: {"inserted": len(values), "updated": 0, "unchanged": 0}
+        db_operations._insert_coins = lambda values: None
+        db_operations.BINANCE_SYMBOL_INDEX.loader = lambda: []
+
+    logging.getLogger().setLevel(logging.WARNING)
+    modules = {
+        "coin_launch_monitor": coin_launch_monitor,
+        "db_operations": db_operations,
+        "dex_screener_ingest": dex_screener_ingest,
+        "dexscreener_api": dexscreener_api,
+        "dexscreener_orchestrator": dexscreener_orchestrator,
+        "binance_announcement_orchestrator": binance_announcement_orchestrator,
+    }
+    instrument(modules)
+    return modules
+
+
+def _timed(func):
+    async def timed(*args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return await func(*args, **kwargs)
+        finally:
+            LATENCY.record(time.perf_counter() - started)
+    return timed
+
+
+def instrument(modules):
+    """
+    Wrap the per-item steps of each workload so they record a latency sample:
+    enrichment of one token profile, one discovery symbol lookup, announcement fetched
+    to alert dispatched, and WebSocket frame event time to parse by a consumer.
+    """
+    dexscreener_api = modules["dexscreener_api"]
+    dexscreener_api._enrich_token_profile = _timed(dexscreener_api._enrich_token_profile)
+
+    dexscreener_orchestrator = modules["dexscreener_orchestrator"]
+    dexscreener_orchestrator._discover_symbol = _timed(dexscreener_orchestrator._discover_symbol)
+
+    orchestrator = modules["binance_announcement_orchestrator"]
+    fetch_announcements = orchestrator.fetch_latest_listing_announcements
+    dispatch_alerts = orchestrator.process_and_dispatch_alerts
+    announced_at = {}
+
+    async def fetch_and_stamp():
+        announcements = await fetch_announcements()
+        now = time.perf_counter()
+        for announcement in announcements:
+            announced_at[announcement["link"]] = now
+        return announcements
+
+    def dispatch_and_record(tokens):
+        now = time.perf_counter()
+        for token in tokens:
+            if token.get("source_announcement") in announced_at:
+                LATENCY.record(now - announced_at[token["source_announcement"]])
+        return dispatch_alerts(tokens)
+
+    orchestrator.fetch_latest_listing_announcements = fetch_and_stamp
+    orchestrator.process_and_dispatch_alerts = dispatch_and_record
+
+    coin_launch_monitor = modules["coin_launch_monitor"]
+    parse_frame = coin_launch_monitor._parse_binance_frame
+
+    def parse_and_record(message):
+        event_time = FRAME_EVENT_TIME_RE.search(message)
+        if event_time:
+            LATENCY.record(time.time() - int(event_time.group(1)) / 1000)
+        return parse_frame(message)
+
+    coin_launch_monitor._parse_binance_frame = parse_and_record
+
+
+def reset_state(modules, args):
+    """Drop in-process caches so every iteration measures the cold path (unless --warm)."""
+    if args.warm:
+        return
+    from utils import alert_dedup, response_cache, rss_poller
+    response_cache._caches.clear()
+    for poller in rss_poller._pollers.values():
+        poller.reset()
+    if alert_dedup._deduplicator is not None:
+        alert_dedup._deduplicator.reset()
+    index = modules["db_operations"].BINANCE_SYMBOL_INDEX
+    index.warmed = False
+
+
+async def run_workload(name, func, modules, services, args):
+    durations = []
+    latencies = []
+    items = 0
+    requests_before = dict(services.request_counts)
+    bytes_before = dict(services.bytes_sent)
+
+    for _ in range(args.iterations):
+        reset_state(modules, args)
+        LATENCY.start()
+        started = time.perf_counter()
+        try:
+            items += await func(modules, services, args)
+        finally:
+            durations.append(time.perf_counter() - started)
+            latencies.extend(LATENCY.stop())
+
+    requests = {
+        route: count - requests_before.get(route, 0)
+        for route, count in services.request_counts.items()
+        if count - requests_before.get(route, 0)
+    }
+    response_bytes = {
+        route: size - bytes_before.get(route, 0)
+        for route, size in services.bytes_sent.items()
+        if size - bytes_before.get(route, 0)
+    }
+
+    # Separate pass for memory so tracemalloc overhead does not skew the timings
+    reset_state(modules, args)
+    tracemalloc.start()
+    await func(modules, services, args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    total = sum(durations)
+    return {
+        "iterations": args.iterations,
+        "items_per_iteration": items // args.iterations,
+        "throughput_items_per_s": round(items / total, 2) if total else 0.0,
+        "iteration_mean_ms": round(total / len(durations) * 1000, 2),
+        "latency_samples": len(latencies),
+        "latency_p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "latency_p99_ms": round(percentile(latencies, 99) * 1000, 2),
+        "latency_mean_ms": round(sum(latencies) / len(latencies) * 1000, 2) if latencies else 0.0,
+        "peak_memory_kb": round(peak / 1024, 1),
+        "requests_per_iteration": {route: count / args.iterations for route, count in sorted(requests.items())},
+        "response_bytes_per_iteration": {route: size // args.iterations for route, size in sorted(response_bytes.items())},
+    }
+
+
+def git_revision():
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT, stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except Exception:
+        return None
+
+
+async def run_benchmarks(args):
+    scale = args.scale
+    services = FakeServices(
+        latency=args.latency_ms / 1000,
+        trending_pairs=int(300 * scale),
+        search_pairs=10,
+        rss_items=int(20 * scale),
+        ws_frames=int(500 * scale),
+        coins_per_frame=50,
+    )
+    services.start_background()
+    workdir = prepare_workdir(services, args)
+    results = {}
+    try:
+        modules = import_modules(args)
+        selected = args.only or list(WORKLOADS)
+        for name in selected:
+            print(f"▶ {name}", flush=True)
+            results[name] = await run_workload(name, WORKLOADS[name], modules, services, args)
+            summary = results[name]
+            print(
+                f"  {summary['throughput_items_per_s']} items/s, "
+                f"p50 {summary['latency_p50_ms']} ms, p99 {summary['latency_p99_ms']} ms "
+                f"over {summary['latency_samples']} items, "
+                f"peak {summary['peak_memory_kb']} KiB, requests {summary['requests_per_iteration']}",
+                flush=True,
+            )
+        from utils.http_client import close_http_session
+        from db import close_db_pool
+        from notification_framework import close_alert_dispatcher
+        await close_alert_dispatcher()
+        await close_http_session()
+        close_db_pool()
+    finally:
+        services.stop_background()
+        os.chdir(REPO_ROOT)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    return {
+        "label": args.label,
+        "git_revision": git_revision(),
+        "recorded_at": datetime.utcnow().isoformat(timespec="seconds") + "Z",
+        "python": platform.python_version(),
+        "parameters": {
+            "scale": args.scale,
+            "iterations": args.iterations,
+            "latency_ms": args.latency_ms,
+            "symbols": args.symbols,
+            "warm": args.warm,
+            "database": args.database,
+        },
+        "workloads": results,
+    }
+
+
+# --------------------------------------------------------
+# Result comparison
+# --------------------------------------------------------
+COMPARED_METRICS = ["throughput_items_per_s", "latency_p50_ms", "latency_p99_ms", "peak_memory_kb"]
+
+
+def compare_results(old_path, new_path):
+    with open(old_path) as f:
+        old = json.load(f)
+    with open(new_path) as f:
+        new = json.load(f)
+
+    print(f"{old.get('label')} ({old.get('git_revision')}) → {new.get('label')} ({new.get('git_revision')})")
+    for name in sorted(set(old["workloads"]) | set(new["workloads"])):
+        before = old["workloads"].get(name)
+        after = new["workloads"].get(name)
+        print(f"\n{name}")
+        if before is None or after is None:
+            print("  only present in one run")
+            continue
+        for metric in COMPARED_METRICS:
+            a, b = before.get(metric, 0), after.get(metric, 0)
+            change = f"{(b - a) / a * 100:+.1f}%" if a else "n/a"
+            print(f"  {metric:<26} {a:>12} → {b:>12}  ({change})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline CGCryptoBot benchmarks")
+    parser.add_argument("--label", default="current", help="Name of this run; results go to benchmarks/results/<label>.json")
+    parser.add_argument("--iterations", type=int, default=5)
+    parser.add_argument("--scale", type=float, default=1.0, help="Multiplier for payload sizes")
+    parser.add_argument("--latency-ms", type=float, default=20.0, help="Artificial latency per fake HTTP response")
+    parser.add_argument("--symbols", type=int, default=50, help="Watch-list size for the discovery workload")
+    parser.add_argument("--rate-limit", choices=["config"], default=None,
+                        help="Keep the configured rate limits instead of disabling them")
+    parser.add_argument("--warm", action="store_true", help="Keep caches between iterations")
+    parser.add_argument("--database", action="store_true", help="Write to the configured PostgreSQL instead of no-ops")
+    parser.add_argument("--only", nargs="+", choices=sorted(WORKLOADS), help="Run only these workloads")
+    parser.add_argument("--output", help="Explicit results path")
+    parser.add_argument("--compare", nargs=2, metavar=("OLD", "NEW"), help="Compare two saved result files")
+    args = parser.parse_args()
+
+    if args.compare:
+        compare_results(*args.compare)
+        return
+
+    results = asyncio.run(run_benchmarks(args))
+    output = args.output or os.path.join(RESULTS_DIR, f"{args.label}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(results, f, indent=2, sort_keys=True)
+        f.write("\n")
+    print(f"\n💾 Results saved to {output}")
+
+
+if __name__ == "__main__":
+    main()
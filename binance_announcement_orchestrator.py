@@ -7,71 +7,155 @@ import os
 from utils.logger import init_logger
 
 from binance_announcement_utils import (
-    fetch_latest_announcement_links,
+    acknowledge_listing_announcements,
+    fetch_latest_listing_announcements,
     parse_announcement_details,
-    enrich_token_details,
-    filter_legit_tokens
+    enrich_token_details
 )
+from notification_filtering import filter_legit_tokens
+from notification_framework import process_and_dispatch_alerts, close_alert_dispatcher
 # Load config
 with open("config.json") as f:
     config = json.load(f)
 
-# Initialize logging
-init_logger()
+WORKFLOW_CONFIG = config.get("binance", {}).get("announcement_workflow", {})
+
+
+class WorkflowStats:
+    def __init__(self):
+        self.parsed = 0
+        self.enriched = 0
+        self.alerted = 0
+        # Announcements (by id) with at least one enriched token / a failed stage
+        self.enriched_announcements = set()
+        self.failed = set()
+
+
+async def _parse_stage(link_queue, symbol_queue, stats):
+    """Parse announcement pages and pass extracted symbols on to enrichment."""
+    while True:
+        announcement = await link_queue.get()
+        link = announcement["link"]
+        try:
+            token_info = await parse_announcement_details(link)
+            if token_info and "symbol" in token_info:
+                symbol = token_info["symbol"]
+                logging.info(f"🔎 Extracted token symbol '{symbol}' from: {link}")
+                stats.parsed += 1
+                await symbol_queue.put((symbol, announcement))
+            else:
+                logging.warning(f"⚠️ No symbol found in announcement: {link}")
+        except Exception as e:
+            stats.failed.add(id(announcement))
+            logging.error(f"❌ Error parsing announcement {link}: {e}")
+        finally:
+            link_queue.task_done()
+
+
+async def _enrich_stage(symbol_queue, stats):
+    """Enrich each symbol from Dexscreener, filter it and alert straight away."""
+    while True:
+        symbol, announcement = await symbol_queue.get()
+        link = announcement["link"]
+        try:
+            enriched_list = await enrich_token_details(symbol)
+            for enriched in enriched_list:
+                enriched["source_announcement"] = link
+            stats.enriched += len(enriched_list)
+            if enriched_list:
+                stats.enriched_announcements.add(id(announcement))
+
+            filtered_tokens = filter_legit_tokens(enriched_list)
+            if filtered_tokens:
+                logging.info(f"📢 Dispatching alerts for {len(filtered_tokens)} {symbol} tokens.")
+                process_and_dispatch_alerts(filtered_tokens)
+                stats.alerted += len(filtered_tokens)
+        except Exception as e:
+            stats.failed.add(id(announcement))
+            logging.error(f"❌ Error enriching {symbol} from {link}: {e}")
+        finally:
+            symbol_queue.task_done()
+
 
 async def orchestrate_binance_announcement_workflow():
+    """
+    Fetch listing announcements, then run parse and enrich stages concurrently over
+    bounded queues. Announcements whose RSS title already names the tickers skip the
+    page parse. Each token is filtered and alerted as soon as it is enriched.
+    Announcements are acknowledged to the RSS poller only once they produced enriched
+    tokens without errors; the rest are fetched again on the next run.
+    """
     try:
         logging.info("🚀 Starting Binance announcement workflow")
 
-        # STEP 1: Fetch latest Binance announcement links
-        announcement_links = await fetch_latest_announcement_links(config=config)
+        # STEP 1: Fetch latest Binance listing announcements
+        announcements = await fetch_latest_listing_announcements()
 
-        if not announcement_links:
+        if not announcements:
             logging.warning("⚠️ No new Binance announcements found.")
             return
 
-        logging.info(f"📰 Found {len(announcement_links)} potential new listings.")
+        logging.info(f"📰 Found {len(announcements)} potential new listings.")
 
-        all_enriched_tokens = []
+        # STEP 2-5: parse → enrich → filter → alert, connected by bounded queues
+        queue_size = WORKFLOW_CONFIG.get("queue_size", 50)
+        link_queue = asyncio.Queue(maxsize=queue_size)
+        symbol_queue = asyncio.Queue(maxsize=queue_size)
+        stats = WorkflowStats()
 
-        # STEP 2: Parse each announcement to extract token symbols
-        for link in announcement_links:
-            try:
-                token_info = await parse_announcement_details(link)
-                if token_info and "symbol" in token_info:
-                    symbol = token_info["symbol"]
-                    logging.info(f"🔎 Extracted token symbol '{symbol}' from: {link}")
+        workers = [
+            asyncio.create_task(_parse_stage(link_queue, symbol_queue, stats))
+            for _ in range(WORKFLOW_CONFIG.get("parse_workers", 4))
+        ]
+        workers += [
+            asyncio.create_task(_enrich_stage(symbol_queue, stats))
+            for _ in range(WORKFLOW_CONFIG.get("enrich_workers", 4))
+        ]
 
-                    # STEP 3: Enrich token info from Dexscreener
-                    enriched_list = await enrich_token_details(symbol)
-                    for enriched in enriched_list:
-                        enriched["source_announcement"] = link
-                        all_enriched_tokens.append(enriched)
+        try:
+            for announcement in announcements:
+                if announcement["symbols"]:
+                    # Tickers read from the RSS title go straight to enrichment
+                    for symbol in announcement["symbols"]:
+                        logging.info(f"🔎 Extracted token symbol '{symbol}' from title: {announcement['title']}")
+                        await symbol_queue.put((symbol, announcement))
                 else:
-                    logging.warning(f"⚠️ No symbol found in announcement: {link}")
-            except Exception as e:
-                logging.error(f"❌ Error parsing announcement {link}: {e}")
+                    await link_queue.put(announcement)
+            await link_queue.join()
+            await symbol_queue.join()
+        finally:
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
 
-        if not all_enriched_tokens:
-            logging.info("ℹ️ No enriched token data to process.")
-            return
+        handled = [
+            announcement for announcement in announcements
+            if id(announcement) in stats.enriched_announcements and id(announcement) not in stats.failed
+        ]
+        await acknowledge_listing_announcements(handled)
+        if len(handled) < len(announcements):
+            logging.info(f"🔁 {len(announcements) - len(handled)} announcements left for retry on the next run")
 
-        # STEP 4: Filter only legit-looking tokens using initial heuristics
-        filtered_tokens = filter_legit_tokens(all_enriched_tokens)
-        logging.info(f"✅ {len(filtered_tokens)} tokens passed legitimacy filters.")
-
-        # STEP 5: Trigger notifications if any
-        if filtered_tokens:
-            logging.info(f"📢 Dispatching alerts for {len(filtered_tokens)} tokens.")
-            process_and_dispatch_alerts(filtered_tokens, config=config)
-        else:
+        if not stats.enriched:
+            logging.info("ℹ️ No enriched token data to process.")
+        elif not stats.alerted:
             logging.info("ℹ️ No tokens passed filters. No alerts sent.")
+        else:
+            logging.info(f"✅ {stats.alerted} of {stats.enriched} enriched tokens passed legitimacy filters.")
 
     except Exception as e:
         logging.error(f"❌ Critical failure in Binance orchestrator: {e}")
 
+async def main():
+    try:
+        await orchestrate_binance_announcement_workflow()
+    finally:
+        await close_alert_dispatcher()
+
 if __name__ == "__main__":
+    # Initialize logging (only when run as a script, so importing this module has no side effects)
+    init_logger()
     try:
-        asyncio.run(orchestrate_binance_announcement_workflow())
+        asyncio.run(main())
     except KeyboardInterrupt:
         logging.info("🛑 Interrupted by user")
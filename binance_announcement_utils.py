@@ -1,64 +1,143 @@
 # binance_announcement_utils.py
 
+import html as html_lib
+import json
 import logging
 import re
-import aiohttp
-import feedparser
+from collections import Counter
 from bs4 import BeautifulSoup
+from utils.http_client import get_http_session
+from utils.rss_poller import entry_guid, get_rss_poller
+from utils.listing_symbols import extract_listing_symbols
+from dexscreener_monitoring.dexscreener_utils import fetch_token_profiles
 
-BINANCE_ANNOUNCEMENT_RSS = "https://www.binance.com/en/support/announcement/rss"
+# Load config
+CONFIG_FILE = "config.json"
+with open(CONFIG_FILE, "r") as file:
+    CONFIG = json.load(file)
+
+BINANCE_ANNOUNCEMENT_RSS = CONFIG["dexscreener"].get("rss_feed_url", "https://www.binance.com/en/support/announcement/rss")
 DEXSCREENER_SEARCH_URL = "https://api.dexscreener.com/latest/dex/search"
 
-async def fetch_latest_announcement_links():
+async def fetch_latest_listing_announcements():
     """
-    Fetches new listing announcement links from Binance RSS feed.
+    Fetches new listing announcements from Binance RSS feed as dicts with guid, link,
+    title and the symbols read from the title (None when the page has to be parsed
+    instead). Listings are returned again by later calls until they are passed to
+    acknowledge_listing_announcements(); other entries are acknowledged straight away.
     """
     try:
         logging.info("📡 Fetching Binance announcements RSS...")
-        feed = feedparser.parse(BINANCE_ANNOUNCEMENT_RSS)
+        poller = get_rss_poller("binance_announcements", BINANCE_ANNOUNCEMENT_RSS)
+        entries = await poller.poll()
 
-        links = []
-        for entry in feed.entries:
+        announcements = []
+        ignored = []
+        for entry in entries:
             title = entry.get("title", "")
-            link = entry.get("link", "")
-            if "Will List" in title:
-                logging.debug(f"🧲 Matched listing title: {title}")
-                links.append(link)
+            symbols = extract_listing_symbols(title)
+            if symbols == []:
+                ignored.append(entry_guid(entry))
+                continue
+            logging.debug(f"🧲 Matched listing title: {title} → {symbols or 'needs page parse'}")
+            announcements.append({"guid": entry_guid(entry), "link": entry.get("link", ""), "title": title, "symbols": symbols})
+        await poller.acknowledge(ignored)
 
-        logging.info(f"✅ Found {len(links)} potential listing announcements")
-        return links
+        logging.info(f"✅ Found {len(announcements)} potential listing announcements")
+        return announcements
 
     except Exception as e:
         logging.error(f"❌ Error fetching Binance announcements: {e}")
         return []
 
 
+async def acknowledge_listing_announcements(announcements):
+    """
+    Marks announcements as handled so the RSS poller stops returning them.
+    """
+    guids = [announcement.get("guid") for announcement in announcements]
+    await get_rss_poller("binance_announcements", BINANCE_ANNOUNCEMENT_RSS).acknowledge(guids)
+
+
+async def fetch_latest_announcement_links():
+    """
+    Fetches new listing announcement links from Binance RSS feed. The links are
+    treated as handed off, so the announcements are acknowledged right away.
+    """
+    announcements = await fetch_latest_listing_announcements()
+    await acknowledge_listing_announcements(announcements)
+    return [announcement["link"] for announcement in announcements]
+
+
+LISTING_TITLE_RE = re.compile(r'Binance Will List\s+([A-Z0-9]+)')
+TITLE_TAG_RE = re.compile(rb"<title[^>]*>(.*?)</title\s*>", re.IGNORECASE | re.DOTALL)
+HEADER_TAG_RE = re.compile(rb"<h1[^>]*>(.*?)</h1\s*>", re.IGNORECASE | re.DOTALL)
+TAG_SCAN_OVERLAP = 4096
+ANNOUNCEMENT_PAGE_CONFIG = CONFIG.get("binance", {}).get("announcement_page", {})
+
+# Totals across calls: bytes_read, fast_path, full_parse
+PAGE_PARSE_STATS = Counter()
+
+
+def _tag_text(raw, encoding):
+    return html_lib.unescape(re.sub(r"<[^>]+>", "", raw.decode(encoding, errors="replace"))).strip()
+
+
+def _symbol_from_page(html):
+    """Full-document fallback: build the soup and read <title>."""
+    soup = BeautifulSoup(html, "html.parser")
+    title_tag = soup.find("title")
+
+    if title_tag:
+        title = title_tag.text
+        logging.debug(f"🔍 Parsing title: {title}")
+        match = LISTING_TITLE_RE.search(title)
+        if match:
+            return match.group(1)
+        logging.warning(f"⚠️ Symbol not found in title: {title}")
+    else:
+        logging.warning("⚠️ Title tag not found in HTML")
+    return None
+
+
 async def parse_announcement_details(url):
     """
     Parses the token symbol from the Binance listing announcement page.
+    The body is read in chunks and scanned for the <title> (then the <h1> listing
+    header); reading stops as soon as either yields a symbol. Only pages where
+    neither matches are read in full and parsed with BeautifulSoup.
     """
+    chunk_size = ANNOUNCEMENT_PAGE_CONFIG.get("chunk_size", 16384)
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url) as response:
-                if response.status != 200:
-                    logging.warning(f"⚠️ Non-200 response while parsing {url}: {response.status}")
-                    return {}
-
-                html = await response.text()
-                soup = BeautifulSoup(html, "html.parser")
-                title_tag = soup.find("title")
-
-                if title_tag:
-                    title = title_tag.text
-                    logging.debug(f"🔍 Parsing title: {title}")
-                    match = re.search(r'Binance Will List\s+([A-Z0-9]+)', title)
+        session = get_http_session()
+        async with session.get(url) as response:
+            if response.status != 200:
+                logging.warning(f"⚠️ Non-200 response while parsing {url}: {response.status}")
+                return {}
+
+            encoding = response.charset or "utf-8"
+            buffer = bytearray()
+            async for chunk in response.content.iter_chunked(chunk_size):
+                # Rescan a little of the previous data in case a tag straddles chunks
+                scan_from = max(0, len(buffer) - TAG_SCAN_OVERLAP)
+                buffer += chunk
+                PAGE_PARSE_STATS["bytes_read"] += len(chunk)
+
+                for pattern in (TITLE_TAG_RE, HEADER_TAG_RE):
+                    tag = pattern.search(buffer, scan_from)
+                    if not tag:
+                        continue
+                    match = LISTING_TITLE_RE.search(_tag_text(tag.group(1), encoding))
                     if match:
-                        symbol = match.group(1)
-                        return {"symbol": symbol, "url": url}
-                    else:
-                        logging.warning(f"⚠️ Symbol not found in title: {title}")
-                else:
-                    logging.warning("⚠️ Title tag not found in HTML")
+                        PAGE_PARSE_STATS["fast_path"] += 1
+                        # The rest of the page is not needed; drop the connection instead of draining it
+                        response.close()
+                        return {"symbol": match.group(1), "url": url}
+
+            PAGE_PARSE_STATS["full_parse"] += 1
+            symbol = _symbol_from_page(buffer.decode(encoding, errors="replace"))
+            if symbol:
+                return {"symbol": symbol, "url": url}
 
         return {}
 
@@ -67,7 +146,6 @@ async def parse_announcement_details(url):
         return {}
 
 
-
 async def enrich_token_details(symbol):
     """
     Enrich token with details from Dexscreener.
@@ -81,24 +159,3 @@ async def enrich_token_details(symbol):
     except Exception as e:
         logging.error(f"❌ Error enriching token {symbol}: {e}")
         return []
-
-
-def filter_legit_tokens(token_list):
-    """
-    Apply rough filters to exclude obvious scams. This is just framework.
-    """
-    try:
-        logging.info("🔍 Filtering legit tokens from enriched list")
-        filtered = []
-
-        for token in token_list:
-            if token.get("fdv") and token["fdv"] > 1_000_000 and token.get("liquidity") > 5000:
-                filtered.append(token)
-            else:
-                logging.debug(f"🧹 Skipped token: {token.get('symbol')} due to weak metrics")
-
-        return filtered
-
-    except Exception as e:
-        logging.error(f"❌ Error filtering legit tokens: {e}")
-        return []
@@ -1,10 +1,12 @@
 import asyncio
 import logging
 import json
+import random
 import websockets
-import requests
 from datetime import datetime, timedelta
-from db_operations import store_coins
+from db_operations import store_coins, warm_binance_symbol_index
+from utils.http_client import get_http_session
+from utils.request_scheduler import get_rate_limiter
 import time
 
 # Load config
@@ -17,27 +19,10 @@ LOG_FILE = CONFIG.get("logging", {}).get("log_file", "CGcryptobot.log")
 logging.basicConfig(filename=LOG_FILE, level=logging.DEBUG, format='%(asctime)s - %(levelname)s - %(message)s')
 
 BINANCE_WS_URL = CONFIG["api"]["binance"]["websocket_url"]
+WS_CONFIG = CONFIG["api"]["binance"].get("websocket", {})
 DEX_SCREENER_API_URL = CONFIG["api"]["dexscreener_url"]
 
 
-# ------------------------------------------------------
-# Fetch DEX Token Profile (links and social media info)
-# ------------------------------------------------------
-async def fetch_dexscreener_links_extra(token_address):
-    url = f"https://api.dexscreener.com/token-profiles/latest/v1/{token_address}"
-    try:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    return data.get("links")
-                else:
-                    logging.debug(f"Dexscreener profile not found for token: {token_address}, status: {response.status}, URL: {url}")
-    except Exception as e:
-        logging.warning(f"Error fetching token profile from {url}: {e}")
-    return {}
-
-
 async def fetch_new_coins_from_dex():
     """
     Fetch newly launched coins from Dex Screener API and store them.
@@ -45,11 +30,16 @@ async def fetch_new_coins_from_dex():
     """
     logging.info("Fetching new coins from Dex Screener...")
     try:
-        response = requests.get(DEX_SCREENER_API_URL)
-        logging.info(f"Dex Screener API status code: {response.status_code}")
-
-        if response.status_code == 200:
-            data = response.json()
+        limiter = get_rate_limiter("search")
+        await limiter.acquire()
+        session = get_http_session()
+        async with session.get(DEX_SCREENER_API_URL) as response:
+            logging.info(f"Dex Screener API status code: {response.status}")
+            if response.status == 429:
+                limiter.pause(float(response.headers.get("Retry-After", 1)))
+            data = await response.json() if response.status == 200 else None
+
+        if data is not None:
             new_coins = []
 
             if 'pairs' in data:
@@ -69,50 +59,174 @@ async def fetch_new_coins_from_dex():
             if new_coins:
                 await store_coins(new_coins, "dexscreener")
         else:
-            logging.error(f"Dex Screener API error: {response.status_code}")
+            logging.error(f"Dex Screener API error: {response.status}")
 
     except Exception as e:
         logging.error(f"Error fetching from Dex Screener: {e}")
 
 
-async def start_binance_websocket():
+# ------------------------------------------------------
+# Binance WebSocket streaming ingestion
+# ------------------------------------------------------
+class WebSocketIngestStats:
+    """Counters for the Binance WebSocket ingestor, logged periodically."""
+
+    def __init__(self):
+        self.frames_received = 0
+        self.frames_processed = 0
+        self.frames_dropped = 0
+        self.coins_stored = 0
+        self.reconnects = 0
+        self.backlog = 0
+        self._last_report_at = time.monotonic()
+        self._last_report_frames = 0
+
+    def frames_per_second(self):
+        """Frames received per second since the previous call."""
+        now = time.monotonic()
+        elapsed = now - self._last_report_at
+        rate = (self.frames_received - self._last_report_frames) / elapsed if elapsed > 0 else 0.0
+        self._last_report_at = now
+        self._last_report_frames = self.frames_received
+        return rate
+
+
+def _parse_binance_frame(message):
     """
-    Listen to Binance WebSocket for newly listed coins and store them.
+    Coins from a ticker frame (e.g. !miniTicker@arr). Only the symbol ("s") is required;
+    Binance ticker streams carry no asset name, so "n" is used only when a stream sends it.
     """
-    try:
-        async with websockets.connect(BINANCE_WS_URL) as websocket:
-            logging.info("Connected to Binance WebSocket.")
-            while True:
+    data = json.loads(message)
+    if isinstance(data, dict):
+        data = [data]
+    return [
+        {
+            "symbol": coin["s"],
+            "name": coin.get("n"),
+            "source": "binance",
+            "created_at": datetime.utcnow()
+        }
+        for coin in data if "s" in coin
+    ]
+
+
+async def _read_binance_frames(url, queue, stats):
+    """
+    Drain frames from the WebSocket into the bounded queue, reconnecting with
+    jittered exponential backoff. When the queue is full the oldest frame is dropped.
+    """
+    attempt = 0
+    while True:
+        try:
+            async with websockets.connect(url) as websocket:
+                logging.info("Connected to Binance WebSocket.")
+                attempt = 0
+                async for message in websocket:
+                    stats.frames_received += 1
+                    if queue.full():
+                        queue.get_nowait()
+                        queue.task_done()
+                        stats.frames_dropped += 1
+                    queue.put_nowait(message)
+                    stats.backlog = queue.qsize()
+            logging.warning("Binance WebSocket closed by server.")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logging.error(f"WebSocket Error: {e}")
+
+        stats.reconnects += 1
+        delay = min(WS_CONFIG.get("reconnect_max_delay", 60), WS_CONFIG.get("reconnect_base_delay", 1) * 2 ** attempt)
+        attempt += 1
+        delay = random.uniform(delay / 2, delay)
+        logging.info(f"Reconnecting to Binance WebSocket in {delay:.1f}s (attempt {attempt}).")
+        await asyncio.sleep(delay)
+
+
+async def _consume_binance_frames(queue, stats):
+    """Batch queued frames and hand the parsed coins to store_coins."""
+    batch_size = WS_CONFIG.get("batch_size", 200)
+    batch_timeout = WS_CONFIG.get("batch_timeout", 1.0)
+    loop = asyncio.get_running_loop()
+
+    while True:
+        frames = [await queue.get()]
+        deadline = loop.time() + batch_timeout
+        while len(frames) < batch_size:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                frames.append(await asyncio.wait_for(queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+
+        try:
+            new_coins_data = {}
+            for message in frames:
                 try:
-                    time.sleep(5)
-                    response = await websocket.recv()
-                    data = json.loads(response)
-                    
-                    new_coins_data = [
-                        {
-                            "symbol": coin["s"],
-                            "name": coin["n"],
-                            "source": "binance",
-                            "created_at": datetime.utcnow()
-                        }
-                        for coin in data if "s" in coin and "n" in coin
-                    ]
-
-                    if new_coins_data:
-                        #logging.info(f"New Binance coins detected: {[c['symbol'] for c in new_coins_data]}")
-                        await store_coins(new_coins_data, "binance")
-
+                    for coin in _parse_binance_frame(message):
+                        new_coins_data[coin["symbol"]] = coin
                 except Exception as e:
-                    logging.error(f"WebSocket Error: {e}")
-                    await asyncio.sleep(5)
-    except Exception as e:
-        logging.error(f"Failed to connect to Binance WebSocket: {e}")
+                    logging.error(f"Skipping malformed Binance frame: {e}")
+
+            if new_coins_data:
+                await store_coins(list(new_coins_data.values()), "binance")
+                stats.coins_stored += len(new_coins_data)
+        except Exception as e:
+            logging.error(f"Error storing Binance WebSocket batch: {e}")
+        finally:
+            stats.frames_processed += len(frames)
+            stats.backlog = queue.qsize()
+            for _ in frames:
+                queue.task_done()
+
+
+async def _report_binance_stats(stats):
+    interval = WS_CONFIG.get("stats_interval", 60)
+    while True:
+        await asyncio.sleep(interval)
+        logging.info(
+            f"Binance WebSocket: {stats.frames_per_second():.1f} frames/s, "
+            f"backlog {stats.backlog}, dropped {stats.frames_dropped}, "
+            f"processed {stats.frames_processed}, reconnects {stats.reconnects}"
+        )
+
+
+async def start_binance_websocket(url=BINANCE_WS_URL, stats=None):
+    """
+    Listen to Binance WebSocket for newly listed coins and store them.
+    A reader task fills a bounded queue; consumer tasks batch frames into store_coins.
+    """
+    stats = stats or WebSocketIngestStats()
+    queue = asyncio.Queue(maxsize=WS_CONFIG.get("queue_size", 1000))
+
+    tasks = [
+        asyncio.create_task(_read_binance_frames(url, queue, stats)),
+        asyncio.create_task(_report_binance_stats(stats)),
+    ]
+    tasks += [
+        asyncio.create_task(_consume_binance_frames(queue, stats))
+        for _ in range(WS_CONFIG.get("consumers", 2))
+    ]
+
+    try:
+        await asyncio.gather(*tasks)
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
 
 
 async def monitor_coins():
     """
     Run Binance WebSocket and Dex Screener polling in parallel.
     """
+    try:
+        await warm_binance_symbol_index()
+    except Exception as e:
+        logging.error(f"Failed to warm Binance symbol index: {e}")
+
     async def periodic_dex_screener():
         while True:
             await fetch_new_coins_from_dex()
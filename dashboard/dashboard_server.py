@@ -1,13 +1,162 @@
-# utils/logger.py
+# dashboard/dashboard_server.py
+# Async dashboard served from the in-process live feed (utils/live_feed.py): recent
+# coins, token profiles and alerts as JSON, plus a Server-Sent Events stream that
+# pushes new events as the pipelines publish them. Nothing here reads Postgres or
+# alerts.json.
 
+import asyncio
+import json
 import logging
+from aiohttp import web
+from utils.live_feed import CHANNELS, LiveFeed, get_live_feed
 
-def init_logger():
-    logging.basicConfig(
-        level=logging.INFO,
-        format="%(asctime)s - %(levelname)s - %(message)s",
-        handlers=[
-            logging.StreamHandler(),
-            logging.FileHandler("app.log", mode="a", encoding="utf-8")
-        ]
-    )
+# Load config
+CONFIG_FILE = "config.json"
+with open(CONFIG_FILE, "r") as file:
+    CONFIG = json.load(file)
+
+DASHBOARD_CONFIG = CONFIG.get("dashboard", {})
+
+FEED_KEY = web.AppKey("feed", LiveFeed)
+
+INDEX_HTML = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>CGcryptobot dashboard</title>
+<style>
+body { font-family: sans-serif; margin: 1em; }
+section { display: inline-block; vertical-align: top; width: 32%; }
+li { font-family: monospace; font-size: 0.85em; }
+</style>
+</head>
+<body>
+<section><h2>Alerts</h2><ul id="alerts"></ul></section>
+<section><h2>Coins</h2><ul id="coins"></ul></section>
+<section><h2>Token profiles</h2><ul id="token_profiles"></ul></section>
+<script>
+const MAX_ROWS = 200;
+function show(channel, item) {
+  const list = document.getElementById(channel);
+  const row = document.createElement("li");
+  row.textContent = [item.symbol, item.chain || item.chain_id || item.source, item.priceUsd || item.token_address || ""]
+    .filter(Boolean).join("  ");
+  list.prepend(row);
+  while (list.children.length > MAX_ROWS) list.lastChild.remove();
+}
+const source = new EventSource("/events");
+for (const channel of ["alerts", "coins", "token_profiles"]) {
+  source.addEventListener(channel, event => show(channel, JSON.parse(event.data)));
+}
+</script>
+</body>
+</html>
+"""
+
+
+def _event_json(event):
+    event_id, channel, payload = event
+    return {"id": event_id, "channel": channel, **payload}
+
+
+def _sse_frame(event):
+    event_id, channel, payload = event
+    return f"id: {event_id}\nevent: {channel}\ndata: {json.dumps(payload, default=str)}\n\n".encode()
+
+
+# --------------------------------------------------------
+# Handlers
+# --------------------------------------------------------
+async def index(request):
+    return web.Response(text=INDEX_HTML, content_type="text/html")
+
+
+async def recent(request):
+    """GET /api/{channel}?limit=N&after=ID — buffered events, oldest first."""
+    channel = request.match_info["channel"]
+    if channel not in CHANNELS:
+        raise web.HTTPNotFound(text=f"Unknown channel {channel}")
+    try:
+        limit = int(request.query.get("limit", 0)) or None
+        after = int(request.query.get("after", 0))
+    except ValueError:
+        raise web.HTTPBadRequest(text="limit and after must be integers")
+    events = request.app[FEED_KEY].recent(channel, limit=limit, after=after)
+    return web.json_response([_event_json(event) for event in events], dumps=lambda obj: json.dumps(obj, default=str))
+
+
+async def stats(request):
+    return web.json_response(request.app[FEED_KEY].stats())
+
+
+async def events(request):
+    """
+    GET /events?channels=alerts,coins — SSE stream. Buffered events newer than the
+    Last-Event-ID header are replayed first, then new events are pushed as published.
+    """
+    feed = request.app[FEED_KEY]
+    channels = [c for c in request.query.get("channels", ",".join(CHANNELS)).split(",") if c in CHANNELS]
+    if not channels:
+        raise web.HTTPBadRequest(text="No known channels requested")
+    try:
+        last_id = int(request.headers.get("Last-Event-ID", 0))
+    except ValueError:
+        last_id = 0
+
+    response = web.StreamResponse(headers={
+        "Content-Type": "text/event-stream",
+        "Cache-Control": "no-cache",
+        "X-Accel-Buffering": "no",
+    })
+    # Subscribe before the headers go out so nothing published after connecting is missed
+    subscription = feed.subscribe(channels)
+    try:
+        await response.prepare(request)
+        if last_id:
+            backlog = sorted(event for channel in channels for event in feed.recent(channel, after=last_id))
+            for event in backlog:
+                await response.write(_sse_frame(event))
+        heartbeat = DASHBOARD_CONFIG.get("heartbeat", 15)
+        while True:
+            try:
+                event = await asyncio.wait_for(subscription.get(), heartbeat)
+            except asyncio.TimeoutError:
+                await response.write(b": keep-alive\n\n")
+                continue
+            if event is None:
+                break
+            await response.write(_sse_frame(event))
+    except ConnectionResetError:
+        pass
+    finally:
+        subscription.close()
+    return response
+
+
+def create_app(feed=None):
+    app = web.Application()
+    app[FEED_KEY] = feed or get_live_feed()
+    app.router.add_get("/", index)
+    app.router.add_get("/api/stats", stats)
+    app.router.add_get("/api/{channel}", recent)
+    app.router.add_get("/events", events)
+    return app
+
+
+async def start_dashboard_server(host=None, port=None):
+    """
+    Serve the dashboard until cancelled. There is no authentication, so it listens on
+    loopback unless dashboard.host (or `host`) opts in to a wider bind such as 0.0.0.0.
+    """
+    host = host or DASHBOARD_CONFIG.get("host", "127.0.0.1")
+    port = port if port is not None else DASHBOARD_CONFIG.get("port", 5050)
+    # Cancel SSE handlers as soon as their client disconnects instead of at the next heartbeat
+    runner = web.AppRunner(create_app(), handler_cancellation=True)
+    await runner.setup()
+    site = web.TCPSite(runner, host, port)
+    await site.start()
+    logging.info(f"📊 Dashboard listening on http://{host}:{port}")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await runner.cleanup()
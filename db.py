@@ -0,0 +1,200 @@
+# db.py
+# Pooled PostgreSQL access shared by every module. Connections are borrowed
+# with get_connection() and returned to the pool when the block exits.
+# Coroutines hand blocking database work to run_db_task() so it runs on a
+# dedicated writer thread pool instead of the event loop. Large batches can be
+# streamed into a staging table with copy_to_staging() before merging.
+
+import asyncio
+import json
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+import psycopg2
+from psycopg2 import pool
+
+# Load config
+CONFIG_FILE = "config.json"
+with open(CONFIG_FILE, "r") as file:
+    CONFIG = json.load(file)
+
+DB_CONFIG = CONFIG["database"]
+COPY_THRESHOLD = DB_CONFIG.get("copy_threshold", 1000)
+
+_pool = None
+_pool_slots = None
+_pool_lock = threading.Lock()
+_last_used = {}
+
+_db_executor = None
+_handoff_slots = None
+_handoff_loop = None
+
+
+def get_db_pool():
+    """Return the process-wide connection pool, creating it on first use."""
+    global _pool, _pool_slots
+    with _pool_lock:
+        if _pool is None or _pool.closed:
+            max_size = DB_CONFIG.get("pool_max_size", 10)
+            _pool = pool.ThreadedConnectionPool(
+                DB_CONFIG.get("pool_min_size", 1),
+                max_size,
+                dbname=DB_CONFIG["dbname"],
+                user=DB_CONFIG["user"],
+                password=DB_CONFIG["password"],
+                host=DB_CONFIG["host"],
+                port=DB_CONFIG["port"],
+                connect_timeout=DB_CONFIG.get("connect_timeout", 5)
+            )
+            _pool_slots = threading.BoundedSemaphore(max_size)
+            _last_used.clear()
+            logging.info(f"Created PostgreSQL connection pool (max {max_size} connections).")
+        return _pool
+
+
+def _is_healthy(conn):
+    if conn.closed:
+        return False
+    last_used = _last_used.get(id(conn))
+    if last_used is None or time.monotonic() - last_used < DB_CONFIG.get("health_check_interval", 30):
+        return True
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute("SELECT 1")
+        conn.rollback()
+        return True
+    except Exception as e:
+        logging.warning(f"Discarding unhealthy pooled connection: {e}")
+        return False
+
+
+def _borrow(db_pool):
+    for _ in range(DB_CONFIG.get("pool_max_size", 10) + 1):
+        conn = db_pool.getconn()
+        if _is_healthy(conn):
+            return conn
+        _last_used.pop(id(conn), None)
+        db_pool.putconn(conn, close=True)
+    raise psycopg2.OperationalError("No healthy connection available in pool")
+
+
+@contextmanager
+def get_connection():
+    """
+    Borrow a connection from the pool for the duration of the block.
+    Blocks up to `pool_timeout` seconds when every connection is in use.
+    Uncommitted work is rolled back before the connection is returned.
+    """
+    db_pool = get_db_pool()
+    slots = _pool_slots
+    if not slots.acquire(timeout=DB_CONFIG.get("pool_timeout", 10)):
+        raise pool.PoolError("Timed out waiting for a database connection")
+
+    conn = None
+    try:
+        conn = _borrow(db_pool)
+        yield conn
+    finally:
+        if conn is not None:
+            broken = bool(conn.closed)
+            if not broken:
+                try:
+                    conn.rollback()
+                except Exception:
+                    broken = True
+            if broken:
+                _last_used.pop(id(conn), None)
+            else:
+                _last_used[id(conn)] = time.monotonic()
+            db_pool.putconn(conn, close=broken)
+        slots.release()
+
+
+def _get_db_executor():
+    global _db_executor
+    with _pool_lock:
+        if _db_executor is None:
+            _db_executor = ThreadPoolExecutor(
+                max_workers=DB_CONFIG.get("writer_threads", 4),
+                thread_name_prefix="db-writer"
+            )
+        return _db_executor
+
+
+async def run_db_task(func, *args):
+    """
+    Run blocking database work on the writer thread pool and await its result.
+    At most `writer_queue_size` tasks may be handed off at once; further callers
+    wait for a free slot, which keeps producers from piling up unbounded work.
+    """
+    global _handoff_slots, _handoff_loop
+    loop = asyncio.get_running_loop()
+    if _handoff_slots is None or _handoff_loop is not loop:
+        _handoff_slots = asyncio.Semaphore(DB_CONFIG.get("writer_queue_size", 100))
+        _handoff_loop = loop
+
+    async with _handoff_slots:
+        return await loop.run_in_executor(_get_db_executor(), func, *args)
+
+
+def close_db_pool():
+    """Close every pooled connection and the writer threads; both are recreated on next use."""
+    global _pool, _db_executor
+    if _db_executor is not None:
+        _db_executor.shutdown(wait=True)
+        _db_executor = None
+    with _pool_lock:
+        if _pool is not None and not _pool.closed:
+            _pool.closeall()
+            logging.info("Closed PostgreSQL connection pool.")
+        _pool = None
+        _last_used.clear()
+
+
+# --------------------------------------------------------
+# COPY bulk loading
+# --------------------------------------------------------
+def _copy_field(value):
+    # Unquoted empty is NULL in COPY csv; everything else is quoted so "" stays an empty string
+    if value is None:
+        return ""
+    return '"' + str(value).replace('"', '""') + '"'
+
+
+class _CopyRowStream:
+    """File-like reader that renders rows as CSV on demand for COPY ... FROM STDIN."""
+
+    def __init__(self, rows):
+        self._lines = (",".join(map(_copy_field, row)) + "\n" for row in rows)
+        self._buffer = ""
+
+    def read(self, size=-1):
+        while size < 0 or len(self._buffer) < size:
+            line = next(self._lines, None)
+            if line is None:
+                break
+            self._buffer += line
+        if size < 0:
+            size = len(self._buffer)
+        chunk, self._buffer = self._buffer[:size], self._buffer[size:]
+        return chunk
+
+
+def copy_to_staging(cursor, table, columns, rows):
+    """
+    Stream rows into a temporary table with the given columns of `table` using COPY
+    and return its name. The staging table is dropped when the transaction ends.
+    """
+    staging = f"{table}_staging"
+    column_list = ", ".join(columns)
+    cursor.execute(f"CREATE TEMP TABLE {staging} ON COMMIT DROP AS SELECT {column_list} FROM {table} WITH NO DATA;")
+    cursor.copy_expert(f"COPY {staging} ({column_list}) FROM STDIN WITH (FORMAT csv)", _CopyRowStream(rows))
+    return staging
+
+
+def use_copy(row_count):
+    """True when a batch is large enough for the COPY path to beat execute_values."""
+    return COPY_THRESHOLD > 0 and row_count >= COPY_THRESHOLD
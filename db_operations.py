@@ -1,8 +1,13 @@
-import psycopg2
+import asyncio
 import logging
 import json
 from datetime import datetime
 from psycopg2.extras import execute_values
+from db import get_connection, run_db_task, copy_to_staging, use_copy
+from utils.dexscreener_lookups import fetch_dexscreener_pair_metadata
+from utils.symbol_index import SymbolIndex
+from utils.recent_coins import RecentCoinsCache
+from utils.live_feed import publish
 
 
 # Load config
@@ -13,145 +18,192 @@ with open(CONFIG_FILE, "r") as file:
 LOG_FILE = CONFIG.get("logging", {}).get("log_file", "CGcryptobot.log")
 logging.basicConfig(filename=LOG_FILE, level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
-CACHE = {}
-
-def connect_db():
-    """Establish connection to PostgreSQL."""
-    try:
-        conn = psycopg2.connect(
-            dbname=CONFIG["database"]["dbname"],
-            user=CONFIG["database"]["user"],
-            password=CONFIG["database"]["password"],
-            host=CONFIG["database"]["host"],
-            port=CONFIG["database"]["port"]
-        )
-        return conn
-    except Exception as e:
-        logging.error(f"Database connection error: {e}")
-        return None
-
-def get_cached_coins():
-    """Return coins from cache or load from DB if cache is empty."""
-    if CACHE:
-        return list(CACHE.values())
-
-    conn = connect_db()
-    if conn:
-        try:
-            cursor = conn.cursor()
-            cursor.execute("SELECT symbol, name, source FROM coins ORDER BY created_at DESC LIMIT 50")
+RECENT_COINS_CONFIG = CONFIG.get("cache", {}).get("recent_coins", {})
+
+def _load_recent_coins():
+    """Newest coins of every source, up to the cache's per-source bound."""
+    with get_connection() as conn:
+        with conn.cursor() as cursor:
+            cursor.execute("""
+            SELECT symbol, name, source, created_at, chain_id, token_address
+            FROM (
+                SELECT symbol, name, source, created_at, chain_id, token_address,
+                       row_number() OVER (PARTITION BY source ORDER BY created_at DESC) AS recency
+                FROM coins
+            ) ranked
+            WHERE recency <= %s
+            """, (RECENT_COINS.max_per_source,))
             rows = cursor.fetchall()
-            cursor.close()
-            conn.close()
-            coins = [{"symbol": row[0], "name": row[1], "source": row[2]} for row in rows]
-            for coin in coins:
-                CACHE[coin["symbol"]] = coin
-            return coins
-        except Exception as e:
-            logging.error(f"Error fetching coins: {e}")
-    return []
+    return [
+        {"symbol": row[0], "name": row[1], "source": row[2], "created_at": row[3].isoformat() if row[3] else None,
+         "chain_id": row[4], "token_address": row[5]}
+        for row in rows
+    ]
+
+RECENT_COINS = RecentCoinsCache(
+    _load_recent_coins,
+    max_per_source=RECENT_COINS_CONFIG.get("max_per_source", 200),
+    ttl=RECENT_COINS_CONFIG.get("ttl", 300)
+)
+
+def get_cached_coins(source=None, limit=50):
+    """Most recently created coins, newest first, served from the recent-coins cache."""
+    return RECENT_COINS.get(source=source, limit=limit)
 
 def get_existing_binance_symbols():
-    conn = connect_db()
-    if not conn:
-        return []
-
+    if BINANCE_SYMBOL_INDEX.warmed and not BINANCE_SYMBOL_INDEX.use_bloom:
+        return BINANCE_SYMBOL_INDEX.snapshot()
     try:
-        cursor = conn.cursor()
-        cursor.execute("SELECT symbol FROM coins WHERE source = 'binance'")
-        results = cursor.fetchall()
-        return {r[0] for r in results}
+        return _load_binance_symbols()
     except Exception as e:
         logging.error(f"Error checking existing symbols: {e}")
         return set()
-    finally:
-        cursor.close()
-        conn.close()
 
-async def fetch_dexscreener_pair_metadata(token_address, chain_id):
-    url = f"https://api.dexscreener.com/latest/dex/pairs/{chain_id}/{token_address}"
-    try:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    logging.error(f"pair metadata {data}")
-                    return data.get("pairCreatedAt")
-    except Exception as e:
-        logging.warning(f"Error fetching pair metadata: {e}")
-    return None
+def _load_binance_symbols():
+    with get_connection() as conn:
+        with conn.cursor() as cursor:
+            cursor.execute("SELECT symbol FROM coins WHERE source = 'binance'")
+            results = cursor.fetchall()
+    return {r[0] for r in results}
+
+SYMBOL_INDEX_CONFIG = CONFIG.get("symbol_index", {})
+BINANCE_SYMBOL_INDEX = SymbolIndex(
+    _load_binance_symbols,
+    use_bloom=SYMBOL_INDEX_CONFIG.get("use_bloom_filter", False),
+    bloom_capacity=SYMBOL_INDEX_CONFIG.get("bloom_capacity", 1_000_000),
+    bloom_error_rate=SYMBOL_INDEX_CONFIG.get("bloom_error_rate", 0.0001)
+)
+# Symbols handed to an insert that has not committed yet
+_pending_binance_symbols = set()
+
+async def warm_binance_symbol_index():
+    """Load known Binance symbols into the in-process index; call once at startup."""
+    await run_db_task(BINANCE_SYMBOL_INDEX.warm)
+
+
+COIN_COLUMNS = (
+    "symbol", "name", "source", "created_at",
+    "chain_id", "token_address", "icon", "header", "open_graph", "description", "links"
+)
+
+
+def _write_coins(cursor, values, bulk=None):
+    """
+    Insert prepared coin rows on an open cursor. Batches of at least `copy_threshold`
+    rows are streamed through a COPY staging table; `bulk` forces either path.
+    """
+    if bulk is None:
+        bulk = use_copy(len(values))
+    columns = ", ".join(COIN_COLUMNS)
+    if bulk:
+        staging = copy_to_staging(cursor, "coins", COIN_COLUMNS, values)
+        cursor.execute(f"""
+        INSERT INTO coins ({columns})
+        SELECT {columns} FROM {staging}
+        ON CONFLICT (symbol, source, created_at) DO NOTHING
+        """)
+        return
+    query = f"""
+    INSERT INTO coins ({columns}) VALUES %s
+    ON CONFLICT (symbol, source, created_at) DO NOTHING
+    """
+    logging.debug(f"Inserting {len(values)} coin rows")
+    execute_values(cursor, query, values)
+
+
+def _insert_coins(values):
+    """Blocking insert of prepared coin rows; runs on the DB writer threads."""
+    with get_connection() as conn:
+        with conn.cursor() as cursor:
+            _write_coins(cursor, values)
+        conn.commit()
+
+def _coin_row(coin, source, created_at):
+    if not isinstance(coin, dict):  # Binance style (symbol as string)
+        return (
+            coin.get("symbol"),
+            coin.get("name"),
+            source,
+            datetime.utcnow().isoformat(),
+            None, None, None, None, None, None, None
+        )
+
+    if created_at is None:
+        created_at = datetime.utcnow()
+    elif isinstance(created_at, (int, float)):  # pairCreatedAt in ms
+        created_at = datetime.utcfromtimestamp(created_at / 1000)
+    elif isinstance(created_at, str):
+        try:
+            created_at = datetime.fromisoformat(created_at)
+        except:
+            created_at = datetime.utcnow()
+
+    return (
+        coin.get("symbol"),
+        coin.get("name"),
+        source,
+        created_at.isoformat(),
+        coin.get("chain_id"),
+        coin.get("token_address"),
+        coin.get("icon", ""),
+        coin.get("header"),
+        coin.get("open_graph", ""),
+        coin.get("description", ""),
+        json.dumps(coin.get("links", []))
+    )
+
+def _store_coin_rows(coin_list, source, created_ats):
+    """
+    Build and insert coin rows, then record them in the recent-coins cache once
+    committed. Runs on the DB writer threads so large batches are prepared off the
+    event loop; returns the stored coins.
+    """
+    values = [_coin_row(coin, source, created_at) for coin, created_at in zip(coin_list, created_ats)]
+    _insert_coins(values)
+    stored = [
+        {"symbol": v[0], "name": v[1], "source": v[2], "created_at": v[3], "chain_id": v[4], "token_address": v[5]}
+        for v in values
+    ]
+    RECENT_COINS.add_many(stored)
+    return stored
 
     
 async def store_coins(coin_list, source):
-    conn = connect_db()
-    if not conn:
-        return
-
+    reserved = []
     try:
-        cursor = conn.cursor()
-
         if source == "binance":
-            cursor.execute("SELECT symbol FROM coins WHERE source = 'binance'")
-            existing_symbols = {row[0] for row in cursor.fetchall()}
-
-            coin_list = [symbol for symbol in coin_list if symbol.get('symbol').endswith("USDT") and symbol.get('symbol') not in existing_symbols]
+            if not BINANCE_SYMBOL_INDEX.warmed:
+                await warm_binance_symbol_index()
+            new_coins = []
+            for coin in coin_list:
+                symbol = coin.get('symbol')
+                if symbol.endswith("USDT") and symbol not in BINANCE_SYMBOL_INDEX and symbol not in _pending_binance_symbols:
+                    _pending_binance_symbols.add(symbol)
+                    reserved.append(symbol)
+                    new_coins.append(coin)
+            coin_list = new_coins
+            if not coin_list:
+                return
         
-        
-        values = []
-        for coin in coin_list:
-            if isinstance(coin, dict):  # Dex Screener style
-                created_at = coin.get("created_at")
-
-                if not created_at:
-                    created_at = await fetch_dexscreener_pair_metadata(
-                        coin.get("token_address"), coin.get("chain_id")
-                    )
-                if created_at is None:
-                    created_at = datetime.utcnow()
-                elif isinstance(created_at, str):
-                    try:
-                        created_at = datetime.fromisoformat(created_at)
-                    except:
-                        created_at = datetime.utcnow()
-
-                values.append((
-                    coin.get("symbol"),
-                    coin.get("name"),
-                    source,
-                    created_at.isoformat(),
-                    coin.get("chain_id"),
-                    coin.get("token_address"),
-                    coin.get("icon", ""),
-                    coin.get("header"),
-                    coin.get("open_graph", ""),
-                    coin.get("description", ""),
-                    json.dumps(coin.get("links", []))
-                ))
-            else:  # Binance style (symbol as string)
-                values.append((
-                    coin.get("symbol"),
-                    coin.get("name"),
-                    source,
-                    datetime.utcnow().isoformat(),
-                    None, None, None, None, None, None, None
-                ))
-
-        logging.debug(f"new coin values are {values}")
-
-        query = """
-        INSERT INTO coins (
-            symbol, name, source, created_at,
-            chain_id, token_address, icon, header, open_graph, description, links
-        ) VALUES %s
-        ON CONFLICT (symbol, source, created_at) DO NOTHING
-        """
-        logging.info(f"values are {values} query is {query}")
-        execute_values(cursor, query, values)
-        conn.commit()
-        logging.info(f"Inserted {len(values)} coins into DB from {source}.")
+        # Only the metadata lookups need the loop; rows are built on the writer thread
+        created_ats = [coin.get("created_at") if isinstance(coin, dict) else None for coin in coin_list]
+        missing = [i for i, coin in enumerate(coin_list) if isinstance(coin, dict) and not created_ats[i]]
+        if missing:
+            # Issued together so the batch scheduler can combine them into multi-address requests
+            found = await asyncio.gather(*(
+                fetch_dexscreener_pair_metadata(coin_list[i].get("token_address"), coin_list[i].get("chain_id"))
+                for i in missing
+            ))
+            for i, created_at in zip(missing, found):
+                created_ats[i] = created_at
+
+        stored = await run_db_task(_store_coin_rows, coin_list, source, created_ats)
+        if reserved:
+            BINANCE_SYMBOL_INDEX.add_many(reserved)
+        publish("coins", stored)
+        logging.info(f"Inserted {len(stored)} coins into DB from {source}.")
 
     except Exception as e:
         logging.error(f"Error storing coins: {e}")
     finally:
-        cursor.close()
-        conn.close()
+        _pending_binance_symbols.difference_update(reserved)
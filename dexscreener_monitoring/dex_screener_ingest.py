@@ -2,23 +2,33 @@
 # Purpose: This file is responsible for ingesting top tokens from dexscreener
 # and storing them into the database by using methods from dexscreener_api.py
 
+import json
 import logging
-import aiohttp
+from utils.http_client import get_http_session
+from utils.response_cache import log_cache_stats
+from utils.singleflight import log_singleflight_stats
 from dexscreener_api import store_token_profiles
 
+# Load config
+CONFIG_FILE = "config.json"
+with open(CONFIG_FILE, "r") as file:
+    CONFIG = json.load(file)
+
+TRENDING_PAIRS_URL = CONFIG["dexscreener"].get("trending_pairs_url", "https://api.dexscreener.com/latest/dex/pairs")
+
 # -------------------------------------------------------------
 # Fetch trending pairs/tokens from Dexscreener public endpoint
 # -------------------------------------------------------------
 async def fetch_dexscreener_trending():
-    url = "https://api.dexscreener.com/latest/dex/pairs"
+    url = TRENDING_PAIRS_URL
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    return data.get("pairs", [])
-                else:
-                    logging.warning(f"Non-200 from Dex trending API: {response.status}, URL: {url}")
+        session = get_http_session()
+        async with session.get(url) as response:
+            if response.status == 200:
+                data = await response.json()
+                return data.get("pairs", [])
+            else:
+                logging.warning(f"Non-200 from Dex trending API: {response.status}, URL: {url}")
     except Exception as e:
         logging.warning(f"Error fetching trending pairs from {url}: {e}")
     return []
@@ -72,3 +82,5 @@ async def ingest_dexscreener_top_tokens():
 
     await store_token_profiles(token_profiles)
     logging.info("Dexscreener ingestion complete.")
+    log_cache_stats()
+    log_singleflight_stats()
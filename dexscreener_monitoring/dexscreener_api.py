@@ -1,121 +1,261 @@
-import aiohttp
-from datetime import datetime
+import asyncio
+from datetime import datetime, timedelta
+import hashlib
 import logging
 import json
 from psycopg2.extras import execute_values
-from db import connect_db  # Assuming connect_db is defined in db.py
+from db import get_connection, run_db_task, copy_to_staging, use_copy
+from utils.dexscreener_lookups import fetch_dexscreener_links_extra, fetch_dexscreener_pair_metadata
+from utils.live_feed import publish
 
-# -------------------------------------------
-# Fetch DEX Pair Metadata (e.g., pairCreatedAt)
-# -------------------------------------------
-async def fetch_dexscreener_pair_metadata(token_address, chain_id):
-    url = f"https://api.dexscreener.com/latest/dex/pairs/{chain_id}/{token_address}"
-    try:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    return data.get("pairCreatedAt")
-                else:
-                    logging.warning(f"Non-200 from Dex pair metadata API: {response.status}, URL: {url}")
-    except Exception as e:
-        logging.warning(f"Error fetching pair metadata from {url}: {e}")
-    return None
+# Load config
+CONFIG_FILE = "config.json"
+with open(CONFIG_FILE, "r") as file:
+    CONFIG = json.load(file)
+
+ENRICHMENT_CONFIG = CONFIG.get("dexscreener", {}).get("enrichment", {})
+PROFILE_TOUCH_INTERVAL = CONFIG["dexscreener"].get("profile_touch_interval", 3600)
 
 # ------------------------------------------------------
-# Fetch DEX Token Profile (links and social media info)
+# Enrich a single token with pair metadata and profile links
 # ------------------------------------------------------
-async def fetch_dexscreener_links_extra(token_address):
-    url = f"https://api.dexscreener.com/token-profiles/latest/v1/{token_address}"
-    try:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    return data.get("links")
-                else:
-                    logging.debug(f"Dexscreener profile not found for token: {token_address}, status: {response.status}, URL: {url}")
-    except Exception as e:
-        logging.warning(f"Error fetching token profile from {url}: {e}")
-    return {}
+def _parse_created_at(token_address, created_at):
+    """Parsed pairCreatedAt, or None when Dexscreener did not provide a usable one."""
+    if isinstance(created_at, (int, float)):
+        return datetime.utcfromtimestamp(created_at / 1000)  # ms to s
+    if isinstance(created_at, str):
+        try:
+            return datetime.fromisoformat(created_at)
+        except Exception as e:
+            logging.debug(f"Failed to parse created_at for {token_address}: {e}")
+            return None
+    return created_at or None
+
+
+async def _enrich_token_profile(token, global_limit, links_limit, token_timeout):
+    token_address = token.get("token_address")
+
+    async def _pair_created_at():
+        # Not held behind a semaphore: the lookups must all be waiting at once for the
+        # batch scheduler to fill multi-address requests, which it paces itself
+        return await asyncio.wait_for(
+            fetch_dexscreener_pair_metadata(token_address, token.get("chain_id")), token_timeout
+        )
+
+    async def _links_extra():
+        async with global_limit, links_limit:
+            return await asyncio.wait_for(fetch_dexscreener_links_extra(token_address), token_timeout)
+
+    if token.get("created_at"):
+        # Nothing to look up, so skip the extra tasks a gather would create
+        return token.get("created_at"), await _links_extra()
+    return await asyncio.gather(_pair_created_at(), _links_extra())
+
+
+async def enrich_token_profiles(token_data_list):
+    """
+    Fetch pair metadata and profile links for every token concurrently. Pair lookups are
+    coalesced into multi-address requests by the batch scheduler; per-token profile
+    requests are bounded by the global and per-endpoint limits in config. Results come
+    back in input order; a token that fails or times out falls back to defaults instead
+    of holding up the batch.
+    """
+    global_limit = asyncio.Semaphore(ENRICHMENT_CONFIG.get("max_concurrency", 20))
+    links_limit = asyncio.Semaphore(ENRICHMENT_CONFIG.get("links_extra_concurrency", 10))
+    token_timeout = ENRICHMENT_CONFIG.get("token_timeout", 20)
+
+    results = await asyncio.gather(
+        *(_enrich_token_profile(token, global_limit, links_limit, token_timeout) for token in token_data_list),
+        return_exceptions=True
+    )
+
+    enriched = []
+    for token, result in zip(token_data_list, results):
+        token_address = token.get("token_address")
+        if isinstance(result, BaseException):
+            logging.warning(f"Enrichment failed for token {token_address}: {result!r}")
+            created_at, links_extra = token.get("created_at"), {}
+        else:
+            created_at, links_extra = result
+        enriched.append((_parse_created_at(token_address, created_at), links_extra))
+    return enriched
 
 # ------------------------------------------------------
 # Store Token Profiles in token_profiles Table
 # ------------------------------------------------------
-async def store_token_profiles(token_data_list):
-    conn = connect_db()
-    if not conn:
-        logging.error("Failed to connect to DB for storing token profiles.")
+_content_hash_column_ready = False
+
+
+def profile_fingerprint(row):
+    """
+    Stable hash of a prepared profile row. token_address and fetched_at are left out,
+    so a profile that was only re-fetched hashes the same as the stored one. Hash the
+    row before filling in a fallback created_at, or every cycle would look changed.
+    """
+    content = json.dumps([row[1:5], row[6:]], default=str)
+    return hashlib.blake2b(content.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _ensure_content_hash_column():
+    """
+    Add the content_hash column in its own committed transaction. The flag is only set
+    after the commit, so a rolled-back upsert cannot leave the column missing.
+    """
+    global _content_hash_column_ready
+    if _content_hash_column_ready:
         return
+    with get_connection() as conn:
+        with conn.cursor() as cursor:
+            cursor.execute("ALTER TABLE token_profiles ADD COLUMN IF NOT EXISTS content_hash TEXT;")
+        conn.commit()
+    _content_hash_column_ready = True
 
-    try:
-        cursor = conn.cursor()
-
-        values = []
-        for token in token_data_list:
-            token_address = token.get("token_address")
-            if not token_address:
-                logging.debug("Skipping token with missing address.")
-                continue
-
-            created_at = token.get("created_at")
-            if not created_at:
-                created_at = await fetch_dexscreener_pair_metadata(token_address, token.get("chain_id"))
-            if isinstance(created_at, str):
-                try:
-                    created_at = datetime.fromisoformat(created_at)
-                except Exception as e:
-                    logging.debug(f"Failed to parse created_at for {token_address}: {e}")
-                    created_at = datetime.utcnow()
-            if not created_at:
-                created_at = datetime.utcnow()
-
-            links_extra = await fetch_dexscreener_links_extra(token_address)
-
-            values.append((
-                token_address,
-                token.get("symbol"),
-                token.get("name"),
-                token.get("chain_id"),
-                created_at,
-                datetime.utcnow(),
-                token.get("icon"),
-                token.get("header"),
-                token.get("open_graph"),
-                token.get("description"),
-                json.dumps(token.get("links", {})),
-                json.dumps(links_extra)
-            ))
 
+TOKEN_PROFILE_COLUMNS = (
+    "token_address", "symbol", "name", "chain_id", "created_at", "fetched_at",
+    "icon", "header", "open_graph", "description", "links", "links_extra", "content_hash"
+)
+
+# A row whose created_at equals its fetched_at carries the fallback for an unknown
+# pairCreatedAt, which must not replace the created_at already stored
+PROFILE_CONFLICT_CLAUSE = """
+    ON CONFLICT (token_address) DO UPDATE SET
+        symbol = EXCLUDED.symbol,
+        name = EXCLUDED.name,
+        chain_id = EXCLUDED.chain_id,
+        created_at = CASE WHEN EXCLUDED.created_at = EXCLUDED.fetched_at
+            THEN COALESCE(token_profiles.created_at, EXCLUDED.created_at)
+            ELSE EXCLUDED.created_at END,
+        fetched_at = EXCLUDED.fetched_at,
+        icon = EXCLUDED.icon,
+        header = EXCLUDED.header,
+        open_graph = EXCLUDED.open_graph,
+        description = EXCLUDED.description,
+        links = EXCLUDED.links,
+        links_extra = EXCLUDED.links_extra,
+        content_hash = EXCLUDED.content_hash
+    WHERE token_profiles.content_hash IS DISTINCT FROM EXCLUDED.content_hash
+    RETURNING token_address, (xmax = 0) AS inserted;
+"""
+
+
+def _write_token_profiles(cursor, values, bulk=None):
+    """
+    Upsert prepared profile rows on an open cursor and return inserted/updated/unchanged
+    counts. Only rows whose content_hash differs from the stored one are rewritten.
+    Unchanged rows just get fetched_at touched, and only once it is older than
+    PROFILE_TOUCH_INTERVAL. Batches of at least `copy_threshold` rows go through a
+    COPY staging table; `bulk` forces either path.
+    """
+    if bulk is None:
+        bulk = use_copy(len(values))
+    columns = ", ".join(TOKEN_PROFILE_COLUMNS)
+
+    if bulk:
+        staging = copy_to_staging(cursor, "token_profiles", TOKEN_PROFILE_COLUMNS, values)
+        cursor.execute(f"INSERT INTO token_profiles ({columns}) SELECT {columns} FROM {staging}" + PROFILE_CONFLICT_CLAUSE)
+        written = cursor.fetchall()
+        # Rows written above already carry the new fetched_at, so only unchanged ones match
+        cursor.execute(f"""
+        UPDATE token_profiles AS t SET fetched_at = s.fetched_at
+        FROM {staging} AS s
+        WHERE t.token_address = s.token_address
+          AND (t.fetched_at IS NULL OR t.fetched_at < s.fetched_at - make_interval(secs => %s));
+        """, (PROFILE_TOUCH_INTERVAL,))
+        unchanged = len(values) - len(written)
+    else:
+        written = execute_values(
+            cursor, f"INSERT INTO token_profiles ({columns}) VALUES %s" + PROFILE_CONFLICT_CLAUSE, values, fetch=True
+        ) or []
+        written_addresses = {address for address, _ in written}
+        stale = [
+            (row[0], row[5], row[5] - timedelta(seconds=PROFILE_TOUCH_INTERVAL))
+            for row in values if row[0] not in written_addresses
+        ]
+        if stale:
+            execute_values(cursor, """
+            UPDATE token_profiles AS t SET fetched_at = v.fetched_at
+            FROM (VALUES %s) AS v (token_address, fetched_at, stale_before)
+            WHERE t.token_address = v.token_address
+              AND (t.fetched_at IS NULL OR t.fetched_at < v.stale_before);
+            """, stale)
+        unchanged = len(stale)
+
+    inserted = sum(1 for _, is_insert in written if is_insert)
+    return {"inserted": inserted, "updated": len(written) - inserted, "unchanged": unchanged}
+
+
+def _upsert_token_profiles(values):
+    """Blocking upsert of prepared profile rows; runs on the DB writer threads."""
+    _ensure_content_hash_column()
+    with get_connection() as conn:
+        with conn.cursor() as cursor:
+            counts = _write_token_profiles(cursor, values)
+        conn.commit()
+    return counts
+
+
+def _profile_rows(tokens, enriched, fetched_at):
+    """Prepared, fingerprinted rows keyed by address, so a token listed twice is written once."""
+    rows = {}
+    for token, (created_at, links_extra) in zip(tokens, enriched):
+        row = (
+            token.get("token_address"),
+            token.get("symbol"),
+            token.get("name"),
+            token.get("chain_id"),
+            created_at,
+            fetched_at,
+            token.get("icon"),
+            token.get("header"),
+            token.get("open_graph"),
+            token.get("description"),
+            json.dumps(token.get("links", {}), sort_keys=True),
+            json.dumps(links_extra, sort_keys=True)
+        )
+        fingerprint = profile_fingerprint(row)
+        if created_at is None:
+            # Unknown pair creation time: store when we first saw it, but keep it out of the hash
+            row = row[:4] + (fetched_at,) + row[5:]
+        rows[row[0]] = row + (fingerprint,)
+    return list(rows.values())
+
+
+def _store_profile_rows(tokens, enriched, fetched_at):
+    """Build, hash and upsert profile rows on a DB writer thread; returns (counts, rows)."""
+    values = _profile_rows(tokens, enriched, fetched_at)
+    if not values:
+        return None, values
+    return _upsert_token_profiles(values), values
+
+
+async def store_token_profiles(token_data_list):
+    """Enrich and upsert profiles; returns the inserted/updated/unchanged counts."""
+    tokens = []
+    for token in token_data_list:
+        if not token.get("token_address"):
+            logging.debug("Skipping token with missing address.")
+            continue
+        tokens.append(token)
+
+    enriched = await enrich_token_profiles(tokens)
+
+    try:
+        counts, values = await run_db_task(_store_profile_rows, tokens, enriched, datetime.utcnow())
         if not values:
             logging.info("No token profiles to insert.")
-            return
-
-        query = """
-        INSERT INTO token_profiles (
-            token_address, symbol, name, chain_id, created_at, fetched_at,
-            icon, header, open_graph, description, links, links_extra
-        ) VALUES %s
-        ON CONFLICT (token_address) DO UPDATE SET
-            symbol = EXCLUDED.symbol,
-            name = EXCLUDED.name,
-            chain_id = EXCLUDED.chain_id,
-            created_at = EXCLUDED.created_at,
-            fetched_at = EXCLUDED.fetched_at,
-            icon = EXCLUDED.icon,
-            header = EXCLUDED.header,
-            open_graph = EXCLUDED.open_graph,
-            description = EXCLUDED.description,
-            links = EXCLUDED.links,
-            links_extra = EXCLUDED.links_extra;
-        """
-
-        execute_values(cursor, query, values)
-        conn.commit()
-        logging.info(f"Inserted/updated {len(values)} token profiles.")
+            return None
+
+        publish("token_profiles", [
+            {"token_address": v[0], "symbol": v[1], "name": v[2], "chain_id": v[3], "created_at": v[4]}
+            for v in values
+        ])
+        logging.info(
+            f"Token profiles: {counts['inserted']} inserted, {counts['updated']} updated, "
+            f"{counts['unchanged']} unchanged."
+        )
+        return counts
 
     except Exception as e:
         logging.error(f"Error storing token profiles: {e}")
-    finally:
-        cursor.close()
-        conn.close()
+        return None
@@ -1,40 +1,80 @@
 # dexscreener_orchestrator.py
 
 import asyncio
+import json
 import logging
 from dexscreener_utils import fetch_token_profiles
 from notification_filtering import filter_legit_tokens
-from notification_framework import process_and_dispatch_alerts
+from notification_framework import process_and_dispatch_alerts, close_alert_dispatcher
 
 logging.basicConfig(level=logging.INFO)
 
+# Load config
+CONFIG_FILE = "config.json"
+with open(CONFIG_FILE, "r") as file:
+    CONFIG = json.load(file)
+
+DISCOVERY_CONFIG = CONFIG.get("dexscreener", {}).get("discovery", {})
+
+
+async def _discover_symbol(symbol, limit, timeout):
+    async with limit:
+        try:
+            return symbol, await asyncio.wait_for(fetch_token_profiles(symbol), timeout)
+        except asyncio.TimeoutError:
+            logging.warning(f"⏱️ Dexscreener lookup for {symbol} timed out after {timeout}s")
+        except Exception as e:
+            logging.error(f"❌ Dexscreener lookup for {symbol} failed: {e}")
+    return symbol, []
+
+
 async def orchestrate_dexscreener_discovery(symbols):
+    """
+    Look up every symbol concurrently (at most `max_concurrency` at a time, each bounded
+    by `symbol_timeout`) and filter and alert on each symbol's pairs as soon as they arrive.
+    """
     try:
         logging.info("🚀 Starting Dexscreener discovery workflow...")
 
-        all_profiles = []
+        limit = asyncio.Semaphore(DISCOVERY_CONFIG.get("max_concurrency", 10))
+        timeout = DISCOVERY_CONFIG.get("symbol_timeout", 15)
+        lookups = [asyncio.create_task(_discover_symbol(symbol, limit, timeout)) for symbol in symbols]
 
-        for symbol in symbols:
-            profiles = await fetch_token_profiles(symbol)
-            if profiles:
-                all_profiles.extend(profiles)
-            else:
-                logging.info(f"ℹ️ No profiles found for {symbol}")
+        profile_count = 0
+        legit_count = 0
+        try:
+            for lookup in asyncio.as_completed(lookups):
+                symbol, profiles = await lookup
+                if not profiles:
+                    logging.info(f"ℹ️ No profiles found for {symbol}")
+                    continue
+                profile_count += len(profiles)
 
-        # Filter legit tokens
-        legit_tokens = filter_legit_tokens(all_profiles)
-        logging.info(f"✅ {len(legit_tokens)} legit tokens identified")
+                # Filter legit tokens
+                legit_tokens = filter_legit_tokens(profiles)
+                if legit_tokens:
+                    # Send notifications
+                    logging.info(f"📢 Sending alerts for {len(legit_tokens)} legit {symbol} tokens")
+                    process_and_dispatch_alerts(legit_tokens)
+                    legit_count += len(legit_tokens)
+        finally:
+            for lookup in lookups:
+                lookup.cancel()
+            await asyncio.gather(*lookups, return_exceptions=True)
 
-        # Send notifications
-        if legit_tokens:
-            logging.info(f"📢 Sending alerts for {len(legit_tokens)} legit tokens")
-            process_and_dispatch_alerts(legit_tokens)
-        else:
+        logging.info(f"✅ {legit_count} legit tokens identified out of {profile_count} profiles")
+        if not legit_count:
             logging.info("ℹ️ No legit tokens to notify.")
 
     except Exception as e:
         logging.error(f"❌ Error in Dexscreener orchestrator: {e}")
 
+async def main(symbols):
+    try:
+        await orchestrate_dexscreener_discovery(symbols)
+    finally:
+        await close_alert_dispatcher()
+
 if __name__ == "__main__":
     test_symbols = ["DOGE", "ETH", "ABC123"]  # Replace with real inputs or CLI args
-    asyncio.run(orchestrate_dexscreener_discovery(test_symbols))
+    asyncio.run(main(test_symbols))
@@ -1,39 +1,68 @@
 # dexscreener_utils.py
 
+import json
 import logging
-import aiohttp
+from utils.http_client import get_http_session
+from utils.response_cache import get_cache, MISS
+from utils.request_scheduler import get_rate_limiter
+from utils.singleflight import get_singleflight
 
-DEXSCREENER_API = "https://api.dexscreener.com/latest/dex/search"
+# Load config
+CONFIG_FILE = "config.json"
+with open(CONFIG_FILE, "r") as file:
+    CONFIG = json.load(file)
+
+SEARCH_PAIRS_URL = CONFIG["dexscreener"].get("search_pairs_url", "https://api.dexscreener.com/latest/dex/search?q=")
 
 async def fetch_token_profiles(query: str):
     """
     Queries Dexscreener API to fetch enriched token data for a given symbol or address.
     """
+    cache = get_cache("search")
+    enriched = cache.get(query)
+    if enriched is not MISS:
+        logging.debug(f"🗃️ Dexscreener cache hit for: {query}")
+        return enriched
+
+    # Both orchestrators may search the same symbol at once; they share one request
+    return await get_singleflight("search").do(query, _search_pairs, query)
+
+
+async def _search_pairs(query):
+    cache = get_cache("search")
     try:
         logging.info(f"🌐 Querying Dexscreener for: {query}")
-        async with aiohttp.ClientSession() as session:
-            async with session.get(f"{DEXSCREENER_API}?q={query}") as response:
-                if response.status != 200:
-                    logging.warning(f"⚠️ Non-200 response from Dexscreener: {response.status}")
-                    return []
-
-                data = await response.json()
-                pairs = data.get("pairs", [])
-                enriched = []
-
-                for pair in pairs:
-                    enriched.append({
-                        "symbol": pair.get("baseToken", {}).get("symbol"),
-                        "dex": pair.get("dexId"),
-                        "pairAddress": pair.get("pairAddress"),
-                        "priceUsd": pair.get("priceUsd"),
-                        "liquidity": pair.get("liquidity", {}).get("usd"),
-                        "fdv": pair.get("fdv"),
-                        "chain": pair.get("chainId"),
-                        "url": pair.get("url"),
-                    })
-
-                return enriched
+        limiter = get_rate_limiter("search")
+        await limiter.acquire()
+        session = get_http_session()
+        async with session.get(f"{SEARCH_PAIRS_URL}{query}") as response:
+            if response.status != 200:
+                logging.warning(f"⚠️ Non-200 response from Dexscreener: {response.status}")
+                if response.status == 404:
+                    cache.set(query, [], negative=True)
+                elif response.status == 429:
+                    limiter.pause(float(response.headers.get("Retry-After", 1)))
+                return []
+
+            data = await response.json()
+            pairs = data.get("pairs", [])
+            enriched = []
+
+            for pair in pairs:
+                enriched.append({
+                    "symbol": pair.get("baseToken", {}).get("symbol"),
+                    "dex": pair.get("dexId"),
+                    "pairAddress": pair.get("pairAddress"),
+                    "priceUsd": pair.get("priceUsd"),
+                    "liquidity": pair.get("liquidity", {}).get("usd"),
+                    "fdv": pair.get("fdv"),
+                    "chain": pair.get("chainId"),
+                    "url": pair.get("url"),
+                    "pairCreatedAt": pair.get("pairCreatedAt"),
+                })
+
+            cache.set(query, enriched, negative=not enriched)
+            return enriched
 
     except Exception as e:
         logging.error(f"❌ Error fetching token profiles from Dexscreener: {e}")
@@ -1,69 +1,318 @@
 # Module: export.py
 # Purpose: Export token profiles to JSON, potentially for dashboard or external services.
+# Rows are streamed through a server-side cursor and written as they arrive, so memory
+# stays flat no matter how large token_profiles grows. Analytics consumers can instead
+# pull incremental columnar deltas (Parquet/Arrow IPC need pyarrow, CSV does not).
 
+import argparse
+import csv
 import json
 import logging
 import os
-import psycopg2
-from datetime import datetime
+import textwrap
+from datetime import datetime, timedelta
+from db import get_connection
 
-EXPORT_PATH = "exports/token_profiles.json"
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Parquet/Arrow exports are optional
+    pa = None
+    pq = None
+
+# Load config
+CONFIG_FILE = "config.json"
+with open(CONFIG_FILE, "r") as file:
+    CONFIG = json.load(file)
+
+EXPORT_CONFIG = CONFIG.get("export", {})
+EXPORT_PATH = EXPORT_CONFIG.get("path", "exports/token_profiles.json")
+EXPORT_CHUNK_SIZE = EXPORT_CONFIG.get("chunk_size", 2000)
+COLUMNAR_DIR = EXPORT_CONFIG.get("columnar_dir", "exports/token_profiles")
+# fetched_at is stamped before a profile is queued and writer threads commit out of order,
+# so a row can become visible with a fetched_at behind the watermark. Each run re-reads this
+# many seconds behind it and skips the rows it already exported.
+WATERMARK_OVERLAP = EXPORT_CONFIG.get("watermark_overlap", 600)
+
+EXPORT_COLUMNS = (
+    "symbol", "name", "chain_id", "token_address", "created_at",
+    "icon", "header", "open_graph", "description", "links", "links_extra"
+)
 
 # --------------------------------------------------------
-# Connect to PostgreSQL (adjust connection params as needed)
+# Stream rows from token_profiles
 # --------------------------------------------------------
-def connect_db():
-    try:
-        return psycopg2.connect(
-            dbname=os.getenv("DB_NAME", "coins_db"),
-            user=os.getenv("DB_USER", "postgres"),
-            password=os.getenv("DB_PASS", "postgres"),
-            host=os.getenv("DB_HOST", "localhost"),
-            port=os.getenv("DB_PORT", 5432)
-        )
-    except Exception as e:
-        logging.error(f"Failed to connect to DB: {e}")
-        return None
+def _decode_profile(row, columns=EXPORT_COLUMNS):
+    entry = dict(zip(columns, row))
+    for key, value in entry.items():
+        if isinstance(value, datetime):
+            entry[key] = value.isoformat()
+    for key in ("links", "links_extra"):
+        if isinstance(entry.get(key), str):
+            try:
+                entry[key] = json.loads(entry[key])
+            except ValueError:
+                pass
+    return entry
+
+
+def iter_token_profile_rows(columns=EXPORT_COLUMNS, chunk_size=EXPORT_CHUNK_SIZE, since=None):
+    """
+    Yield raw token_profiles rows, reading `chunk_size` rows at a time through a named
+    cursor. With `since`, only rows fetched after that time are returned, oldest first.
+    """
+    query = f"SELECT {', '.join(columns)} FROM token_profiles"
+    params = None
+    if since is not None:
+        query += " WHERE fetched_at > %s ORDER BY fetched_at"
+        params = (since,)
+    with get_connection() as conn:
+        with conn.cursor(name="token_profiles_export") as cursor:
+            cursor.itersize = chunk_size
+            cursor.execute(query, params)
+            while True:
+                rows = cursor.fetchmany(chunk_size)
+                if not rows:
+                    break
+                yield from rows
+
+
+def iter_token_profiles(chunk_size=EXPORT_CHUNK_SIZE):
+    """Yield every token profile decoded for JSON output."""
+    for row in iter_token_profile_rows(EXPORT_COLUMNS, chunk_size):
+        yield _decode_profile(row)
 
 # --------------------------------------------------------
-# Export all token profiles to a JSON file
+# Writers
 # --------------------------------------------------------
-def export_token_profiles_to_json():
-    conn = connect_db()
-    if not conn:
-        return
+def _write_json_array(profiles, f):
+    count = 0
+    f.write("[")
+    for entry in profiles:
+        f.write(",\n" if count else "\n")
+        f.write(textwrap.indent(json.dumps(entry, indent=2, default=str), "  "))
+        count += 1
+    f.write("\n]" if count else "]")
+    return count
+
 
+def _write_ndjson(profiles, f):
+    count = 0
+    for entry in profiles:
+        f.write(json.dumps(entry, default=str))
+        f.write("\n")
+        count += 1
+    return count
+
+
+WRITERS = {
+    "json": _write_json_array,
+    "ndjson": _write_ndjson,
+}
+
+# --------------------------------------------------------
+# Export all token profiles to a JSON file
+# --------------------------------------------------------
+def export_token_profiles_to_json(path=EXPORT_PATH, fmt="json", chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    Stream every token profile to `path` as a JSON array ("json") or one object per
+    line ("ndjson"). The file is written to a temporary name and moved into place
+    once complete. Returns the number of profiles written.
+    """
     try:
-        cursor = conn.cursor()
-        cursor.execute("SELECT symbol, name, chain_id, token_address, created_at, icon, header, open_graph, description, links, links_extra FROM token_profiles")
-        rows = cursor.fetchall()
-
-        keys = [desc[0] for desc in cursor.description]
-        result = [dict(zip(keys, row)) for row in rows]
-
-        # Convert datetime and JSON fields properly
-        for entry in result:
-            if isinstance(entry["created_at"], datetime):
-                entry["created_at"] = entry["created_at"].isoformat()
-            if isinstance(entry.get("links"), str):
-                try:
-                    entry["links"] = json.loads(entry["links"])
-                except:
-                    pass
-            if isinstance(entry.get("links_extra"), str):
-                try:
-                    entry["links_extra"] = json.loads(entry["links_extra"])
-                except:
-                    pass
-
-        os.makedirs(os.path.dirname(EXPORT_PATH), exist_ok=True)
-        with open(EXPORT_PATH, "w") as f:
-            json.dump(result, f, indent=2)
-
-        logging.info(f"Exported {len(result)} token profiles to {EXPORT_PATH}")
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            count = WRITERS[fmt](iter_token_profiles(chunk_size), f)
+        os.replace(tmp_path, path)
+
+        logging.info(f"Exported {count} token profiles to {path}")
+        return count
 
     except Exception as e:
         logging.error(f"Error exporting token profiles: {e}")
+    return None
+
+# --------------------------------------------------------
+# Incremental columnar export (Parquet / Arrow IPC / CSV)
+# --------------------------------------------------------
+COLUMNAR_COLUMNS = (
+    "token_address", "symbol", "name", "chain_id", "created_at", "fetched_at",
+    "icon", "header", "open_graph", "description", "links", "links_extra"
+)
+COLUMNAR_EXTENSIONS = {"parquet": "parquet", "arrow": "arrow", "csv": "csv"}
+
+
+def _arrow_schema():
+    return pa.schema([
+        (column, pa.timestamp("us") if column in ("created_at", "fetched_at") else pa.string())
+        for column in COLUMNAR_COLUMNS
+    ])
+
+
+class _CsvPartWriter:
+    def __init__(self, path):
+        self._file = open(path, "w", newline="")
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(COLUMNAR_COLUMNS)
+
+    def write(self, rows):
+        self._writer.writerows(
+            [value.isoformat() if isinstance(value, datetime) else value for value in row] for row in rows
+        )
+
+    def close(self):
+        self._file.close()
+
+
+class _ArrowPartWriter:
+    def __init__(self, path, fmt):
+        self._schema = _arrow_schema()
+        if fmt == "parquet":
+            self._writer = pq.ParquetWriter(path, self._schema)
+        else:
+            self._writer = pa.ipc.new_file(path, self._schema)
+
+    def write(self, rows):
+        arrays = [
+            pa.array([row[i] for row in rows], type=field.type)
+            for i, field in enumerate(self._schema)
+        ]
+        self._writer.write_table(pa.Table.from_arrays(arrays, schema=self._schema))
+
+    def close(self):
+        self._writer.close()
+
+
+def _open_part_writer(path, fmt):
+    if fmt == "csv":
+        return _CsvPartWriter(path)
+    return _ArrowPartWriter(path, fmt)
+
+
+def _partition_dir(root, row):
+    fetched_at = row[COLUMNAR_COLUMNS.index("fetched_at")]
+    chain_id = row[COLUMNAR_COLUMNS.index("chain_id")] or "unknown"
+    date = fetched_at.date().isoformat() if fetched_at else "unknown"
+    return os.path.join(root, f"date={date}", f"chain_id={chain_id}")
+
+
+def _watermark_path(root):
+    return os.path.join(root, "_watermark.json")
+
+
+def _load_watermark_state(root):
+    try:
+        with open(_watermark_path(root), "r") as f:
+            state = json.load(f)
+    except FileNotFoundError:
+        return None, set()
+    recent = {(address, fetched_at) for address, fetched_at in state.get("recent", [])}
+    return datetime.fromisoformat(state["fetched_at"]), recent
+
+
+def load_watermark(root):
+    """Return the fetched_at of the newest row already exported to `root`, or None."""
+    return _load_watermark_state(root)[0]
+
+
+def _save_watermark(root, fetched_at, recent=()):
+    tmp_path = _watermark_path(root) + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump({"fetched_at": fetched_at.isoformat(), "recent": sorted(recent)}, f)
+    os.replace(tmp_path, _watermark_path(root))
+
+
+def export_token_profiles_columnar(fmt="parquet", root=None, incremental=True, chunk_size=EXPORT_CHUNK_SIZE,
+                                   overlap=WATERMARK_OVERLAP):
+    """
+    Export token profiles fetched since the last run into `root`/<fmt>, partitioned as
+    date=YYYY-MM-DD/chain_id=<chain>/part-<run>.<ext> by fetched_at date. Each run adds
+    new part files, and the watermark only advances once every part is in place.
+    Rows up to `overlap` seconds behind the watermark are read again, so late commits
+    are still picked up; rows exported by an earlier run are skipped.
+    With incremental=False the whole table is exported and the watermark reset to its newest row.
+    Returns {"rows": n, "files": [...], "watermark": iso or None}.
+    """
+    if fmt not in COLUMNAR_EXTENSIONS:
+        raise ValueError(f"Unsupported columnar format: {fmt}")
+    if fmt != "csv" and pa is None:
+        raise RuntimeError(f"{fmt} export needs pyarrow; install it or use --format csv")
+
+    root = os.path.join(root or COLUMNAR_DIR, fmt)
+    since, exported = _load_watermark_state(root) if incremental else (None, set())
+    read_from = since - timedelta(seconds=overlap) if since is not None else None
+    part_name = f"part-{datetime.utcnow().strftime('%Y%m%dT%H%M%S%f')}-{os.getpid()}.{COLUMNAR_EXTENSIONS[fmt]}"
+
+    writers = {}
+    pending = {}
+    count = 0
+    newest = since
+
+    def flush(directory):
+        if pending.get(directory):
+            writers[directory].write(pending[directory])
+            pending[directory] = []
+
+    address_index = COLUMNAR_COLUMNS.index("token_address")
+    fetched_index = COLUMNAR_COLUMNS.index("fetched_at")
+
+    try:
+        for row in iter_token_profile_rows(COLUMNAR_COLUMNS, chunk_size, since=read_from):
+            fetched_at = row[fetched_index]
+            key = (row[address_index], fetched_at.isoformat() if fetched_at else None)
+            if key in exported:
+                continue
+            exported.add(key)
+
+            directory = _partition_dir(root, row)
+            if directory not in writers:
+                os.makedirs(directory, exist_ok=True)
+                writers[directory] = _open_part_writer(os.path.join(directory, part_name + ".tmp"), fmt)
+                pending[directory] = []
+            pending[directory].append(row)
+            if len(pending[directory]) >= chunk_size:
+                flush(directory)
+
+            if fetched_at and (newest is None or fetched_at > newest):
+                newest = fetched_at
+            count += 1
+
+        for directory in writers:
+            flush(directory)
     finally:
-        cursor.close()
-        conn.close()
+        for writer in writers.values():
+            writer.close()
+
+    files = []
+    for directory in writers:
+        path = os.path.join(directory, part_name)
+        os.replace(path + ".tmp", path)
+        files.append(path)
+    if newest is not None and (count or newest != since):
+        # Keep only the keys the next run's overlap can read again
+        horizon = newest - timedelta(seconds=overlap)
+        recent = {key for key in exported if key[1] and datetime.fromisoformat(key[1]) > horizon}
+        _save_watermark(root, newest, recent)
+
+    logging.info(f"Exported {count} token profiles as {fmt} into {len(files)} partitions under {root}")
+    return {"rows": count, "files": files, "watermark": newest.isoformat() if newest else None}
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description="Export token profiles")
+    parser.add_argument("--format", choices=sorted(WRITERS) + sorted(COLUMNAR_EXTENSIONS), default="json")
+    parser.add_argument("--output", default=None,
+                        help="Output path for json/ndjson, or dataset directory for columnar formats")
+    parser.add_argument("--chunk-size", type=int, default=EXPORT_CHUNK_SIZE)
+    parser.add_argument("--full", action="store_true", help="Columnar formats: ignore the watermark and export every row")
+    args = parser.parse_args()
+
+    if args.format in COLUMNAR_EXTENSIONS:
+        export_token_profiles_columnar(args.format, args.output, incremental=not args.full, chunk_size=args.chunk_size)
+    else:
+        output = args.output or (EXPORT_PATH if args.format == "json" else os.path.splitext(EXPORT_PATH)[0] + ".ndjson")
+        export_token_profiles_to_json(output, args.format, args.chunk_size)
@@ -8,6 +8,9 @@ import sys
 from orchestrators.dexscreener_orchestrator import run_dexscreener_pipeline
 from orchestrators.binance_orchestrator import run_binance_pipeline
 from utils.logger import init_logger
+from utils.http_client import close_http_session
+from notification_framework import close_alert_dispatcher
+from db import close_db_pool
 from dashboard.dashboard_server import start_dashboard_server
 
 # Load config
@@ -31,11 +34,16 @@ async def main():
     dashboard_task = asyncio.create_task(start_dashboard_server())
 
     # Start Binance + Dexscreener pipelines concurrently
-    await asyncio.gather(
-        run_dexscreener_pipeline(config=config),
-        run_binance_pipeline(config=config),
-        dashboard_task
-    )
+    try:
+        await asyncio.gather(
+            run_dexscreener_pipeline(config=config),
+            run_binance_pipeline(config=config),
+            dashboard_task
+        )
+    finally:
+        await close_alert_dispatcher()
+        await close_http_session()
+        close_db_pool()
 
 if __name__ == "__main__":
     try:
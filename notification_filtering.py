@@ -0,0 +1,124 @@
+# notification_filtering.py
+# Legitimacy filter shared by the Binance and Dexscreener orchestrators. Rules come
+# from the "filters" block in config.json and are evaluated over a whole batch of
+# enriched pairs at once as NumPy columns.
+
+import json
+import logging
+import time
+import numpy as np
+
+# Load config
+CONFIG_FILE = "config.json"
+with open(CONFIG_FILE, "r") as file:
+    CONFIG = json.load(file)
+
+DEFAULT_RULES = {
+    "fdv": {"min": 1_000_000},
+    "liquidity": {"min": 5000},
+}
+
+# Rule name -> key of the value in the enriched pair dicts from fetch_token_profiles
+NUMERIC_FIELDS = {
+    "fdv": "fdv",
+    "liquidity": "liquidity",
+    "price": "priceUsd",
+}
+
+
+def _to_float(value):
+    # Dexscreener sends priceUsd as a string and omits fields it has no data for
+    if value is None or isinstance(value, bool):
+        return np.nan
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def _numeric_column(tokens, key):
+    return np.fromiter((_to_float(token.get(key)) for token in tokens), dtype=np.float64, count=len(tokens))
+
+
+def _range_mask(values, rule):
+    """Rows inside [min, max]; rows with no value pass only when on_missing is "pass"."""
+    present = ~np.isnan(values)
+    inside = present.copy()
+    if rule.get("min") is not None:
+        inside &= values >= rule["min"]
+    if rule.get("max") is not None:
+        inside &= values <= rule["max"]
+    return np.where(present, inside, rule.get("on_missing", "reject") == "pass")
+
+
+class TokenFilter:
+    """
+    Evaluates the configured rules over a batch of enriched pairs:
+      fdv / liquidity / price: {"min": x, "max": y, "on_missing": "reject" | "pass"}
+      pair_age:                same, in seconds since pairCreatedAt
+      chains:                  {"allow": [...], "deny": [...], "on_missing": ...}
+    Values that are missing or not numeric are rejected unless the rule says otherwise.
+    """
+
+    def __init__(self, rules=None):
+        self.rules = DEFAULT_RULES if rules is None else rules
+        self.last_rejections = {}
+
+    def mask(self, tokens, now=None):
+        """Boolean array marking which tokens pass every rule."""
+        passed = np.ones(len(tokens), dtype=bool)
+        self.last_rejections = {}
+        if not tokens:
+            return passed
+
+        for name, key in NUMERIC_FIELDS.items():
+            if name in self.rules:
+                self._apply(name, passed, _range_mask(_numeric_column(tokens, key), self.rules[name]))
+
+        if "pair_age" in self.rules:
+            now_ms = (time.time() if now is None else now) * 1000
+            ages = (now_ms - _numeric_column(tokens, "pairCreatedAt")) / 1000
+            self._apply("pair_age", passed, _range_mask(ages, self.rules["pair_age"]))
+
+        if "chains" in self.rules:
+            rule = self.rules["chains"]
+            chains = np.array([token.get("chain") or "" for token in tokens], dtype=object)
+            present = chains != ""
+            allowed = present.copy()
+            if rule.get("allow"):
+                allowed &= np.isin(chains, rule["allow"])
+            if rule.get("deny"):
+                allowed &= ~np.isin(chains, rule["deny"])
+            self._apply("chains", passed, np.where(present, allowed, rule.get("on_missing", "reject") == "pass"))
+
+        return passed
+
+    def _apply(self, name, passed, rule_mask):
+        self.last_rejections[name] = int(np.count_nonzero(passed & ~rule_mask))
+        passed &= rule_mask
+
+    def filter(self, tokens, now=None):
+        tokens = list(tokens)
+        keep = self.mask(tokens, now)
+        return [token for token, ok in zip(tokens, keep) if ok]
+
+
+TOKEN_FILTER = TokenFilter(CONFIG.get("filters", DEFAULT_RULES))
+
+
+def filter_legit_tokens(token_list):
+    """
+    Drop tokens that fail the configured legitimacy rules. A malformed token only
+    fails its own row; it no longer takes the rest of the batch down with it.
+    """
+    try:
+        logging.info("🔍 Filtering legit tokens from enriched list")
+        filtered = TOKEN_FILTER.filter(token_list)
+        rejected = {name: count for name, count in TOKEN_FILTER.last_rejections.items() if count}
+        if rejected:
+            logging.debug(f"🧹 Rejected by rule: {rejected}")
+        return filtered
+
+    except Exception as e:
+        logging.error(f"❌ Error filtering legit tokens: {e}")
+        return []
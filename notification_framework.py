@@ -1,34 +1,344 @@
 # notification_framework.py
+# Alerts are handed to an asynchronous dispatcher: every sink (alerts file, Twitter,
+# ...) gets its own bounded queue and worker, so a slow or failing sink drops alerts
+# for itself instead of blocking detection.
 
+import asyncio
 import logging
 import json
+import os
+import time
+from utils.alert_dedup import get_alert_deduplicator
+from utils.live_feed import publish
 # from twitter_api import post_tweet  # Placeholder for real Twitter API module
 # from db_utils import save_to_dashboard_table  # Placeholder for DB interaction
 
+# Load config
+CONFIG_FILE = "config.json"
+with open(CONFIG_FILE, "r") as file:
+    CONFIG = json.load(file)
+
+ALERTS_CONFIG = CONFIG.get("alerts", {})
+
+# --------------------------------------------------------
+# Sinks
+# --------------------------------------------------------
+class FileAlertSink:
+    """
+    Appends alerts as JSON lines. Lines are buffered and written in batches; the file
+    is fsynced per the `fsync` policy ("always", "interval" or "never") and rotated to
+    <path>.1 ... <path>.<backup_count> once it grows past `max_bytes`.
+    """
+
+    name = "file"
+
+    def __init__(self, path="alerts.json", fsync="interval", fsync_interval=5.0,
+                 max_bytes=10 * 1024 * 1024, backup_count=5):
+        self.path = path
+        self.fsync = fsync
+        self.fsync_interval = fsync_interval
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self._file = None
+        self._last_fsync = time.monotonic()
+
+    def _open(self):
+        if self._file is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._file = open(self.path, "a", encoding="utf-8")
+        return self._file
+
+    def _rotate(self):
+        self.close_sync()
+        for i in range(self.backup_count - 1, 0, -1):
+            if os.path.exists(f"{self.path}.{i}"):
+                os.replace(f"{self.path}.{i}", f"{self.path}.{i + 1}")
+        if self.backup_count > 0:
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+
+    def write_sync(self, alerts):
+        """Blocking write of one batch; runs on a worker thread when dispatched."""
+        f = self._open()
+        f.write("".join(json.dumps(alert, default=str) + "\n" for alert in alerts))
+        f.flush()
+        now = time.monotonic()
+        if self.fsync == "always" or (self.fsync == "interval" and now - self._last_fsync >= self.fsync_interval):
+            os.fsync(f.fileno())
+            self._last_fsync = now
+        if self.max_bytes and f.tell() >= self.max_bytes:
+            self._rotate()
+
+    async def write_batch(self, alerts):
+        await asyncio.to_thread(self.write_sync, alerts)
+
+    def close_sync(self):
+        if self._file is not None:
+            self._file.flush()
+            if self.fsync != "never":
+                os.fsync(self._file.fileno())
+            self._file.close()
+            self._file = None
+
+    async def close(self):
+        await asyncio.to_thread(self.close_sync)
+
+
+class TwitterAlertSink:
+    """Posts one tweet per alert (pseudo-code until the Twitter client exists)."""
+
+    name = "twitter"
+
+    def write_sync(self, alerts):
+        for token in alerts:
+            try:
+                tweet = f"🔥 New listing alert: {token['symbol']}\nDetails: {token.get('source_announcement')}"
+                logging.debug(f"📤 Sending tweet: {tweet}")
+                # post_tweet(tweet)
+            except Exception as e:
+                logging.error(f"❌ Failed to send tweet: {e}")
+
+    async def write_batch(self, alerts):
+        # Posting is blocking network I/O once post_tweet is wired in
+        await asyncio.to_thread(self.write_sync, alerts)
+
+    def close_sync(self):
+        pass
+
+    async def close(self):
+        pass
+
+
+class DashboardAlertSink:
+    """Pushes alerts to the live feed the dashboard streams from."""
+
+    name = "dashboard"
+
+    def write_sync(self, alerts):
+        publish("alerts", alerts)
+
+    async def write_batch(self, alerts):
+        self.write_sync(alerts)
+
+    def close_sync(self):
+        pass
+
+    async def close(self):
+        pass
+
+
+def build_sinks(config=None):
+    config = ALERTS_CONFIG if config is None else config
+    sinks = []
+    for name in config.get("sinks", ["file", "twitter", "dashboard"]):
+        if name == "file":
+            sinks.append(FileAlertSink(
+                path=config.get("path", "alerts.json"),
+                fsync=config.get("fsync", "interval"),
+                fsync_interval=config.get("fsync_interval", 5.0),
+                max_bytes=config.get("max_bytes", 10 * 1024 * 1024),
+                backup_count=config.get("backup_count", 5),
+            ))
+        elif name == "twitter":
+            sinks.append(TwitterAlertSink())
+        elif name == "dashboard":
+            sinks.append(DashboardAlertSink())
+        else:
+            logging.warning(f"⚠️ Unknown alert sink '{name}' ignored")
+    return sinks
+
+# --------------------------------------------------------
+# Dispatcher
+# --------------------------------------------------------
+class AlertDispatcher:
+    """
+    Fans alerts out to sinks. Each sink has a bounded queue drained by its own worker,
+    which writes in batches of up to `batch_size` alerts or whatever arrived within
+    `flush_interval` seconds. When a sink's queue is full its alerts are dropped and
+    counted rather than making the producer wait. With a `deduplicator`, alerts no sink
+    accepted are released again and accepted ones are journaled by another worker.
+    """
+
+    def __init__(self, sinks, queue_size=1000, batch_size=100, flush_interval=1.0, deduplicator=None):
+        self.sinks = sinks
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.deduplicator = deduplicator
+        self.queues = {sink.name: asyncio.Queue(maxsize=queue_size) for sink in sinks}
+        self.dropped = {sink.name: 0 for sink in sinks}
+        self.written = {sink.name: 0 for sink in sinks}
+        self._workers = [asyncio.create_task(self._drain(sink)) for sink in sinks]
+        self._accepted = asyncio.Queue()
+        if deduplicator is not None:
+            self._workers.append(asyncio.create_task(self._record_accepted()))
+
+    def submit(self, alerts):
+        """Queue alerts for every sink; returns those at least one sink accepted."""
+        accepted = [False] * len(alerts)
+        for sink in self.sinks:
+            queue = self.queues[sink.name]
+            for i, alert in enumerate(alerts):
+                try:
+                    queue.put_nowait(alert)
+                    accepted[i] = True
+                except asyncio.QueueFull:
+                    self.dropped[sink.name] += 1
+                    logging.warning(f"⚠️ Alert queue for {sink.name} is full; dropping alert for {alert.get('symbol')}")
+
+        if self.deduplicator is not None:
+            self.deduplicator.release([alert for alert, ok in zip(alerts, accepted) if not ok])
+            for alert, ok in zip(alerts, accepted):
+                if ok:
+                    self._accepted.put_nowait(alert)
+        return [alert for alert, ok in zip(alerts, accepted) if ok]
+
+    async def _record_accepted(self):
+        """Journal accepted alerts with the deduplicator, off the event loop."""
+        while True:
+            batch = [await self._accepted.get()]
+            while True:
+                try:
+                    batch.append(self._accepted.get_nowait())
+                except asyncio.QueueEmpty:
+                    break
+            try:
+                await asyncio.to_thread(self.deduplicator.record_sync, batch)
+            except Exception as e:
+                logging.error(f"❌ Failed to record {len(batch)} alerts in the dedup journal: {e}")
+            finally:
+                for _ in batch:
+                    self._accepted.task_done()
+
+    async def _drain(self, sink):
+        queue = self.queues[sink.name]
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await queue.get()]
+            deadline = loop.time() + self.flush_interval
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(queue.get_nowait())
+                    continue
+                except asyncio.QueueEmpty:
+                    pass
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+            try:
+                await sink.write_batch(batch)
+                self.written[sink.name] += len(batch)
+            except Exception as e:
+                logging.error(f"❌ Alert sink {sink.name} failed to write {len(batch)} alerts: {e}")
+            finally:
+                for _ in batch:
+                    queue.task_done()
+
+    async def flush(self):
+        """Wait until every queued alert has been handed to its sink and journaled."""
+        await asyncio.gather(self._accepted.join(), *(queue.join() for queue in self.queues.values()))
+
+    async def close(self, timeout=10):
+        try:
+            await asyncio.wait_for(self.flush(), timeout)
+        except asyncio.TimeoutError:
+            logging.warning("⚠️ Timed out flushing alert sinks; pending alerts were discarded")
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        for sink in self.sinks:
+            await sink.close()
+        if self.deduplicator is not None:
+            await asyncio.to_thread(self.deduplicator.close)
+
+
+_dispatcher = None
+_dispatcher_loop = None
+
+
+def _dedup_enabled():
+    return ALERTS_CONFIG.get("dedup", {}).get("enabled", True)
+
+
+def get_alert_dispatcher():
+    """Return the dispatcher bound to the running event loop, creating it on first use."""
+    global _dispatcher, _dispatcher_loop
+    loop = asyncio.get_running_loop()
+    if _dispatcher is None or _dispatcher_loop is not loop:
+        _dispatcher = AlertDispatcher(
+            build_sinks(),
+            queue_size=ALERTS_CONFIG.get("queue_size", 1000),
+            batch_size=ALERTS_CONFIG.get("batch_size", 100),
+            flush_interval=ALERTS_CONFIG.get("flush_interval", 1.0),
+            deduplicator=get_alert_deduplicator() if _dedup_enabled() else None,
+        )
+        _dispatcher_loop = loop
+    return _dispatcher
+
+
+async def close_alert_dispatcher():
+    """Flush pending alerts and close the sinks; call before the event loop exits."""
+    global _dispatcher, _dispatcher_loop
+    if _dispatcher is not None and _dispatcher_loop is asyncio.get_running_loop():
+        await _dispatcher.close()
+    _dispatcher = None
+    _dispatcher_loop = None
+
+# --------------------------------------------------------
+# Entry point used by the orchestrators
+# --------------------------------------------------------
 def process_and_dispatch_alerts(token_list):
+    """
+    Log each alert and queue it for the sinks. Returns immediately; the sinks write in
+    the background. Outside an event loop the sinks are written synchronously instead.
+    Pairs already alerted within the dedup window are skipped; an alert only counts as
+    sent once a sink has accepted it.
+    """
+    try:
+        dispatcher = get_alert_dispatcher()
+        deduplicator = dispatcher.deduplicator
+    except RuntimeError:
+        dispatcher = None
+        deduplicator = get_alert_deduplicator() if _dedup_enabled() else None
+
+    if deduplicator is not None:
+        before = len(token_list)
+        token_list = deduplicator.admit(token_list)
+        if len(token_list) < before:
+            logging.info(f"🔁 Suppressed {before - len(token_list)} repeat alerts")
+        if not token_list:
+            return
+
     for token in token_list:
         alert_message = build_alert_message(token)
 
         # Console / log
         logging.info(f"🚨 Alert: {alert_message}")
 
-        # (1) Twitter (pseudo-code)
-        try:
-            tweet = f"🔥 New listing alert: {token['symbol']}\nDetails: {token.get('source_announcement')}"
-            logging.debug(f"📤 Sending tweet: {tweet}")
-            # post_tweet(tweet)
-        except Exception as e:
-            logging.error(f"❌ Failed to send tweet: {e}")
+    if dispatcher is None:
+        delivered = False
+        for sink in build_sinks():
+            try:
+                sink.write_sync(token_list)
+                delivered = True
+            except Exception as e:
+                logging.error(f"❌ Alert sink {sink.name} failed: {e}")
+            finally:
+                sink.close_sync()
+        if deduplicator is not None:
+            if delivered:
+                deduplicator.record_sync(token_list)
+            else:
+                deduplicator.release(token_list)
+        return
 
-        # (2) Dashboard (pseudo-code)
-        try:
-            # save_to_dashboard_table(token)
-            with open("alerts.json", "a") as f:
-                json.dump(token, f)
-                f.write("\n")
-            logging.debug("🗃️ Stored token alert to dashboard alerts file")
-        except Exception as e:
-            logging.error(f"❌ Failed to save alert to dashboard: {e}")
+    dispatcher.submit(token_list)
 
 def build_alert_message(token):
     return f"Token: {token['symbol']}, Source: {token.get('source_announcement')}, Dex Price: {token.get('priceUsd', 'N/A')}"
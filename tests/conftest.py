@@ -0,0 +1,14 @@
+# tests/conftest.py
+# Make the top-level modules and the dexscreener_monitoring scripts importable
+# the same way they are when run from the repository root.
+
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+for path in (ROOT, os.path.join(ROOT, "dexscreener_monitoring")):
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+os.chdir(ROOT)
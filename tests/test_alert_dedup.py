@@ -0,0 +1,120 @@
+# File: tests/test_alert_dedup.py
+# Purpose: Check that repeat alerts are suppressed within the window, memory stays
+# bounded, alerts no sink accepted can alert again and the sent-alert journal survives
+# a restart
+
+import asyncio
+import threading
+import time
+
+import notification_framework
+from notification_framework import AlertDispatcher
+from utils import alert_dedup
+from utils.alert_dedup import AlertDeduplicator
+
+
+def _token(symbol, pair="0xPAIR", chain="bsc"):
+    return {"symbol": symbol, "pairAddress": pair, "chain": chain}
+
+
+def test_repeats_suppressed_until_window_expires(tmp_path):
+    dedup = AlertDeduplicator(str(tmp_path / "dedup.jsonl"), window=60)
+
+    first = dedup.admit([_token("ABC"), _token("ABC"), _token("ABC", chain="eth"), _token("abc", pair="0xpair")], now=1000)
+    assert first == [_token("ABC"), _token("ABC", chain="eth")]
+    assert dedup.admit([_token("ABC")], now=1059) == []
+    assert dedup.suppressed == 3
+    assert dedup.admit([_token("ABC")], now=1061) == [_token("ABC")]
+
+
+def test_memory_bounded_by_max_entries(tmp_path):
+    dedup = AlertDeduplicator(str(tmp_path / "dedup.jsonl"), window=3600, max_entries=3)
+    dedup.admit([_token(f"T{i}", pair=f"0x{i}") for i in range(5)], now=1000)
+
+    assert list(dedup.sent) == ["bsc:0x2:T2", "bsc:0x3:T3", "bsc:0x4:T4"]
+    # The oldest keys were evicted, so they alert again
+    assert dedup.admit([_token("T0", pair="0x0")], now=1001) == [_token("T0", pair="0x0")]
+
+
+def test_state_survives_restart_and_journal_is_compacted(tmp_path):
+    path = str(tmp_path / "dedup.jsonl")
+    start = time.time() - 2500
+    dedup = AlertDeduplicator(path, window=100)
+    for i in range(2500):
+        dedup.record_sync(dedup.admit([_token(f"T{i}", pair=f"0x{i}")], now=start + i))
+    dedup.close()
+
+    with open(path) as f:
+        journal_lines = sum(1 for _ in f)
+    # Only the last 100 seconds are live; the journal was rewritten to stay small
+    assert journal_lines <= 2 * 1000
+
+    with open(path, "a") as f:
+        f.write('["bsc:0xtorn')  # interrupted write
+    restarted = AlertDeduplicator(path, window=100)
+    assert restarted.admit([_token("T2499", pair="0x2499")]) == []
+    assert restarted.admit([_token("T0", pair="0x0")]) == [_token("T0", pair="0x0")]
+
+
+def test_process_and_dispatch_alerts_skips_repeats(tmp_path, monkeypatch):
+    path = tmp_path / "alerts.json"
+    monkeypatch.setattr(notification_framework, "ALERTS_CONFIG", {"path": str(path), "sinks": ["file"]})
+    monkeypatch.setattr(alert_dedup, "_deduplicator", AlertDeduplicator(str(tmp_path / "dedup.jsonl")))
+
+    notification_framework.process_and_dispatch_alerts([_token("ABC")])
+    notification_framework.process_and_dispatch_alerts([_token("ABC"), _token("DEF", pair="0xOTHER")])
+
+    with open(path) as f:
+        assert f.read().count('"symbol"') == 2
+
+
+def test_alerts_no_sink_accepted_are_released(tmp_path):
+    path = str(tmp_path / "dedup.jsonl")
+    journal_threads = []
+
+    class StalledSink:
+        name = "stalled"
+
+        async def write_batch(self, alerts):
+            await asyncio.Event().wait()
+
+        async def close(self):
+            pass
+
+    class RecordingDeduplicator(AlertDeduplicator):
+        def record_sync(self, tokens):
+            journal_threads.append(threading.get_ident())
+            super().record_sync(tokens)
+
+    async def run():
+        dedup = RecordingDeduplicator(path)
+        dispatcher = AlertDispatcher([StalledSink()], queue_size=1, batch_size=1, deduplicator=dedup)
+        # The worker takes the first alert, the queue holds the second and drops the third
+        for symbol in ("A", "B", "C"):
+            dispatcher.submit(dedup.admit([_token(symbol, pair=f"0x{symbol}")]))
+            await asyncio.sleep(0.01)
+        await dispatcher._accepted.join()
+        readmitted = dedup.admit([_token(s, pair=f"0x{s}") for s in ("A", "B", "C")])
+        for worker in dispatcher._workers:
+            worker.cancel()
+        await asyncio.gather(*dispatcher._workers, return_exceptions=True)
+        dedup.close()
+        return readmitted, threading.get_ident()
+
+    readmitted, loop_thread = asyncio.run(run())
+    assert [token["symbol"] for token in readmitted] == ["C"]
+    assert journal_threads and loop_thread not in journal_threads
+
+    # Only the accepted alerts were journaled
+    restarted = AlertDeduplicator(path)
+    assert sorted(restarted.sent) == ["bsc:0xa:A", "bsc:0xb:B"]
+
+
+def test_failed_synchronous_sinks_release_alerts(tmp_path, monkeypatch):
+    monkeypatch.setattr(notification_framework, "ALERTS_CONFIG", {"path": str(tmp_path), "sinks": ["file"]})
+    dedup = AlertDeduplicator(str(tmp_path / "dedup.jsonl"))
+    monkeypatch.setattr(alert_dedup, "_deduplicator", dedup)
+
+    # The alerts path is a directory, so the file sink fails
+    notification_framework.process_and_dispatch_alerts([_token("ABC")])
+    assert not dedup.sent and not dedup.pending
@@ -0,0 +1,111 @@
+# File: tests/test_alert_dispatcher.py
+# Purpose: Check batched alert writes, file rotation, bounded queues and that a slow
+# sink never blocks process_and_dispatch_alerts
+
+import asyncio
+import json
+import threading
+import time
+
+import notification_framework
+from notification_framework import AlertDispatcher, FileAlertSink, TwitterAlertSink
+
+
+def _read_lines(path):
+    with open(path) as f:
+        return [json.loads(line) for line in f]
+
+
+def test_file_sink_batches_and_flushes_on_close(tmp_path):
+    path = tmp_path / "alerts.json"
+    sink = FileAlertSink(path=str(path), fsync="never")
+    writes = []
+    original = sink.write_sync
+    sink.write_sync = lambda alerts: (writes.append(len(alerts)), original(alerts))
+
+    async def run():
+        dispatcher = AlertDispatcher([sink], batch_size=10, flush_interval=0.05)
+        dispatcher.submit([{"symbol": f"T{i}"} for i in range(25)])
+        await dispatcher.close()
+
+    asyncio.run(run())
+    assert [alert["symbol"] for alert in _read_lines(path)] == [f"T{i}" for i in range(25)]
+    assert writes == [10, 10, 5]
+
+
+def test_file_sink_rotates_past_max_bytes(tmp_path):
+    path = tmp_path / "alerts.json"
+    sink = FileAlertSink(path=str(path), fsync="always", max_bytes=200, backup_count=2)
+    for i in range(6):
+        sink.write_sync([{"symbol": f"T{i}", "padding": "x" * 100}])
+    sink.close_sync()
+
+    assert (tmp_path / "alerts.json.1").exists()
+    assert (tmp_path / "alerts.json.2").exists()
+    assert not (tmp_path / "alerts.json.3").exists()
+    assert _read_lines(tmp_path / "alerts.json.1")[-1]["symbol"] == "T5"
+
+
+def test_slow_sink_drops_instead_of_blocking(tmp_path):
+    class SlowSink:
+        name = "slow"
+
+        def __init__(self):
+            self.received = []
+
+        async def write_batch(self, alerts):
+            await asyncio.sleep(0.2)
+            self.received.extend(alerts)
+
+        async def close(self):
+            pass
+
+    slow = SlowSink()
+    fast = FileAlertSink(path=str(tmp_path / "alerts.json"), fsync="never")
+
+    async def run():
+        dispatcher = AlertDispatcher([slow, fast], queue_size=5, batch_size=5, flush_interval=0.01)
+        slowest_submit = 0
+        for i in range(20):
+            started = time.perf_counter()
+            dispatcher.submit([{"symbol": f"T{i}"}])
+            slowest_submit = max(slowest_submit, time.perf_counter() - started)
+            await asyncio.sleep(0.01)
+        await dispatcher.close()
+        return dispatcher, slowest_submit
+
+    dispatcher, slowest_submit = asyncio.run(run())
+    assert slowest_submit < 0.01
+    assert dispatcher.dropped["slow"] > 0
+    assert dispatcher.dropped["file"] == 0
+    assert len(slow.received) == 20 - dispatcher.dropped["slow"]
+    assert len(_read_lines(tmp_path / "alerts.json")) == 20
+
+
+def test_process_and_dispatch_alerts_uses_loop_dispatcher(tmp_path, monkeypatch):
+    path = tmp_path / "alerts.json"
+    monkeypatch.setattr(notification_framework, "ALERTS_CONFIG", {
+        "path": str(path), "sinks": ["file"], "flush_interval": 0.01, "dedup": {"enabled": False},
+    })
+
+    async def run():
+        notification_framework.process_and_dispatch_alerts([{"symbol": "ABC"}, {"symbol": "DEF"}])
+        await notification_framework.close_alert_dispatcher()
+
+    asyncio.run(run())
+    # Outside an event loop alerts are written synchronously
+    notification_framework.process_and_dispatch_alerts([{"symbol": "GHI"}])
+
+    assert [alert["symbol"] for alert in _read_lines(path)] == ["ABC", "DEF", "GHI"]
+
+
+def test_twitter_sink_posts_off_the_event_loop(monkeypatch):
+    threads = []
+    monkeypatch.setattr(TwitterAlertSink, "write_sync", lambda self, alerts: threads.append(threading.get_ident()))
+
+    async def run():
+        await TwitterAlertSink().write_batch([{"symbol": "ABC"}])
+        return threading.get_ident()
+
+    loop_thread = asyncio.run(run())
+    assert threads and threads[0] != loop_thread
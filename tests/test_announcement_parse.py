@@ -0,0 +1,77 @@
+# File: tests/test_announcement_parse.py
+# Purpose: Check the streaming title fast path and the full-parse fallback for
+# Binance announcement pages
+
+import asyncio
+
+from aiohttp import web
+
+import binance_announcement_utils
+from utils.http_client import close_http_session
+
+PADDING = "<p>" + "risk warning " * 20 + "</p>\n"
+
+PAGES = {
+    "title": f"<html><head><title>Binance Will List ABC (ABC) | Binance</title></head><body>{PADDING * 2000}</body></html>",
+    "header": (
+        f"<html><head><title>Announcement | Binance</title>{PADDING * 50}</head>"
+        f"<body><h1 class='x'>Binance Will List <b>XYZ</b> (XYZ)</h1>{PADDING * 2000}</body></html>"
+    ),
+    "markup": f"<html><head><TITLE\n>Binance Will List <!-- x -->QRS &amp; more</TITLE\n></head><body>{PADDING * 10}</body></html>",
+    "none": f"<html><head><title>Maintenance notice</title></head><body>{PADDING * 10}</body></html>",
+}
+
+
+def _parse_all():
+    async def page(request):
+        return web.Response(text=PAGES[request.match_info["name"]], content_type="text/html")
+
+    async def run():
+        app = web.Application()
+        app.router.add_get("/{name}", page)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        base = f"http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}"
+        try:
+            results = {}
+            for name in PAGES:
+                before = dict(binance_announcement_utils.PAGE_PARSE_STATS)
+                result = await binance_announcement_utils.parse_announcement_details(f"{base}/{name}")
+                after = binance_announcement_utils.PAGE_PARSE_STATS
+                results[name] = (
+                    result.get("symbol"),
+                    after["bytes_read"] - before.get("bytes_read", 0),
+                    after["full_parse"] - before.get("full_parse", 0),
+                )
+            return results
+        finally:
+            await close_http_session()
+            await runner.cleanup()
+
+    return asyncio.run(run())
+
+
+def test_fast_path_stops_reading_after_title_or_header():
+    results = _parse_all()
+
+    symbol, bytes_read, full_parses = results["title"]
+    assert symbol == "ABC"
+    assert bytes_read < len(PAGES["title"]) / 10
+    assert full_parses == 0
+
+    symbol, bytes_read, full_parses = results["header"]
+    assert symbol == "XYZ"
+    assert bytes_read < len(PAGES["header"]) / 10
+    assert full_parses == 0
+
+
+def test_tag_markup_and_full_parse_fallback():
+    results = _parse_all()
+    assert results["markup"][0] == "QRS"
+    assert results["markup"][2] == 0
+    # No listing in title or header: the whole page is read and parsed as before
+    assert results["none"][0] is None
+    assert results["none"][1] == len(PAGES["none"])
+    assert results["none"][2] == 1
@@ -0,0 +1,114 @@
+# File: tests/test_async_db_writes.py
+# Purpose: Show that large inserts run off the event loop and loop latency stays flat
+
+import asyncio
+import logging
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+import db
+import db_operations
+import dexscreener_api
+
+logging.basicConfig(level=logging.INFO)
+
+INSERT_SECONDS = 0.5
+ROWS_PER_BATCH = 2_000
+
+
+class FakeConnection:
+    def cursor(self):
+        return self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, query, params=None):
+        pass
+
+    def commit(self):
+        pass
+
+
+@contextmanager
+def fake_get_connection():
+    yield FakeConnection()
+
+
+def slow_execute_values(cursor, query, values, fetch=False):
+    # Stand-in for a large blocking psycopg2 insert
+    time.sleep(INSERT_SECONDS)
+    return [] if fetch else None
+
+
+async def _measure_max_loop_lag(work):
+    max_lag = 0.0
+    stop = asyncio.Event()
+
+    async def ticker():
+        nonlocal max_lag
+        interval = 0.01
+        while not stop.is_set():
+            started = time.perf_counter()
+            await asyncio.sleep(interval)
+            max_lag = max(max_lag, time.perf_counter() - started - interval)
+
+    tick_task = asyncio.create_task(ticker())
+    started = time.perf_counter()
+    await work
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await tick_task
+    return max_lag, elapsed
+
+
+def test_store_coins_keeps_loop_responsive(monkeypatch):
+    monkeypatch.setattr(db_operations, "get_connection", fake_get_connection)
+    monkeypatch.setattr(db_operations, "execute_values", slow_execute_values)
+    monkeypatch.setattr(db_operations, "use_copy", lambda row_count: False)
+
+    coins = [
+        {"symbol": f"TOK{i}", "name": f"Token {i}", "created_at": datetime.utcnow()}
+        for i in range(ROWS_PER_BATCH)
+    ]
+
+    async def run():
+        try:
+            batches = [db_operations.store_coins(coins, "dexscreener") for _ in range(4)]
+            return await _measure_max_loop_lag(asyncio.gather(*batches))
+        finally:
+            db.close_db_pool()
+
+    max_lag, elapsed = asyncio.run(run())
+    assert elapsed >= INSERT_SECONDS
+    assert max_lag < INSERT_SECONDS / 5
+
+
+def test_store_token_profiles_keeps_loop_responsive(monkeypatch):
+    monkeypatch.setattr(dexscreener_api, "get_connection", fake_get_connection)
+    monkeypatch.setattr(dexscreener_api, "execute_values", slow_execute_values)
+    monkeypatch.setattr(dexscreener_api, "use_copy", lambda row_count: False)
+
+    async def no_links(token_address):
+        return {}
+
+    monkeypatch.setattr(dexscreener_api, "fetch_dexscreener_links_extra", no_links)
+
+    tokens = [
+        {"token_address": f"0x{i:040x}", "symbol": f"TOK{i}", "created_at": 1700000000000}
+        for i in range(2_000)
+    ]
+
+    async def run():
+        try:
+            return await _measure_max_loop_lag(dexscreener_api.store_token_profiles(tokens))
+        finally:
+            db.close_db_pool()
+
+    max_lag, elapsed = asyncio.run(run())
+    assert elapsed >= INSERT_SECONDS
+    assert max_lag < INSERT_SECONDS / 5
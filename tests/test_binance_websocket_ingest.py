@@ -0,0 +1,100 @@
+# File: tests/test_binance_websocket_ingest.py
+# Purpose: Drive the Binance WebSocket ingestor against a local WebSocket stand-in
+
+import asyncio
+import json
+import logging
+import websockets
+
+import coin_launch_monitor
+
+logging.basicConfig(level=logging.DEBUG)
+
+
+def _frame(*symbols):
+    # Shape of a !miniTicker@arr frame: no asset name, only the symbol and prices
+    return json.dumps([
+        {"e": "24hrMiniTicker", "E": 1717000000000, "s": symbol, "c": "1.0", "o": "1.0",
+         "h": "1.0", "l": "1.0", "v": "100", "q": "100"}
+        for symbol in symbols
+    ])
+
+
+async def _run_ingest(connections, expected_symbols, timeout=5):
+    """Serve one list of frames per connection, closing after each, and collect stored coins."""
+    stored = []
+    remaining = list(connections)
+    finished = asyncio.Event()
+
+    async def handler(websocket):
+        frames = remaining.pop(0) if remaining else []
+        for frame in frames:
+            await websocket.send(frame)
+        if remaining:
+            return  # close so the ingestor has to reconnect
+        await finished.wait()
+
+    async def fake_store_coins(coin_list, source):
+        stored.extend(coin["symbol"] for coin in coin_list)
+
+    original_store = coin_launch_monitor.store_coins
+    coin_launch_monitor.store_coins = fake_store_coins
+    stats = coin_launch_monitor.WebSocketIngestStats()
+    try:
+        async with websockets.serve(handler, "127.0.0.1", 0) as server:
+            port = server.sockets[0].getsockname()[1]
+            ingest = asyncio.create_task(
+                coin_launch_monitor.start_binance_websocket(f"ws://127.0.0.1:{port}", stats=stats)
+            )
+            loop = asyncio.get_running_loop()
+            deadline = loop.time() + timeout
+            while not expected_symbols <= set(stored) and loop.time() < deadline:
+                await asyncio.sleep(0.01)
+            finished.set()
+            ingest.cancel()
+            await asyncio.gather(ingest, return_exceptions=True)
+    finally:
+        coin_launch_monitor.store_coins = original_store
+    return stored, stats
+
+
+def test_frames_are_batched_without_sleeping(monkeypatch):
+    monkeypatch.setitem(coin_launch_monitor.WS_CONFIG, "batch_timeout", 0.05)
+    frames = [_frame(f"T{i}USDT") for i in range(200)]
+    expected = {f"T{i}USDT" for i in range(200)}
+
+    stored, stats = asyncio.run(_run_ingest([frames], expected, timeout=2))
+
+    assert set(stored) == expected
+    assert stats.frames_received == 200
+    assert stats.frames_dropped == 0
+
+
+def test_reconnects_after_server_closes(monkeypatch):
+    monkeypatch.setitem(coin_launch_monitor.WS_CONFIG, "batch_timeout", 0.05)
+    monkeypatch.setitem(coin_launch_monitor.WS_CONFIG, "reconnect_base_delay", 0.01)
+    monkeypatch.setitem(coin_launch_monitor.WS_CONFIG, "reconnect_max_delay", 0.05)
+
+    stored, stats = asyncio.run(_run_ingest([[_frame("AAAUSDT")], [_frame("BBBUSDT")]], {"AAAUSDT", "BBBUSDT"}))
+
+    assert {"AAAUSDT", "BBBUSDT"} <= set(stored)
+    assert stats.reconnects >= 1
+
+
+def test_full_queue_drops_oldest_frames(monkeypatch):
+    monkeypatch.setitem(coin_launch_monitor.WS_CONFIG, "queue_size", 5)
+    monkeypatch.setitem(coin_launch_monitor.WS_CONFIG, "consumers", 0)
+
+    frames = [_frame(f"T{i}USDT") for i in range(20)]
+    stored, stats = asyncio.run(_run_ingest([frames], {"never"}, timeout=0.5))
+
+    assert stored == []
+    assert stats.frames_received == 20
+    assert stats.frames_dropped == 15
+    assert stats.backlog == 5
+
+
+def test_mini_ticker_frames_are_parsed_without_names():
+    coins = coin_launch_monitor._parse_binance_frame(_frame("JUPUSDT", "BONKUSDT"))
+    assert [(coin["symbol"], coin["name"]) for coin in coins] == [("JUPUSDT", None), ("BONKUSDT", None)]
+    assert coin_launch_monitor._parse_binance_frame(json.dumps([{"e": "24hrMiniTicker"}])) == []
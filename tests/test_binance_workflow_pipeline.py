@@ -0,0 +1,90 @@
+# File: tests/test_binance_workflow_pipeline.py
+# Purpose: Check that the Binance announcement workflow overlaps parsing and enrichment
+# and alerts on the first token without waiting for the remaining links
+
+import asyncio
+import time
+
+import binance_announcement_orchestrator as orchestrator
+
+LINKS = [f"https://www.binance.com/en/support/announcement/{i}" for i in range(8)]
+PARSE_SECONDS = 0.05
+ENRICH_SECONDS = 0.05
+
+
+def _record_acknowledged(acknowledged):
+    async def acknowledge(announcements):
+        acknowledged.extend(announcement["link"] for announcement in announcements)
+
+    return acknowledge
+
+
+def test_pipeline_alerts_early_and_runs_stages_concurrently(monkeypatch):
+    alerts = []
+    acknowledged = []
+    started = None
+
+    async def fake_announcements():
+        return [{"link": link, "title": "Binance Will List Something", "symbols": None} for link in LINKS]
+
+    async def fake_parse(link):
+        await asyncio.sleep(PARSE_SECONDS)
+        if link.endswith("/3"):
+            raise ValueError("broken page")
+        return {"symbol": f"TOK{link.rsplit('/', 1)[1]}", "url": link}
+
+    async def fake_enrich(symbol):
+        await asyncio.sleep(ENRICH_SECONDS)
+        return [{"symbol": symbol, "fdv": 5_000_000, "liquidity": 50_000}]
+
+    def fake_dispatch(tokens):
+        alerts.extend((time.perf_counter() - started, token["symbol"], token["source_announcement"]) for token in tokens)
+
+    monkeypatch.setattr(orchestrator, "fetch_latest_listing_announcements", fake_announcements)
+    monkeypatch.setattr(orchestrator, "parse_announcement_details", fake_parse)
+    monkeypatch.setattr(orchestrator, "enrich_token_details", fake_enrich)
+    monkeypatch.setattr(orchestrator, "process_and_dispatch_alerts", fake_dispatch)
+    monkeypatch.setattr(orchestrator, "acknowledge_listing_announcements", _record_acknowledged(acknowledged))
+    monkeypatch.setattr(orchestrator, "WORKFLOW_CONFIG", {"parse_workers": 2, "enrich_workers": 2, "queue_size": 2})
+
+    started = time.perf_counter()
+    asyncio.run(orchestrator.orchestrate_binance_announcement_workflow())
+    elapsed = time.perf_counter() - started
+
+    sequential = len(LINKS) * (PARSE_SECONDS + ENRICH_SECONDS)
+    assert sorted(symbol for _, symbol, _ in alerts) == sorted(f"TOK{i}" for i in range(8) if i != 3)
+    assert all(link.endswith(symbol[3:]) for _, symbol, link in alerts)
+    assert alerts[0][0] < sequential / 3
+    assert elapsed < sequential * 0.75
+    # The broken page is left for the next run
+    assert sorted(acknowledged) == sorted(link for link in LINKS if not link.endswith("/3"))
+
+
+def test_titles_with_tickers_skip_page_parse(monkeypatch):
+    parsed, enriched, acknowledged = [], [], []
+
+    async def fake_announcements():
+        return [
+            {"link": LINKS[0], "title": "Binance Will List Pepe (PEPE) and Floki (FLOKI)", "symbols": ["PEPE", "FLOKI"]},
+            {"link": LINKS[1], "title": "Binance Will List Something", "symbols": None},
+        ]
+
+    async def fake_parse(link):
+        parsed.append(link)
+        return {"symbol": "PAGE", "url": link}
+
+    async def fake_enrich(symbol):
+        enriched.append(symbol)
+        return [{"symbol": symbol, "fdv": 0, "liquidity": 0}] if symbol == "PEPE" else []
+
+    monkeypatch.setattr(orchestrator, "fetch_latest_listing_announcements", fake_announcements)
+    monkeypatch.setattr(orchestrator, "parse_announcement_details", fake_parse)
+    monkeypatch.setattr(orchestrator, "enrich_token_details", fake_enrich)
+    monkeypatch.setattr(orchestrator, "acknowledge_listing_announcements", _record_acknowledged(acknowledged))
+
+    asyncio.run(orchestrator.orchestrate_binance_announcement_workflow())
+
+    assert parsed == [LINKS[1]]
+    assert sorted(enriched) == ["FLOKI", "PAGE", "PEPE"]
+    # Only the announcement that produced enriched tokens is acknowledged
+    assert acknowledged == [LINKS[0]]
@@ -0,0 +1,125 @@
+# File: tests/test_columnar_export.py
+# Purpose: Check incremental, partitioned columnar exports of token_profiles
+
+import csv
+import os
+from contextlib import contextmanager
+from datetime import datetime
+
+import pytest
+
+import export_token_profiles
+
+
+class ProfilesTable:
+    """Serves rows to a named cursor, honouring the fetched_at watermark filter."""
+
+    def __init__(self, rows):
+        self.rows = rows
+
+    def cursor(self, name=None):
+        assert name
+        table = self
+
+        class Cursor:
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *exc):
+                return False
+
+            def execute(self, query, params=None):
+                rows = table.rows
+                if params:
+                    rows = sorted((row for row in rows if row[5] > params[0]), key=lambda row: row[5])
+                self._rows = iter(rows)
+
+            def fetchmany(self, size):
+                return [row for _, row in zip(range(size), self._rows)]
+
+        return Cursor()
+
+
+def _row(i, chain_id, fetched_at):
+    return (f"0x{i:040x}", f"TOK{i}", f"Token {i}", chain_id, datetime(2024, 1, 1), fetched_at,
+            None, None, None, "desc", "{}", "{}")
+
+
+def _patch_table(monkeypatch, table):
+    @contextmanager
+    def fake_get_connection():
+        yield table
+
+    monkeypatch.setattr(export_token_profiles, "get_connection", fake_get_connection)
+
+
+def _read_csv_dataset(root):
+    rows = {}
+    for directory, _, files in os.walk(root):
+        for name in files:
+            if name.endswith(".csv"):
+                with open(os.path.join(directory, name), newline="") as f:
+                    partition = os.path.relpath(directory, root)
+                    rows.setdefault(partition, []).extend(r["token_address"] for r in csv.DictReader(f))
+    return rows
+
+
+def test_csv_export_is_partitioned_and_incremental(monkeypatch, tmp_path):
+    table = ProfilesTable([
+        _row(1, "solana", datetime(2024, 5, 1, 10)),
+        _row(2, "ethereum", datetime(2024, 5, 1, 11)),
+        _row(3, "solana", datetime(2024, 5, 2, 9)),
+    ])
+    _patch_table(monkeypatch, table)
+
+    first = export_token_profiles.export_token_profiles_columnar("csv", str(tmp_path), chunk_size=1)
+    assert first["rows"] == 3
+    assert first["watermark"] == "2024-05-02T09:00:00"
+    dataset = _read_csv_dataset(tmp_path / "csv")
+    assert dataset == {
+        os.path.join("date=2024-05-01", "chain_id=solana"): [f"0x{1:040x}"],
+        os.path.join("date=2024-05-01", "chain_id=ethereum"): [f"0x{2:040x}"],
+        os.path.join("date=2024-05-02", "chain_id=solana"): [f"0x{3:040x}"],
+    }
+
+    # Nothing new since the watermark
+    assert export_token_profiles.export_token_profiles_columnar("csv", str(tmp_path))["rows"] == 0
+
+    # Only the re-fetched profile is exported next time
+    table.rows[0] = _row(1, "solana", datetime(2024, 5, 3, 8))
+    delta = export_token_profiles.export_token_profiles_columnar("csv", str(tmp_path))
+    assert delta["rows"] == 1
+    assert delta["files"] == [os.path.join(str(tmp_path), "csv", "date=2024-05-03", "chain_id=solana", os.path.basename(delta["files"][0]))]
+    assert export_token_profiles.load_watermark(str(tmp_path / "csv")) == datetime(2024, 5, 3, 8)
+
+
+def test_late_commit_behind_the_watermark_is_exported_once(monkeypatch, tmp_path):
+    table = ProfilesTable([_row(1, "solana", datetime(2024, 5, 1, 10, 5))])
+    _patch_table(monkeypatch, table)
+    export_token_profiles.export_token_profiles_columnar("csv", str(tmp_path), overlap=600)
+
+    # A writer that stamped fetched_at earlier commits after the export ran
+    table.rows.append(_row(2, "solana", datetime(2024, 5, 1, 10, 1)))
+    late = export_token_profiles.export_token_profiles_columnar("csv", str(tmp_path), overlap=600)
+    assert late["rows"] == 1
+    assert late["watermark"] == "2024-05-01T10:05:00"
+
+    assert export_token_profiles.export_token_profiles_columnar("csv", str(tmp_path), overlap=600)["rows"] == 0
+    exported = [address for rows in _read_csv_dataset(tmp_path / "csv").values() for address in rows]
+    assert sorted(exported) == [f"0x{1:040x}", f"0x{2:040x}"]
+
+
+def test_parquet_export_round_trips(monkeypatch, tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    _patch_table(monkeypatch, ProfilesTable([_row(i, "solana", datetime(2024, 5, 1, i)) for i in range(5)]))
+
+    result = export_token_profiles.export_token_profiles_columnar("parquet", str(tmp_path), chunk_size=2)
+    table = pq.read_table(result["files"][0])
+    assert table.num_rows == 5
+    assert table.column("symbol").to_pylist() == [f"TOK{i}" for i in range(5)]
+
+
+def test_arrow_formats_need_pyarrow(monkeypatch, tmp_path):
+    monkeypatch.setattr(export_token_profiles, "pa", None)
+    with pytest.raises(RuntimeError):
+        export_token_profiles.export_token_profiles_columnar("parquet", str(tmp_path))
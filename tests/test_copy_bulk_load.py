@@ -0,0 +1,61 @@
+# File: tests/test_copy_bulk_load.py
+# Purpose: Check the COPY staging path: CSV rendering and automatic path selection
+
+import csv
+import io
+
+import db
+import db_operations
+
+
+class RecordingCursor:
+    def __init__(self):
+        self.statements = []
+        self.copied = None
+
+    def execute(self, query, params=None):
+        self.statements.append(" ".join(query.split()))
+
+    def copy_expert(self, sql, stream):
+        self.statements.append(sql)
+        chunks = []
+        while True:
+            chunk = stream.read(7)
+            if not chunk:
+                break
+            chunks.append(chunk)
+        self.copied = "".join(chunks)
+
+
+def test_copy_stream_keeps_nulls_and_quotes_apart():
+    rows = [("A", None, "", 'say "hi"', "line\nbreak"), ("B", 1, None, "x,y", "")]
+    stream = db._CopyRowStream(rows)
+    rendered = stream.read()
+
+    parsed = list(csv.reader(io.StringIO(rendered, newline="")))
+    assert parsed == [["A", "", "", 'say "hi"', "line\nbreak"], ["B", "1", "", "x,y", ""]]
+    # COPY reads an unquoted empty field as NULL and a quoted one as an empty string
+    assert rendered.startswith('"A",,"",')
+    assert stream.read() == ""
+
+
+def test_large_coin_batches_use_copy(monkeypatch):
+    monkeypatch.setattr(db, "COPY_THRESHOLD", 3)
+    inserted_with_values = []
+    monkeypatch.setattr(db_operations, "execute_values", lambda cursor, query, values: inserted_with_values.append(values))
+
+    row = ("TOKUSDT", "TOK", "binance", "2024-01-01T00:00:00", None, None, None, None, None, None, None)
+
+    small = RecordingCursor()
+    db_operations._write_coins(small, [row] * 2)
+    assert inserted_with_values == [[row] * 2]
+    assert small.statements == []
+
+    large = RecordingCursor()
+    db_operations._write_coins(large, [row] * 3)
+    assert len(inserted_with_values) == 1
+    assert large.statements[0].startswith("CREATE TEMP TABLE coins_staging ON COMMIT DROP")
+    assert large.statements[1].startswith("COPY coins_staging (symbol, name, source, created_at,")
+    assert "SELECT symbol, name, source" in large.statements[2]
+    assert "ON CONFLICT (symbol, source, created_at) DO NOTHING" in large.statements[2]
+    assert large.copied.count("\n") == 3
@@ -0,0 +1,70 @@
+# File: tests/test_dashboard_server.py
+# Purpose: Check the live feed ring buffer and that the dashboard serves recent events
+# and pushes new alerts over Server-Sent Events
+
+import asyncio
+import json
+
+import aiohttp
+from aiohttp import web
+
+from dashboard.dashboard_server import create_app
+from notification_framework import AlertDispatcher, DashboardAlertSink
+from utils import live_feed
+from utils.live_feed import LiveFeed
+
+
+def test_ring_buffer_keeps_latest_and_drops_stalled_subscribers():
+    async def run():
+        feed = LiveFeed(buffer_size=3, subscriber_queue=2)
+        subscription = feed.subscribe(["alerts"])
+        feed.publish("alerts", [{"symbol": f"T{i}"} for i in range(5)])
+        feed.publish("coins", [{"symbol": "C"}])
+        return feed, subscription
+
+    feed, subscription = asyncio.run(run())
+    assert [payload["symbol"] for _, _, payload in feed.recent("alerts")] == ["T2", "T3", "T4"]
+    assert [event[0] for event in feed.recent("alerts", after=4)] == [5]
+    # The subscriber fell behind, so it was dropped and its stream ends
+    assert subscription.overflowed and subscription not in feed.subscribers
+    assert subscription.queue.get_nowait()[2]["symbol"] == "T1"
+    assert subscription.queue.get_nowait() is None
+
+
+def test_dashboard_serves_recent_and_streams_alerts(monkeypatch):
+    feed = LiveFeed()
+    monkeypatch.setattr(live_feed, "_live_feed", feed)
+
+    async def run():
+        runner = web.AppRunner(create_app(feed), handler_cancellation=True)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        base = f"http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}"
+        dispatcher = AlertDispatcher([DashboardAlertSink()], flush_interval=0.01)
+        try:
+            feed.publish("coins", [{"symbol": "OLD", "source": "binance"}])
+            async with aiohttp.ClientSession() as session:
+                async with session.get(f"{base}/api/coins") as response:
+                    coins = await response.json()
+                async with session.get(f"{base}/api/nope") as response:
+                    missing_status = response.status
+
+                async with session.get(f"{base}/events?channels=alerts") as stream:
+                    assert stream.headers["Content-Type"] == "text/event-stream"
+                    dispatcher.submit([{"symbol": "NEW", "chain": "bsc"}])
+                    frame = []
+                    while not frame or frame[-1] != "":
+                        line = await asyncio.wait_for(stream.content.readline(), 2)
+                        frame.append(line.decode().rstrip("\n"))
+            return coins, missing_status, frame
+        finally:
+            await dispatcher.close()
+            await runner.cleanup()
+
+    coins, missing_status, frame = asyncio.run(run())
+    assert [coin["symbol"] for coin in coins] == ["OLD"]
+    assert coins[0]["channel"] == "coins" and coins[0]["id"] == 1
+    assert missing_status == 404
+    assert frame[:2] == ["id: 2", "event: alerts"]
+    assert json.loads(frame[2][len("data: "):])["symbol"] == "NEW"
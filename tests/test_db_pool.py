@@ -0,0 +1,82 @@
+# File: tests/test_db_pool.py
+# Purpose: Check borrow/return semantics of the pooled database layer without a live PostgreSQL
+
+import logging
+import pytest
+from psycopg2 import pool
+
+import db
+
+logging.basicConfig(level=logging.DEBUG)
+
+
+class FakeConnection:
+    def __init__(self):
+        self.closed = 0
+        self.rollbacks = 0
+
+    def rollback(self):
+        self.rollbacks += 1
+
+
+class FakePool:
+    def __init__(self, minconn, maxconn, **kwargs):
+        self.closed = False
+        self.idle = []
+        self.created = []
+        self.discarded = []
+
+    def getconn(self):
+        if self.idle:
+            return self.idle.pop()
+        conn = FakeConnection()
+        self.created.append(conn)
+        return conn
+
+    def putconn(self, conn, close=False):
+        if close:
+            self.discarded.append(conn)
+        else:
+            self.idle.append(conn)
+
+    def closeall(self):
+        self.closed = True
+
+
+@pytest.fixture
+def fake_pool(monkeypatch):
+    monkeypatch.setattr(db.pool, "ThreadedConnectionPool", FakePool)
+    monkeypatch.setitem(db.DB_CONFIG, "pool_max_size", 2)
+    monkeypatch.setitem(db.DB_CONFIG, "pool_timeout", 0.1)
+    db.close_db_pool()
+    yield db.get_db_pool()
+    db.close_db_pool()
+
+
+def test_connection_is_returned_and_reused(fake_pool):
+    with db.get_connection() as first:
+        pass
+    with db.get_connection() as second:
+        pass
+    assert first is second
+    assert len(fake_pool.created) == 1
+    assert first.rollbacks == 2
+
+
+def test_closed_connection_is_discarded_on_borrow(fake_pool):
+    with db.get_connection() as conn:
+        pass
+    conn.closed = 1
+    with db.get_connection() as replacement:
+        pass
+    assert replacement is not conn
+    assert fake_pool.discarded == [conn]
+
+
+def test_borrow_times_out_when_pool_exhausted(fake_pool):
+    with db.get_connection(), db.get_connection():
+        with pytest.raises(pool.PoolError):
+            with db.get_connection():
+                pass
+    with db.get_connection():
+        pass
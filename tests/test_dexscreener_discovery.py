@@ -0,0 +1,41 @@
+# File: tests/test_dexscreener_discovery.py
+# Purpose: Check bounded concurrent symbol fan-out, per-symbol timeouts and streamed
+# alerts in orchestrate_dexscreener_discovery
+
+import asyncio
+import time
+
+import dexscreener_orchestrator
+
+
+def test_discovery_fans_out_and_streams_alerts(monkeypatch):
+    in_flight = 0
+    max_in_flight = 0
+    alerted = []
+
+    async def fake_fetch(symbol):
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        try:
+            if symbol == "BROKEN":
+                raise ValueError("bad response")
+            await asyncio.sleep(1.0 if symbol == "SLOW" else 0.05)
+            return [{"symbol": symbol, "fdv": 5_000_000, "liquidity": 50_000, "chain": "solana"}]
+        finally:
+            in_flight -= 1
+
+    monkeypatch.setattr(dexscreener_orchestrator, "fetch_token_profiles", fake_fetch)
+    monkeypatch.setattr(dexscreener_orchestrator, "process_and_dispatch_alerts",
+                        lambda tokens: alerted.extend(token["symbol"] for token in tokens))
+    monkeypatch.setattr(dexscreener_orchestrator, "DISCOVERY_CONFIG", {"max_concurrency": 4, "symbol_timeout": 0.2})
+
+    symbols = ["SLOW", "BROKEN"] + [f"T{i}" for i in range(20)]
+    started = time.perf_counter()
+    asyncio.run(dexscreener_orchestrator.orchestrate_dexscreener_discovery(symbols))
+    elapsed = time.perf_counter() - started
+
+    assert sorted(alerted) == sorted(f"T{i}" for i in range(20))
+    assert max_in_flight == 4
+    # 20 lookups of 50 ms, four at a time, with the slow one cut off at 200 ms
+    assert elapsed < 0.6
@@ -0,0 +1,115 @@
+# File: tests/test_http_client.py
+# Purpose: Check that fetchers share one pooled session against a local HTTP stand-in
+
+import asyncio
+import logging
+from aiohttp import web
+
+from utils.http_client import get_http_session, close_http_session
+
+logging.basicConfig(level=logging.DEBUG)
+
+
+async def _run_search_calls(calls):
+    import dexscreener_utils
+
+    app = web.Application()
+
+    async def search(request):
+        return web.json_response({"pairs": [{"baseToken": {"symbol": request.query["q"]}, "chainId": "bsc"}]})
+
+    app.router.add_get("/latest/dex/search", search)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+
+    original_url = dexscreener_utils.SEARCH_PAIRS_URL
+    dexscreener_utils.SEARCH_PAIRS_URL = f"http://127.0.0.1:{port}/latest/dex/search?q="
+    try:
+        sessions = set()
+        results = []
+        for i in range(calls):
+            results.append(await dexscreener_utils.fetch_token_profiles(f"T{i}"))
+            sessions.add(id(get_http_session()))
+        return sessions, results
+    finally:
+        dexscreener_utils.SEARCH_PAIRS_URL = original_url
+        await close_http_session()
+        await runner.cleanup()
+
+
+def test_fetchers_reuse_shared_session():
+    sessions, results = asyncio.run(_run_search_calls(5))
+    assert len(sessions) == 1
+    assert [r[0]["symbol"] for r in results] == ["T0", "T1", "T2", "T3", "T4"]
+
+
+def test_session_recreated_after_close():
+    async def _open_close():
+        first = get_http_session()
+        await close_http_session()
+        second = get_http_session()
+        await close_http_session()
+        return first, second
+
+    first, second = asyncio.run(_open_close())
+    assert first is not second
+    assert first.closed and second.closed
+
+
+def test_session_from_finished_loop_is_released():
+    async def _open():
+        return get_http_session()
+
+    first = asyncio.run(_open())
+    assert not first.closed
+
+    async def _reopen():
+        second = get_http_session()
+        await close_http_session()
+        return second
+
+    second = asyncio.run(_reopen())
+    assert first.closed and first is not second
+
+
+def test_fetch_new_coins_from_dex_uses_shared_session(monkeypatch):
+    import time
+    import coin_launch_monitor
+
+    stored = []
+
+    async def fake_store_coins(coins, source):
+        stored.extend(coins)
+
+    monkeypatch.setattr(coin_launch_monitor, "store_coins", fake_store_coins)
+
+    async def run():
+        async def pairs(request):
+            now_ms = int(time.time() * 1000)
+            return web.json_response({"pairs": [
+                {"baseToken": {"symbol": "NEW", "name": "New"}, "pairCreatedAt": now_ms},
+                {"baseToken": {"symbol": "OLD", "name": "Old"}, "pairCreatedAt": now_ms - 3_600_000},
+            ]})
+
+        app = web.Application()
+        app.router.add_get("/latest/dex/search", pairs)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        monkeypatch.setattr(coin_launch_monitor, "DEX_SCREENER_API_URL", f"http://127.0.0.1:{port}/latest/dex/search")
+        try:
+            session = get_http_session()
+            await coin_launch_monitor.fetch_new_coins_from_dex()
+            return session, get_http_session()
+        finally:
+            await close_http_session()
+            await runner.cleanup()
+
+    before, after = asyncio.run(run())
+    assert before is after
+    assert [coin["symbol"] for coin in stored] == ["NEW"]
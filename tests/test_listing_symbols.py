@@ -0,0 +1,39 @@
+# File: tests/test_listing_symbols.py
+# Purpose: Check ticker extraction from Binance listing announcement titles
+
+import pytest
+
+from utils.listing_symbols import extract_listing_symbols, is_listing_title
+
+
+@pytest.mark.parametrize("title, expected", [
+    ("Binance Will List XYZ (XYZ)", ["XYZ"]),
+    ("Binance Will List Pepe (PEPE) and Floki (FLOKI)", ["PEPE", "FLOKI"]),
+    ("Binance Will List Arbitrum (ARB) with Seed Tag Applied", ["ARB"]),
+    ("Binance Will List First Digital USD (FDUSD) (2024-05-01 10:00 UTC)", ["FDUSD"]),
+    ("Binance Will List ABC, DEF and GHI with Seed Tag Applied", ["ABC", "DEF", "GHI"]),
+    ("Binance Lists 1000SATS", ["1000SATS"]),
+    ("Binance Will List XYZ (XYZ) - Trading Pairs XYZ (XYZ)", ["XYZ"]),
+    ("Binance Will List Bonk (BONK) – Binance Will Delist ABC (ABC)", ["BONK"]),
+    ("Binance Will List Bonk (BONK) | Binance Will Delist ABC (ABC)", ["BONK"]),
+])
+def test_symbols_read_from_title(title, expected):
+    assert extract_listing_symbols(title) == expected
+
+
+@pytest.mark.parametrize("title", [
+    "Binance Will List Pepe",
+    "Pepe listed on Binance",
+    "Binance Will List",
+    "Binance Will List USDC on TRON (TRC20)",
+    "Binance Will List Pepe – Binance Will Delist ABC (ABC)",
+])
+def test_ambiguous_titles_need_page_parse(title):
+    assert extract_listing_symbols(title) is None
+
+
+def test_non_listing_titles():
+    title = "Binance Will Delist ABC (ABC) on 2024-06-01"
+    assert not is_listing_title(title)
+    assert extract_listing_symbols(title) == []
+    assert extract_listing_symbols("Notice on New Trading Pairs & Trading Bots Services") == []
@@ -0,0 +1,60 @@
+# File: tests/test_notification_filtering.py
+# Purpose: Check the batch legitimacy filter rules and missing-value handling
+
+import notification_filtering
+from notification_filtering import TokenFilter
+
+NOW = 1_717_000_000
+
+
+def _pair(symbol, fdv=2_000_000, liquidity=10_000, price="0.5", chain="solana", age_hours=48):
+    return {
+        "symbol": symbol,
+        "fdv": fdv,
+        "liquidity": liquidity,
+        "priceUsd": price,
+        "chain": chain,
+        "pairCreatedAt": None if age_hours is None else (NOW - age_hours * 3600) * 1000,
+    }
+
+
+def test_default_rules_match_previous_thresholds():
+    tokens = [
+        _pair("OK"),
+        _pair("SMALLFDV", fdv=999_999),
+        _pair("THIN", liquidity=100),
+        _pair("NOFDV", fdv=None),
+        _pair("NOLIQ", liquidity=None),
+    ]
+    assert [t["symbol"] for t in TokenFilter().filter(tokens, now=NOW)] == ["OK"]
+
+
+def test_missing_liquidity_no_longer_drops_the_batch(monkeypatch):
+    monkeypatch.setattr(notification_filtering, "TOKEN_FILTER", TokenFilter())
+    tokens = [_pair("NOLIQ", liquidity=None), _pair("OK")]
+    assert [t["symbol"] for t in notification_filtering.filter_legit_tokens(tokens)] == ["OK"]
+
+
+def test_price_chain_and_age_rules():
+    token_filter = TokenFilter({
+        "price": {"min": 0.01, "max": 100},
+        "chains": {"allow": ["solana", "base"], "deny": ["base"]},
+        "pair_age": {"min": 3600, "max": 7 * 24 * 3600, "on_missing": "pass"},
+    })
+    tokens = [
+        _pair("OK"),
+        _pair("CHEAP", price="0.0001"),
+        _pair("BADPRICE", price="n/a"),
+        _pair("ETH", chain="ethereum"),
+        _pair("DENIED", chain="base"),
+        _pair("FRESH", age_hours=0.5),
+        _pair("OLD", age_hours=24 * 30),
+        _pair("UNKNOWNAGE", age_hours=None),
+    ]
+    kept = token_filter.filter(tokens, now=NOW)
+    assert [t["symbol"] for t in kept] == ["OK", "UNKNOWNAGE"]
+    assert token_filter.last_rejections == {"price": 2, "pair_age": 2, "chains": 2}
+
+
+def test_empty_batch():
+    assert TokenFilter().filter([]) == []
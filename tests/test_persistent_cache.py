@@ -0,0 +1,88 @@
+# File: tests/test_persistent_cache.py
+# Purpose: Check that the on-disk lookup cache survives a restart and honours expiry
+
+import asyncio
+import logging
+
+import db_operations
+import dexscreener_api
+from utils import dexscreener_lookups, persistent_cache, response_cache
+from utils.persistent_cache import PersistentCache
+from utils.response_cache import MISS
+
+logging.basicConfig(level=logging.DEBUG)
+
+
+def test_entries_survive_reopen_and_expire(tmp_path, monkeypatch):
+    path = str(tmp_path / "lookup_cache.sqlite3")
+    cache = PersistentCache(path)
+    cache.set("pair_metadata", ["bsc", "0xabc"], 1700000000000)
+    cache.set("links_extra", "0xabc", [{"url": "https://x"}], ttl=60)
+    cache.close()
+
+    reopened = PersistentCache(path)
+    assert reopened.get("pair_metadata", ["bsc", "0xabc"]) == 1700000000000
+    assert reopened.get("links_extra", "0xabc") == [{"url": "https://x"}]
+
+    now = persistent_cache.time.time() + 120
+    monkeypatch.setattr(persistent_cache.time, "time", lambda: now)
+    assert reopened.get("links_extra", "0xabc") is MISS
+    assert reopened.get("pair_metadata", ["bsc", "0xabc"]) == 1700000000000
+    assert reopened.purge_expired() == 1
+
+
+def test_restarted_process_starts_warm(tmp_path, monkeypatch):
+    monkeypatch.setitem(persistent_cache.PERSISTENT_CONFIG, "enabled", True)
+    monkeypatch.setitem(persistent_cache.PERSISTENT_CONFIG, "path", str(tmp_path / "lookup_cache.sqlite3"))
+    monkeypatch.setattr(persistent_cache, "_persistent_cache", None)
+    monkeypatch.setattr(response_cache, "_caches", {})
+
+    lookups = []
+
+    async def fake_lookup(token_address, chain_id):
+        lookups.append(token_address)
+        return 1700000000000
+
+    monkeypatch.setattr(dexscreener_lookups, "lookup_pair_created_at", fake_lookup)
+    first = asyncio.run(dexscreener_api.fetch_dexscreener_pair_metadata("0xabc", "bsc"))
+
+    # Simulate a restart: fresh in-memory caches, reopened database file. The coin
+    # pipeline shares the same lookup, so it starts warm from the profile pipeline's entry
+    persistent_cache._persistent_cache.close()
+    monkeypatch.setattr(persistent_cache, "_persistent_cache", None)
+    monkeypatch.setattr(response_cache, "_caches", {})
+    second = asyncio.run(db_operations.fetch_dexscreener_pair_metadata("0xabc", "bsc"))
+
+    assert first == second == 1700000000000
+    assert lookups == ["0xabc"]
+    persistent_cache._persistent_cache.close()
+
+
+def test_reads_and_writes_run_off_the_event_loop(tmp_path, monkeypatch):
+    import threading
+
+    monkeypatch.setitem(persistent_cache.PERSISTENT_CONFIG, "enabled", True)
+    monkeypatch.setitem(persistent_cache.PERSISTENT_CONFIG, "path", str(tmp_path / "lookup_cache.sqlite3"))
+    monkeypatch.setattr(persistent_cache, "_persistent_cache", None)
+
+    threads = []
+    original_get, original_set = PersistentCache.get, PersistentCache.set
+
+    def recording_get(self, *args):
+        threads.append(threading.get_ident())
+        return original_get(self, *args)
+
+    def recording_set(self, *args):
+        threads.append(threading.get_ident())
+        return original_set(self, *args)
+
+    monkeypatch.setattr(PersistentCache, "get", recording_get)
+    monkeypatch.setattr(PersistentCache, "set", recording_set)
+
+    async def run():
+        await persistent_cache.save_persistent("links_extra", "0xabc", {"twitter": "x"}, ttl=60)
+        return await persistent_cache.load_persistent("links_extra", "0xabc")
+
+    assert asyncio.run(run()) == {"twitter": "x"}
+    assert len(threads) == 2 and threading.get_ident() not in threads
+    persistent_cache._persistent_cache.close()
@@ -0,0 +1,79 @@
+# File: tests/test_recent_coins.py
+# Purpose: Check the bounded recent-coins cache: created_at ordering, per-source views,
+# TTL reloads and write-through from store_coins
+
+import asyncio
+from datetime import datetime
+
+import db_operations
+from utils.recent_coins import RecentCoinsCache
+
+
+def _coin(symbol, source, day, address=None):
+    return {"symbol": symbol, "source": source, "created_at": f"2024-01-{day:02d}T00:00:00", "token_address": address}
+
+
+def test_bounded_per_source_and_ordered_by_created_at():
+    cache = RecentCoinsCache(lambda: [], max_per_source=2, ttl=None)
+    cache.reload()
+    cache.add_many([
+        _coin("A", "binance", 3), _coin("B", "binance", 1), _coin("C", "binance", 5),
+        _coin("X", "dexscreener", 4, "0x1"), _coin("Y", "dexscreener", 2, "0x2"),
+    ])
+    # Re-storing a coin replaces it rather than adding a second entry
+    cache.add_many([_coin("Y", "dexscreener", 6, "0x2")])
+
+    assert [c["symbol"] for c in cache.get()] == ["Y", "C", "X", "A"]
+    assert [c["symbol"] for c in cache.get(source="binance")] == ["C", "A"]
+    assert [c["symbol"] for c in cache.get(source="dexscreener", limit=1)] == ["Y"]
+    assert cache.get(source="unknown") == []
+    assert len(cache) == 4
+
+
+def test_ttl_expiry_reloads_from_loader():
+    rows = [[_coin("OLD", "binance", 1)]]
+    cache = RecentCoinsCache(lambda: rows[0], ttl=60)
+
+    assert [c["symbol"] for c in cache.get()] == ["OLD"]
+    rows[0] = [_coin("NEW", "binance", 2)]
+    assert [c["symbol"] for c in cache.get()] == ["OLD"]
+    assert cache.hits == 1
+
+    cache.loaded_at -= 61
+    assert [c["symbol"] for c in cache.get()] == ["NEW"]
+    assert cache.reloads == 2
+
+
+def test_store_coins_writes_through_without_database_reads(monkeypatch):
+    cache = RecentCoinsCache(lambda: [], max_per_source=10, ttl=None)
+    cache.reload()
+    monkeypatch.setattr(db_operations, "RECENT_COINS", cache)
+    monkeypatch.setattr(db_operations, "_insert_coins", lambda values: None)
+
+    def no_database(*args, **kwargs):
+        raise AssertionError("readers must not touch the database")
+
+    monkeypatch.setattr(db_operations, "get_connection", no_database)
+
+    coins = [{"symbol": "NEWCOIN", "name": "New Coin", "created_at": datetime(2024, 1, 2), "token_address": "0xabc"}]
+    asyncio.run(db_operations.store_coins(coins, "dexscreener"))
+
+    cached = db_operations.get_cached_coins(source="dexscreener")
+    assert [(c["symbol"], c["token_address"], c["created_at"]) for c in cached] == [
+        ("NEWCOIN", "0xabc", "2024-01-02T00:00:00")
+    ]
+
+
+def test_failed_insert_is_not_cached(monkeypatch):
+    cache = RecentCoinsCache(lambda: [], ttl=None)
+    cache.reload()
+    monkeypatch.setattr(db_operations, "RECENT_COINS", cache)
+
+    def failing_insert(values):
+        raise RuntimeError("connection lost")
+
+    monkeypatch.setattr(db_operations, "_insert_coins", failing_insert)
+    coins = [{"symbol": "NEWCOIN", "created_at": datetime(2024, 1, 2)}]
+    asyncio.run(db_operations.store_coins(coins, "dexscreener"))
+
+    assert cache.get() == []
@@ -0,0 +1,131 @@
+# File: tests/test_request_scheduler.py
+# Purpose: Check lookup coalescing and token-bucket pacing of Dexscreener requests
+
+import asyncio
+import gc
+import logging
+import time
+
+from utils.request_scheduler import BatchScheduler, TokenBucket
+
+logging.basicConfig(level=logging.DEBUG)
+
+
+def test_concurrent_lookups_share_batches():
+    batches = []
+
+    async def fetch_batch(group, keys):
+        batches.append((group, list(keys)))
+        return {key: key.upper() for key in keys if key != "missing"}
+
+    async def run():
+        scheduler = BatchScheduler("test", fetch_batch, max_batch_size=30, max_delay=0.01)
+        keys = [f"addr{i}" for i in range(70)] + ["missing", "addr69"]
+        return scheduler, await asyncio.gather(*(scheduler.lookup("bsc", key) for key in keys))
+
+    scheduler, results = asyncio.run(run())
+
+    assert results[:70] == [f"ADDR{i}" for i in range(70)]
+    assert results[70] is None
+    assert results[71] == "ADDR69"
+    assert [len(keys) for _, keys in batches] == [30, 30, 11]
+    assert scheduler.batches_sent == 3
+
+
+def test_in_flight_sends_are_held_until_done():
+    release = None
+
+    async def fetch_batch(group, keys):
+        await release.wait()
+        return {key: key for key in keys}
+
+    async def run():
+        nonlocal release
+        release = asyncio.Event()
+        scheduler = BatchScheduler("test", fetch_batch, max_batch_size=2, max_delay=0.01)
+        lookups = asyncio.gather(*(scheduler.lookup("bsc", key) for key in ["a", "b", "c"]))
+        await asyncio.sleep(0.05)
+        in_flight = len(scheduler._sending)
+        gc.collect()
+        release.set()
+        results = await lookups
+        return in_flight, results, len(scheduler._sending)
+
+    in_flight, results, after = asyncio.run(run())
+    assert in_flight == 2
+    assert results == ["a", "b", "c"]
+    assert after == 0
+
+
+def test_batch_failure_reaches_every_waiter():
+    async def fetch_batch(group, keys):
+        raise RuntimeError("boom")
+
+    async def run():
+        scheduler = BatchScheduler("test", fetch_batch, max_delay=0.01)
+        return await asyncio.gather(*(scheduler.lookup("eth", key) for key in "abc"), return_exceptions=True)
+
+    results = asyncio.run(run())
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+
+def test_token_bucket_paces_after_burst():
+    async def run():
+        bucket = TokenBucket(rate=50, capacity=5)
+        started = time.monotonic()
+        for _ in range(15):
+            await bucket.acquire()
+        return time.monotonic() - started
+
+    elapsed = asyncio.run(run())
+    # 5 burst tokens, then 10 more at 50/s
+    assert 0.15 <= elapsed < 0.5
+
+
+def _recording_scheduler(monkeypatch, batches):
+    from utils import dexscreener_batch, response_cache
+
+    async def fetch_batch(chain_id, addresses):
+        batches.append(len(addresses))
+        return {address: 1700000000000 for address in addresses}
+
+    monkeypatch.setattr(response_cache, "_caches", {})
+    monkeypatch.setattr(
+        dexscreener_batch, "PAIR_CREATED_AT_SCHEDULER",
+        BatchScheduler("pair_created_at", fetch_batch, max_batch_size=30, max_delay=0.05)
+    )
+
+
+def test_token_profile_enrichment_fills_whole_batches(monkeypatch):
+    import dexscreener_api
+
+    batches = []
+    _recording_scheduler(monkeypatch, batches)
+
+    async def no_links(token_address):
+        return {}
+
+    monkeypatch.setattr(dexscreener_api, "fetch_dexscreener_links_extra", no_links)
+    tokens = [{"token_address": f"0x{i}", "chain_id": "solana"} for i in range(60)]
+    enriched = asyncio.run(dexscreener_api.enrich_token_profiles(tokens))
+
+    assert batches == [30, 30]
+    assert all(created_at.year == 2023 for created_at, _ in enriched)
+
+
+def test_store_coins_batches_missing_created_at(monkeypatch):
+    import db_operations
+
+    batches = []
+    _recording_scheduler(monkeypatch, batches)
+    rows = []
+    monkeypatch.setattr(db_operations, "_insert_coins", rows.extend)
+
+    coins = [{"symbol": f"T{i}", "token_address": f"0x{i}", "chain_id": "bsc"} for i in range(45)]
+    started = time.monotonic()
+    asyncio.run(db_operations.store_coins(coins, "dexscreener"))
+
+    assert batches == [30, 15]
+    # One max_delay wait for the partial batch, not one per coin
+    assert time.monotonic() - started < 0.5
+    assert {row[3] for row in rows} == {"2023-11-14T22:13:20"}
@@ -0,0 +1,79 @@
+# File: tests/test_response_cache.py
+# Purpose: Check TTL/LRU behaviour of the Dexscreener response cache
+
+import asyncio
+import logging
+from aiohttp import web
+
+from utils import response_cache
+from utils.http_client import close_http_session
+from utils.response_cache import MISS, TTLCache
+
+logging.basicConfig(level=logging.DEBUG)
+
+
+def test_lru_eviction_and_stats():
+    cache = TTLCache("test", max_entries=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1  # "b" is now least recently used
+    cache.set("c", 3)
+
+    assert cache.get("b") is MISS
+    assert cache.get("c") == 3
+    stats = cache.stats()
+    assert stats["evictions"] == 1
+    assert stats["hits"] == 2 and stats["misses"] == 1
+
+
+def test_negative_entries_expire_sooner(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(response_cache.time, "monotonic", lambda: now[0])
+    cache = TTLCache("test", ttl=60, negative_ttl=5)
+    cache.set("found", {"url": "x"})
+    cache.set("missing", {}, negative=True)
+
+    now[0] += 10
+    assert cache.get("missing") is MISS
+    assert cache.get("found") == {"url": "x"}
+    assert cache.stats()["expirations"] == 1
+
+
+def test_cached_values_are_copies():
+    cache = TTLCache("test")
+    cache.set("k", [{"symbol": "ABC"}])
+    cache.get("k")[0]["source_announcement"] = "mutated"
+    assert cache.get("k") == [{"symbol": "ABC"}]
+
+
+def test_search_404_is_negatively_cached(monkeypatch):
+    import dexscreener_utils
+
+    requests_seen = []
+
+    async def run():
+        app = web.Application()
+
+        async def search(request):
+            requests_seen.append(request.query["q"])
+            return web.json_response({}, status=404)
+
+        app.router.add_get("/latest/dex/search", search)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        monkeypatch.setattr(dexscreener_utils, "SEARCH_PAIRS_URL", f"http://127.0.0.1:{port}/latest/dex/search?q=")
+        try:
+            return [await dexscreener_utils.fetch_token_profiles("NOPE") for _ in range(3)]
+        finally:
+            await close_http_session()
+            await runner.cleanup()
+
+    monkeypatch.setattr(response_cache, "_caches", {})
+    results = asyncio.run(run())
+
+    assert results == [[], [], []]
+    assert requests_seen == ["NOPE"]
+    assert response_cache.cache_stats()["search"]["negative_hits"] == 2
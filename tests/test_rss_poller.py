@@ -0,0 +1,89 @@
+# File: tests/test_rss_poller.py
+# Purpose: Check conditional-GET RSS polling, acknowledgement and the persisted seen-entry store
+
+import asyncio
+import os
+
+from aiohttp import web
+
+from utils.http_client import close_http_session
+from utils.rss_poller import RSSPoller
+
+ITEM = "<item><title>Binance Will List {0} ({0})</title><link>https://example.com/{0}</link><guid>{0}</guid></item>"
+FEED = '<?xml version="1.0"?><rss version="2.0"><channel><title>Binance</title>{}</channel></rss>'
+
+
+def test_poll_sends_validators_and_only_returns_new_entries(tmp_path):
+    state_path = os.path.join(tmp_path, "rss", "binance.json")
+    items = ["AAA", "BBB"]
+    requests = []
+
+    async def rss(request):
+        etag = f'"v{len(items)}"'
+        requests.append(request.headers.get("If-None-Match"))
+        if request.headers.get("If-None-Match") == etag:
+            return web.Response(status=304)
+        body = FEED.format("".join(ITEM.format(symbol) for symbol in items))
+        return web.Response(text=body, content_type="application/rss+xml", headers={"ETag": etag})
+
+    async def run():
+        app = web.Application()
+        app.router.add_get("/rss", rss)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        url = f"http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}/rss"
+        try:
+            poller = RSSPoller(url, state_path)
+            first = await poller.poll()
+            await poller.acknowledge([entry.id for entry in first])
+            unchanged = await poller.poll()
+            items.append("CCC")
+            changed = await poller.poll()
+            await poller.acknowledge([entry.id for entry in changed])
+
+            # A restarted process picks up the persisted validators and seen GUIDs
+            restarted = RSSPoller(url, state_path)
+            after_restart = await restarted.poll()
+            return first, unchanged, changed, after_restart, poller.not_modified
+        finally:
+            await close_http_session()
+            await runner.cleanup()
+
+    first, unchanged, changed, after_restart, not_modified = asyncio.run(run())
+
+    assert [entry.title for entry in first] == ["Binance Will List AAA (AAA)", "Binance Will List BBB (BBB)"]
+    assert unchanged == []
+    assert not_modified == 1
+    assert [entry.id for entry in changed] == ["CCC"]
+    assert after_restart == []
+    assert requests == [None, '"v2"', '"v2"', '"v3"']
+
+
+def test_seen_store_is_bounded(tmp_path):
+    poller = RSSPoller("http://example.invalid/rss", os.path.join(tmp_path, "state.json"), max_seen=3)
+    entries = [{"id": f"guid-{i}"} for i in range(5)]
+    assert len(poller._take_new(entries)) == 5
+    poller.acknowledge_sync(entry["id"] for entry in entries)
+    assert list(poller.seen) == ["guid-2", "guid-3", "guid-4"]
+    assert poller._take_new([{"id": "guid-4"}, {"id": "guid-5"}]) == [{"id": "guid-5"}]
+
+
+def test_unacknowledged_entries_are_returned_again(tmp_path):
+    state_path = os.path.join(tmp_path, "state.json")
+    poller = RSSPoller("http://example.invalid/rss", state_path, max_attempts=2)
+    poller.etag = '"v1"'
+    entries = [{"id": "handled"}, {"id": "failed"}]
+
+    assert poller._take_new(entries) == entries
+    poller.acknowledge_sync(["handled"])
+    # The pending entry keeps the validators out of the request and off disk
+    assert poller.pending == {"failed": 1}
+    restarted = RSSPoller("http://example.invalid/rss", state_path)
+    assert restarted.etag is None and list(restarted.seen) == ["handled"]
+
+    assert poller._take_new(entries) == [{"id": "failed"}]
+    # Given up on after max_attempts polls without an acknowledgement
+    assert poller._take_new(entries) == []
+    assert not poller.pending and "failed" in poller.seen
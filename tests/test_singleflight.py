@@ -0,0 +1,129 @@
+# File: tests/test_singleflight.py
+# Purpose: Check that concurrent identical Dexscreener queries share one request
+
+import asyncio
+from collections import Counter
+
+from aiohttp import web
+
+from utils import response_cache
+from utils.http_client import close_http_session
+from utils.singleflight import SingleFlight, get_singleflight
+
+
+def test_concurrent_calls_share_one_execution():
+    group = SingleFlight("test")
+    executions = Counter()
+
+    async def lookup(key):
+        executions[key] += 1
+        await asyncio.sleep(0.05)
+        return [{"symbol": key}]
+
+    async def run():
+        return await asyncio.gather(*(group.do(key, lookup, key) for key in ["A", "A", "A", "B"]))
+
+    results = asyncio.run(run())
+    assert executions == {"A": 1, "B": 1}
+    assert group.stats() == {"calls": 4, "coalesced": 2, "in_flight": 0}
+    assert results[0] == results[1] == [{"symbol": "A"}]
+    # Followers get their own copy
+    assert results[0] is not results[1]
+
+
+def test_errors_reach_every_caller_and_cancellation_is_isolated():
+    group = SingleFlight("test")
+
+    async def failing():
+        await asyncio.sleep(0.02)
+        raise ValueError("boom")
+
+    async def slow():
+        await asyncio.sleep(0.05)
+        return "done"
+
+    async def run():
+        errors = await asyncio.gather(group.do("x", failing), group.do("x", failing), return_exceptions=True)
+
+        leader = asyncio.create_task(group.do("y", slow))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(group.do("y", slow))
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        return errors, await follower
+
+    errors, follower_result = asyncio.run(run())
+    assert all(isinstance(e, ValueError) for e in errors)
+    assert follower_result == "done"
+
+
+def test_both_import_paths_coalesce_search_requests():
+    import dexscreener_utils
+    from dexscreener_monitoring import dexscreener_utils as package_dexscreener_utils
+
+    requests = []
+
+    async def search(request):
+        requests.append(request.query["q"])
+        await asyncio.sleep(0.05)
+        return web.json_response({"pairs": [{"baseToken": {"symbol": request.query["q"]}, "chainId": "bsc"}]})
+
+    async def run():
+        app = web.Application()
+        app.router.add_get("/latest/dex/search", search)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        url = f"http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}/latest/dex/search?q="
+        originals = dexscreener_utils.SEARCH_PAIRS_URL, package_dexscreener_utils.SEARCH_PAIRS_URL
+        dexscreener_utils.SEARCH_PAIRS_URL = package_dexscreener_utils.SEARCH_PAIRS_URL = url
+        try:
+            return await asyncio.gather(
+                dexscreener_utils.fetch_token_profiles("NEWCOIN"),
+                package_dexscreener_utils.fetch_token_profiles("NEWCOIN"),
+            )
+        finally:
+            dexscreener_utils.SEARCH_PAIRS_URL, package_dexscreener_utils.SEARCH_PAIRS_URL = originals
+            await close_http_session()
+            await runner.cleanup()
+
+    response_cache._caches.pop("search", None)
+    coalesced_before = get_singleflight("search").coalesced
+    first, second = asyncio.run(run())
+
+    assert requests == ["NEWCOIN"]
+    assert first == second and first[0]["symbol"] == "NEWCOIN"
+    assert get_singleflight("search").coalesced == coalesced_before + 1
+
+
+def test_profile_links_lookups_share_one_request(monkeypatch):
+    from utils import dexscreener_lookups
+
+    requests = []
+
+    async def profile(request):
+        requests.append(request.match_info["address"])
+        await asyncio.sleep(0.05)
+        return web.json_response({"links": [{"url": "https://example.com"}]})
+
+    async def run():
+        app = web.Application()
+        app.router.add_get("/token-profiles/{address}", profile)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        monkeypatch.setattr(dexscreener_lookups, "TOKEN_PROFILES_URL", f"http://127.0.0.1:{port}/token-profiles")
+        try:
+            return await asyncio.gather(*(dexscreener_lookups.fetch_dexscreener_links_extra("0xabc") for _ in range(3)))
+        finally:
+            await close_http_session()
+            await runner.cleanup()
+
+    monkeypatch.setattr(response_cache, "_caches", {})
+    results = asyncio.run(run())
+
+    assert requests == ["0xabc"]
+    assert results[0] == results[1] == results[2] == [{"url": "https://example.com"}]
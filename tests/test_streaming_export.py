@@ -0,0 +1,102 @@
+# File: tests/test_streaming_export.py
+# Purpose: Check that the token profile export streams through a named cursor and keeps
+# memory flat as the table grows
+
+import json
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+
+import export_token_profiles
+
+
+class NamedCursor:
+    """Produces rows lazily, like a server-side cursor, and refuses fetchall()."""
+
+    def __init__(self, row_count):
+        self.row_count = row_count
+        self.position = 0
+        self.fetches = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, query, params=None):
+        assert query.startswith("SELECT symbol, name, chain_id")
+
+    def fetchmany(self, size):
+        self.fetches += 1
+        end = min(self.position + size, self.row_count)
+        rows = [self._row(i) for i in range(self.position, end)]
+        self.position = end
+        return rows
+
+    def fetchall(self):
+        raise AssertionError("export must not load the whole table")
+
+    @staticmethod
+    def _row(i):
+        return (
+            f"TOK{i}", f"Token {i}", "solana", f"0x{i:040x}", datetime(2024, 1, 1, 12, 0, i % 60),
+            None, None, None, "x" * 200, json.dumps({"twitter": f"https://x.com/tok{i}"}), json.dumps({})
+        )
+
+
+def _patch_table(monkeypatch, row_count):
+    cursor = NamedCursor(row_count)
+
+    class Connection:
+        def cursor(self, name=None):
+            assert name, "expected a named (server-side) cursor"
+            return cursor
+
+    @contextmanager
+    def fake_get_connection():
+        yield Connection()
+
+    monkeypatch.setattr(export_token_profiles, "get_connection", fake_get_connection)
+    return cursor
+
+
+def test_json_array_export_matches_previous_layout(monkeypatch, tmp_path):
+    cursor = _patch_table(monkeypatch, 5)
+    path = tmp_path / "profiles.json"
+
+    assert export_token_profiles.export_token_profiles_to_json(str(path), "json", chunk_size=2) == 5
+    assert cursor.fetches == 4
+
+    text = path.read_text()
+    entries = json.loads(text)
+    assert [entry["symbol"] for entry in entries] == [f"TOK{i}" for i in range(5)]
+    assert entries[1]["links"] == {"twitter": "https://x.com/tok1"}
+    assert entries[1]["created_at"] == "2024-01-01T12:00:01"
+    assert text == json.dumps(entries, indent=2)
+
+
+def test_ndjson_export_and_empty_table(monkeypatch, tmp_path):
+    _patch_table(monkeypatch, 3)
+    path = tmp_path / "profiles.ndjson"
+    assert export_token_profiles.export_token_profiles_to_json(str(path), "ndjson", chunk_size=2) == 3
+    lines = path.read_text().splitlines()
+    assert [json.loads(line)["token_address"] for line in lines] == [f"0x{i:040x}" for i in range(3)]
+
+    _patch_table(monkeypatch, 0)
+    empty = tmp_path / "empty.json"
+    assert export_token_profiles.export_token_profiles_to_json(str(empty), "json") == 0
+    assert json.loads(empty.read_text()) == []
+
+
+def test_peak_memory_does_not_grow_with_table(monkeypatch, tmp_path):
+    def peak_for(row_count):
+        _patch_table(monkeypatch, row_count)
+        tracemalloc.start()
+        export_token_profiles.export_token_profiles_to_json(str(tmp_path / f"{row_count}.json"), "json", chunk_size=500)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        return peak
+
+    small, large = peak_for(1_000), peak_for(8_000)
+    assert large < small * 1.5
@@ -0,0 +1,67 @@
+# File: tests/test_symbol_index.py
+# Purpose: Check the in-process Binance symbol index used for dedup in store_coins
+
+import asyncio
+import logging
+from datetime import datetime
+
+import db
+import db_operations
+from utils.symbol_index import BloomFilter, SymbolIndex
+
+logging.basicConfig(level=logging.INFO)
+
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(capacity=10_000, error_rate=0.001)
+    symbols = [f"TOKEN{i}USDT" for i in range(10_000)]
+    for symbol in symbols:
+        bloom.add(symbol)
+
+    assert all(symbol in bloom for symbol in symbols)
+    false_positives = sum(f"OTHER{i}USDT" in bloom for i in range(10_000))
+    assert false_positives < 50
+
+
+def test_index_warms_once_and_tracks_additions():
+    calls = []
+
+    def loader():
+        calls.append(1)
+        return ["BTCUSDT", "ETHUSDT"]
+
+    index = SymbolIndex(loader)
+    index.warm()
+    index.add_many(["SOLUSDT", "BTCUSDT"])
+
+    assert calls == [1]
+    assert "SOLUSDT" in index and "BTCUSDT" in index
+    assert "DOGEUSDT" not in index
+    assert len(index) == 3
+
+
+def test_store_coins_dedups_without_database_scan(monkeypatch):
+    loads = []
+    inserted = []
+
+    def fake_load():
+        loads.append(1)
+        return {"BTCUSDT"}
+
+    monkeypatch.setattr(db_operations, "BINANCE_SYMBOL_INDEX", SymbolIndex(fake_load))
+    monkeypatch.setattr(db_operations, "_insert_coins", lambda values: inserted.extend(v[0] for v in values))
+
+    batch = [{"symbol": s, "name": s, "created_at": datetime.utcnow()} for s in ("BTCUSDT", "NEWUSDT", "NEWBTC", "NEWUSDT")]
+
+    async def run():
+        try:
+            await db_operations.store_coins(batch, "binance")
+            await db_operations.store_coins(batch, "binance")
+        finally:
+            db.close_db_pool()
+
+    asyncio.run(run())
+
+    assert inserted == ["NEWUSDT"]
+    assert loads == [1]
+    assert "NEWUSDT" in db_operations.BINANCE_SYMBOL_INDEX
@@ -0,0 +1,190 @@
+# File: tests/test_token_profile_upserts.py
+# Purpose: Check that unchanged token profiles are not rewritten and batches report
+# inserted/updated/unchanged counts
+
+import asyncio
+from contextlib import contextmanager
+
+import db
+import dexscreener_api
+
+
+class FakeTokenProfilesTable:
+    """Applies the upsert's content_hash and fallback created_at rules to an in-memory table."""
+
+    def __init__(self):
+        self.rows = {}
+        self.rewrites = 0
+        self.touches = 0
+
+    def cursor(self):
+        return self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, query, params=None):
+        pass
+
+    def commit(self):
+        pass
+
+    def execute_values(self, cursor, query, values, fetch=False):
+        if query.lstrip().startswith("UPDATE"):
+            for token_address, fetched_at, stale_before in values:
+                row = self.rows[token_address]
+                if row[5] < stale_before:
+                    self.rows[token_address] = row[:5] + (fetched_at,) + row[6:]
+                    self.touches += 1
+            return None
+
+        returned = []
+        for row in values:
+            stored = self.rows.get(row[0])
+            if stored is not None and stored[-1] == row[-1]:
+                continue
+            if stored is not None and row[4] == row[5] and stored[4] is not None:
+                row = row[:4] + (stored[4],) + row[5:]
+            self.rows[row[0]] = row
+            self.rewrites += 1
+            returned.append((row[0], stored is None))
+        return returned
+
+
+def _tokens(descriptions, created_at=1700000000000):
+    return [
+        {
+            "token_address": f"0x{i:040x}",
+            "symbol": f"TOK{i}",
+            "chain_id": "solana",
+            "created_at": created_at,
+            "description": description,
+        }
+        for i, description in enumerate(descriptions)
+    ]
+
+
+def _use_fake_table(monkeypatch, table):
+    @contextmanager
+    def fake_get_connection():
+        yield table
+
+    async def no_links(token_address):
+        return {}
+
+    async def no_pair(token_address, chain_id):
+        return None
+
+    monkeypatch.setattr(dexscreener_api, "get_connection", fake_get_connection)
+    monkeypatch.setattr(dexscreener_api, "execute_values", table.execute_values)
+    monkeypatch.setattr(dexscreener_api, "fetch_dexscreener_links_extra", no_links)
+    monkeypatch.setattr(dexscreener_api, "fetch_dexscreener_pair_metadata", no_pair)
+
+
+def test_only_changed_profiles_are_rewritten(monkeypatch):
+    table = FakeTokenProfilesTable()
+    _use_fake_table(monkeypatch, table)
+
+    async def run():
+        try:
+            first = await dexscreener_api.store_token_profiles(_tokens(["a", "b", "c"]))
+            second = await dexscreener_api.store_token_profiles(_tokens(["a", "B", "c", "d"]))
+            return first, second
+        finally:
+            db.close_db_pool()
+
+    first, second = asyncio.run(run())
+
+    assert first == {"inserted": 3, "updated": 0, "unchanged": 0}
+    assert second == {"inserted": 1, "updated": 1, "unchanged": 2}
+    assert table.rewrites == 5
+    # Unchanged rows were fetched seconds ago, well inside the touch interval
+    assert table.touches == 0
+
+
+def test_fingerprint_ignores_fetched_at():
+    row = ("0xabc", "TOK", "Token", "solana", None, "2024-01-01", None, None, None, "desc", "{}", "{}")
+    refetched = row[:5] + ("2024-06-01",) + row[6:]
+    edited = row[:9] + ("new desc",) + row[10:]
+
+    assert dexscreener_api.profile_fingerprint(row) == dexscreener_api.profile_fingerprint(refetched)
+    assert dexscreener_api.profile_fingerprint(row) != dexscreener_api.profile_fingerprint(edited)
+
+
+def test_fallback_created_at_does_not_change_the_hash(monkeypatch):
+    table = FakeTokenProfilesTable()
+    _use_fake_table(monkeypatch, table)
+
+    async def run():
+        try:
+            first = await dexscreener_api.store_token_profiles(_tokens(["a"], created_at=None))
+            await asyncio.sleep(0.01)
+            second = await dexscreener_api.store_token_profiles(_tokens(["a"], created_at=None))
+            return first, second
+        finally:
+            db.close_db_pool()
+
+    first, second = asyncio.run(run())
+    assert first == {"inserted": 1, "updated": 0, "unchanged": 0}
+    assert second == {"inserted": 0, "updated": 0, "unchanged": 1}
+    # The stored row still gets a created_at: when the token was first seen
+    first_seen = next(iter(table.rows.values()))[4]
+    assert first_seen is not None
+
+    async def edit():
+        try:
+            await asyncio.sleep(0.01)
+            return await dexscreener_api.store_token_profiles(_tokens(["edited"], created_at=None))
+        finally:
+            db.close_db_pool()
+
+    # A content change rewrites the row but keeps the first-seen created_at
+    assert asyncio.run(edit()) == {"inserted": 0, "updated": 1, "unchanged": 0}
+    row = next(iter(table.rows.values()))
+    assert row[4] == first_seen and row[5] > first_seen
+    assert "COALESCE(token_profiles.created_at, EXCLUDED.created_at)" in dexscreener_api.PROFILE_CONFLICT_CLAUSE
+
+
+def test_content_hash_migration_commits_before_the_upsert(monkeypatch):
+    events = []
+
+    class RecordingConnection(FakeTokenProfilesTable):
+        def __init__(self, fail_commit=False):
+            super().__init__()
+            self.fail_commit = fail_commit
+
+        def execute(self, query, params=None):
+            events.append(query.split()[0])
+
+        def commit(self):
+            if self.fail_commit:
+                raise RuntimeError("connection lost")
+            events.append("COMMIT")
+
+    connections = [RecordingConnection(fail_commit=True)]
+
+    @contextmanager
+    def fake_get_connection():
+        yield connections[0]
+
+    monkeypatch.setattr(dexscreener_api, "get_connection", fake_get_connection)
+    monkeypatch.setattr(dexscreener_api, "_content_hash_column_ready", False)
+
+    # A migration that never committed is retried on the next write
+    try:
+        dexscreener_api._ensure_content_hash_column()
+    except RuntimeError:
+        pass
+    assert dexscreener_api._content_hash_column_ready is False
+
+    connections[0] = RecordingConnection()
+    monkeypatch.setattr(dexscreener_api, "execute_values", connections[0].execute_values)
+    events.clear()
+    row = ("0xabc", "TOK", "Token", "solana", None, None, None, None, None, "desc", "{}", "{}")
+    dexscreener_api._upsert_token_profiles([row + (dexscreener_api.profile_fingerprint(row),)])
+
+    assert events == ["ALTER", "COMMIT", "COMMIT"]
+    assert dexscreener_api._content_hash_column_ready is True
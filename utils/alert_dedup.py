@@ -0,0 +1,184 @@
+# utils/alert_dedup.py
+# Suppresses repeat alerts for the same pair within a time window. Keys are kept in an
+# OrderedDict in the order they were last alerted, so membership checks are O(1) and
+# expired or excess keys are evicted from the front. Admitting an alert only reserves
+# its key in memory; once a sink has accepted the alert it is recorded in a small
+# journal file (from a worker thread), which is replayed on start-up so a restart does
+# not re-alert and is compacted once it grows well past the live entries.
+
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+# Load config
+CONFIG_FILE = "config.json"
+with open(CONFIG_FILE, "r") as file:
+    CONFIG = json.load(file)
+
+DEDUP_CONFIG = CONFIG.get("alerts", {}).get("dedup", {})
+
+
+def alert_key(token):
+    """Identify an alert by chain, pair address and symbol."""
+    chain = (token.get("chain") or "").lower()
+    pair_address = (token.get("pairAddress") or "").lower()
+    symbol = (token.get("symbol") or "").upper()
+    return f"{chain}:{pair_address}:{symbol}"
+
+
+class AlertDeduplicator:
+    """
+    Remembers which alerts went out in the last `window` seconds, up to `max_entries` keys.
+    admit() runs on the event loop and never touches the disk; record_sync() and release()
+    settle each admitted alert once the sinks have accepted or dropped it.
+    """
+
+    def __init__(self, state_path, window=86400, max_entries=50000):
+        self.state_path = state_path
+        self.window = window
+        self.max_entries = max_entries
+        self.sent = OrderedDict()
+        self.suppressed = 0
+        # Keys admitted but not yet recorded or released
+        self.pending = set()
+        self._lock = threading.Lock()
+        self._io_lock = threading.Lock()
+        self._journal = None
+        self._journal_lines = 0
+        self._load_state()
+
+    # --------------------------------------------------------
+    # Persisted state
+    # --------------------------------------------------------
+    def _load_state(self):
+        try:
+            with open(self.state_path, "r") as f:
+                for line in f:
+                    try:
+                        key, sent_at = json.loads(line)
+                    except ValueError:
+                        # A partially written last line after a crash
+                        continue
+                    self.sent.pop(key, None)
+                    self.sent[key] = sent_at
+                    self._journal_lines += 1
+        except FileNotFoundError:
+            return
+        self._evict(time.time())
+
+    def _open_journal(self):
+        if self._journal is None:
+            directory = os.path.dirname(self.state_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._journal = open(self.state_path, "a")
+        return self._journal
+
+    def _close_journal(self):
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+
+    def _compact(self):
+        """Rewrite the journal with only the recorded live entries."""
+        with self._lock:
+            entries = [(key, sent_at) for key, sent_at in self.sent.items() if key not in self.pending]
+        self._close_journal()
+        tmp_path = f"{self.state_path}.tmp"
+        with open(tmp_path, "w") as f:
+            f.writelines(json.dumps([key, sent_at]) + "\n" for key, sent_at in entries)
+        os.replace(tmp_path, self.state_path)
+        self._journal_lines = len(entries)
+
+    def record_sync(self, tokens):
+        """Blocking journal append for alerts a sink accepted; runs on a worker thread when dispatched."""
+        with self._lock:
+            journal_lines = []
+            for token in tokens:
+                key = alert_key(token)
+                if key in self.pending:
+                    self.pending.discard(key)
+                    journal_lines.append(json.dumps([key, self.sent[key]]) + "\n")
+            live = len(self.sent)
+        if not journal_lines:
+            return
+        with self._io_lock:
+            journal = self._open_journal()
+            journal.writelines(journal_lines)
+            journal.flush()
+            self._journal_lines += len(journal_lines)
+            if self._journal_lines > 2 * max(live, 1000):
+                self._compact()
+
+    def release(self, tokens):
+        """Forget admitted alerts that no sink accepted, so they can alert again."""
+        with self._lock:
+            for token in tokens:
+                key = alert_key(token)
+                if key in self.pending:
+                    self.pending.discard(key)
+                    self.sent.pop(key, None)
+
+    def close(self):
+        with self._io_lock:
+            self._close_journal()
+
+    def reset(self):
+        """Forget every sent alert, including the persisted copy."""
+        with self._io_lock:
+            self._close_journal()
+            with self._lock:
+                self.sent.clear()
+                self.pending.clear()
+            self._journal_lines = 0
+            try:
+                os.remove(self.state_path)
+            except FileNotFoundError:
+                pass
+
+    # --------------------------------------------------------
+    # Checks
+    # --------------------------------------------------------
+    def _evict(self, now):
+        cutoff = now - self.window
+        while self.sent and (len(self.sent) > self.max_entries or next(iter(self.sent.values())) <= cutoff):
+            key, _ = self.sent.popitem(last=False)
+            self.pending.discard(key)
+
+    def admit(self, tokens, now=None):
+        """
+        Return the tokens not alerted within the window and reserve their keys. Each
+        admitted token must later be passed to record_sync() or release(). Duplicates
+        inside `tokens` are admitted once.
+        """
+        now = time.time() if now is None else now
+        admitted = []
+        with self._lock:
+            self._evict(now)
+            for token in tokens:
+                key = alert_key(token)
+                if key in self.sent:
+                    self.suppressed += 1
+                    continue
+                self.sent[key] = now
+                self.pending.add(key)
+                admitted.append(token)
+            self._evict(now)
+        return admitted
+
+
+_deduplicator = None
+
+
+def get_alert_deduplicator():
+    """Return the shared deduplicator configured by the alerts.dedup block."""
+    global _deduplicator
+    if _deduplicator is None:
+        _deduplicator = AlertDeduplicator(
+            DEDUP_CONFIG.get("path", "cache/alert_dedup.jsonl"),
+            window=DEDUP_CONFIG.get("window", 86400),
+            max_entries=DEDUP_CONFIG.get("max_entries", 50000),
+        )
+    return _deduplicator
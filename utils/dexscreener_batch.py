@@ -0,0 +1,57 @@
+# utils/dexscreener_batch.py
+# Multi-address Dexscreener token lookups. Concurrent single-token requests are
+# coalesced by a BatchScheduler into /tokens/v1/{chainId}/{addr1,addr2,...} calls.
+
+import json
+import logging
+from utils.http_client import get_http_session
+from utils.request_scheduler import BatchScheduler, get_rate_limiter
+
+# Load config
+CONFIG_FILE = "config.json"
+with open(CONFIG_FILE, "r") as file:
+    CONFIG = json.load(file)
+
+BATCH_CONFIG = CONFIG.get("dexscreener", {}).get("batching", {})
+DEXSCREENER_TOKENS_URL = CONFIG["dexscreener"].get("tokens_url", "https://api.dexscreener.com/tokens/v1")
+
+
+async def _fetch_pair_created_at_batch(chain_id, token_addresses):
+    """Return {token_address: earliest pairCreatedAt} for the addresses Dexscreener knows."""
+    url = f"{DEXSCREENER_TOKENS_URL}/{chain_id}/{','.join(token_addresses)}"
+    session = get_http_session()
+    async with session.get(url) as response:
+        if response.status == 429:
+            retry_after = float(response.headers.get("Retry-After", 1))
+            get_rate_limiter("tokens").pause(retry_after)
+            raise RuntimeError(f"Rate limited by Dexscreener tokens API, retry after {retry_after}s")
+        if response.status != 200:
+            raise RuntimeError(f"Non-200 from Dex tokens API: {response.status}, URL: {url}")
+        pairs = await response.json()
+
+    wanted = {address.lower(): address for address in token_addresses}
+    created = {}
+    for pair in pairs or []:
+        address = wanted.get((pair.get("baseToken", {}).get("address") or "").lower())
+        pair_created_at = pair.get("pairCreatedAt")
+        if address and pair_created_at:
+            created[address] = min(created.get(address, pair_created_at), pair_created_at)
+    logging.debug(f"Batched pair lookup on {chain_id}: {len(token_addresses)} addresses, {len(created)} found")
+    return created
+
+
+PAIR_CREATED_AT_SCHEDULER = BatchScheduler(
+    "pair_created_at",
+    _fetch_pair_created_at_batch,
+    max_batch_size=BATCH_CONFIG.get("max_batch_size", 30),
+    max_delay=BATCH_CONFIG.get("max_delay", 0.05),
+    rate_limiter=get_rate_limiter("tokens")
+)
+
+
+async def lookup_pair_created_at(token_address, chain_id):
+    """
+    Earliest pairCreatedAt (ms) for a token, or None if Dexscreener has no pair for it.
+    Raises if the batch request fails so callers can avoid caching the miss.
+    """
+    return await PAIR_CREATED_AT_SCHEDULER.lookup(chain_id, token_address)
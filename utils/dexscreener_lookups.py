@@ -0,0 +1,86 @@
+# utils/dexscreener_lookups.py
+# Per-token Dexscreener lookups shared by the coin and token-profile pipelines. Each
+# lookup checks the in-memory response cache, then the persistent cache, and only then
+# goes to Dexscreener (batched, rate limited and coalesced with identical requests).
+
+import json
+import logging
+from utils.http_client import get_http_session
+from utils.response_cache import get_cache, MISS
+from utils.persistent_cache import load_persistent, save_persistent, PERSISTENT_CONFIG
+from utils.dexscreener_batch import lookup_pair_created_at
+from utils.request_scheduler import get_rate_limiter
+from utils.singleflight import get_singleflight
+
+# Load config
+CONFIG_FILE = "config.json"
+with open(CONFIG_FILE, "r") as file:
+    CONFIG = json.load(file)
+
+PERSISTENT_LINKS_TTL = PERSISTENT_CONFIG.get("links_extra_ttl", 86400)
+TOKEN_PROFILES_URL = CONFIG["dexscreener"].get("token_profiles_url", "https://api.dexscreener.com/token-profiles/latest/v1")
+
+# -------------------------------------------
+# Fetch DEX Pair Metadata (e.g., pairCreatedAt)
+# -------------------------------------------
+async def fetch_dexscreener_pair_metadata(token_address, chain_id):
+    if not chain_id:
+        return None
+    cache = get_cache("pair_metadata")
+    created_at = cache.get((chain_id, token_address))
+    if created_at is not MISS:
+        return created_at
+    created_at = await load_persistent("pair_metadata", [chain_id, token_address])
+    if created_at is not MISS:
+        cache.set((chain_id, token_address), created_at)
+        return created_at
+    try:
+        created_at = await lookup_pair_created_at(token_address, chain_id)
+        cache.set((chain_id, token_address), created_at, negative=created_at is None)
+        if created_at is not None:
+            # pairCreatedAt never changes, so keep it indefinitely
+            await save_persistent("pair_metadata", [chain_id, token_address], created_at)
+        return created_at
+    except Exception as e:
+        logging.warning(f"Error fetching pair metadata for {chain_id}/{token_address}: {e}")
+    return None
+
+# ------------------------------------------------------
+# Fetch DEX Token Profile (links and social media info)
+# ------------------------------------------------------
+async def fetch_dexscreener_links_extra(token_address):
+    cache = get_cache("links_extra")
+    links = cache.get(token_address)
+    if links is not MISS:
+        return links
+    links = await load_persistent("links_extra", token_address)
+    if links is not MISS:
+        cache.set(token_address, links)
+        return links
+    # Concurrent lookups of the same token share one request
+    return await get_singleflight("token_profiles").do(token_address, _request_links_extra, token_address)
+
+
+async def _request_links_extra(token_address):
+    url = f"{TOKEN_PROFILES_URL}/{token_address}"
+    cache = get_cache("links_extra")
+    try:
+        limiter = get_rate_limiter("token_profiles")
+        await limiter.acquire()
+        session = get_http_session()
+        async with session.get(url) as response:
+            if response.status == 200:
+                data = await response.json()
+                links = data.get("links")
+                cache.set(token_address, links)
+                await save_persistent("links_extra", token_address, links, ttl=PERSISTENT_LINKS_TTL)
+                return links
+            else:
+                if response.status == 404:
+                    cache.set(token_address, {}, negative=True)
+                elif response.status == 429:
+                    limiter.pause(float(response.headers.get("Retry-After", 1)))
+                logging.debug(f"Dexscreener profile not found for token: {token_address}, status: {response.status}, URL: {url}")
+    except Exception as e:
+        logging.warning(f"Error fetching token profile from {url}: {e}")
+    return {}
@@ -0,0 +1,72 @@
+# utils/http_client.py
+# Shared aiohttp session used by every Dexscreener/Binance fetcher so requests
+# reuse pooled keep-alive connections instead of paying TCP+TLS setup per call.
+
+import asyncio
+import json
+import logging
+import aiohttp
+
+# Load config
+CONFIG_FILE = "config.json"
+with open(CONFIG_FILE, "r") as file:
+    CONFIG = json.load(file)
+
+HTTP_CONFIG = CONFIG.get("http", {})
+
+_session = None
+_session_loop = None
+
+
+def _build_session():
+    connector = aiohttp.TCPConnector(
+        limit=HTTP_CONFIG.get("max_connections", 100),
+        limit_per_host=HTTP_CONFIG.get("max_connections_per_host", 20),
+        ttl_dns_cache=HTTP_CONFIG.get("dns_cache_ttl", 300),
+        keepalive_timeout=HTTP_CONFIG.get("keepalive_timeout", 30),
+    )
+    timeout = aiohttp.ClientTimeout(
+        total=HTTP_CONFIG.get("total_timeout", 15),
+        connect=HTTP_CONFIG.get("connect_timeout", 5),
+        sock_read=HTTP_CONFIG.get("read_timeout", 10),
+    )
+    return aiohttp.ClientSession(connector=connector, timeout=timeout)
+
+
+def _discard_session(session, loop):
+    """Release a session that belongs to another event loop so its connector does not leak."""
+    if session.closed:
+        return
+    if loop.is_running():
+        asyncio.run_coroutine_threadsafe(session.close(), loop)
+        return
+    # A stopped loop can no longer run the close; detach so the session counts as closed
+    session.detach()
+    logging.debug("Detached HTTP session left over from a finished event loop.")
+
+
+def get_http_session():
+    """
+    Return the process-wide HTTP session, creating it on first use.
+    A new session is built if the previous one was closed or belongs to another event
+    loop; a session left over from another loop is closed first.
+    """
+    global _session, _session_loop
+    loop = asyncio.get_running_loop()
+    if _session is None or _session.closed or _session_loop is not loop:
+        if _session is not None and _session_loop is not loop:
+            _discard_session(_session, _session_loop)
+        _session = _build_session()
+        _session_loop = loop
+        logging.debug("Created shared HTTP session.")
+    return _session
+
+
+async def close_http_session():
+    """Close the shared HTTP session and release its pooled connections."""
+    global _session, _session_loop
+    if _session is not None and not _session.closed:
+        await _session.close()
+        logging.debug("Closed shared HTTP session.")
+    _session = None
+    _session_loop = None
@@ -0,0 +1,65 @@
+# utils/listing_symbols.py
+# Pulls ticker symbols straight out of Binance listing announcement titles, so the
+# announcement page only has to be fetched when the title is ambiguous.
+
+import re
+
+# Keywords that usually indicate new listings
+LISTING_KEYWORDS = ["will list", "lists", "Binance listing", "listed on Binance"]
+
+LISTING_KEYWORD_RE = re.compile(
+    r"\b(?:" + "|".join(re.escape(keyword) for keyword in sorted(LISTING_KEYWORDS, key=len, reverse=True)) + r")\b",
+    re.IGNORECASE
+)
+# Only the clause that follows the keyword names the new listings:
+# "Binance Will List Bonk (BONK) – Binance Will Delist ABC (ABC)"
+CLAUSE_BREAK_RE = re.compile(r"\s-\s|[–—|]|\bdelist\b", re.IGNORECASE)
+# "Binance Will List Pepe (PEPE) and Floki (FLOKI)"
+PARENTHESISED_TICKER_RE = re.compile(r"\(\s*([A-Z0-9]{2,15})\s*\)")
+# Where the listed items end; later parentheses qualify something else: "USDC on TRON (TRC20)"
+PARENTHESISED_LIST_END_RE = re.compile(r"\b(?:with|in|on|for|via|at|to)\b|[:;!?]")
+# Where a bare ticker list ends: "Binance Will List ABC, DEF and GHI with Seed Tag Applied"
+LIST_END_RE = re.compile(r"\(|\b(?:with|in|on|for|via|at|to)\b|[-–—|:;!?]")
+LIST_SEPARATOR_RE = re.compile(r",|&|/|\band\b")
+TICKER_RE = re.compile(r"(?=[A-Z0-9]*[A-Z])[A-Z0-9]{2,15}")
+NOT_TICKERS = {"UTC", "NEW"}
+
+
+def is_listing_title(title):
+    return bool(LISTING_KEYWORD_RE.search(title or ""))
+
+
+def extract_listing_symbols(title):
+    """
+    Return the tickers named in a listing announcement title, in order. Only the clause
+    right after the listing keyword is read.
+    Returns [] when the title is not a listing announcement and None when it is one
+    but the tickers cannot be read reliably from the title alone.
+    """
+    keyword = LISTING_KEYWORD_RE.search(title or "")
+    if not keyword:
+        return []
+
+    remainder = title[keyword.end():]
+    clause_break = CLAUSE_BREAK_RE.search(remainder)
+    if clause_break:
+        remainder = remainder[:clause_break.start()]
+
+    list_end = PARENTHESISED_LIST_END_RE.search(remainder)
+    symbols = [
+        ticker for ticker in PARENTHESISED_TICKER_RE.findall(remainder[:list_end.start()] if list_end else remainder)
+        if TICKER_RE.fullmatch(ticker) and ticker not in NOT_TICKERS
+    ]
+    if not symbols:
+        if "(" in remainder:
+            # Parentheses that do not name the listed items make the title ambiguous
+            return None
+        # Bare tickers after the keyword; every item must look like a ticker
+        end = LIST_END_RE.search(remainder)
+        items = [item.strip() for item in LIST_SEPARATOR_RE.split(remainder[:end.start()] if end else remainder)]
+        items = [item for item in items if item]
+        if not items or not all(TICKER_RE.fullmatch(item) and item not in NOT_TICKERS for item in items):
+            return None
+        symbols = items
+
+    return list(dict.fromkeys(symbols))
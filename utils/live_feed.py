@@ -0,0 +1,133 @@
+# utils/live_feed.py
+# In-process feed the pipelines publish to and the dashboard reads from. Each channel
+# keeps its most recent events in a fixed-size ring buffer; subscribers (SSE clients)
+# get new events pushed through their own bounded queue, so a stalled viewer is
+# disconnected instead of slowing the publisher.
+
+import asyncio
+import itertools
+import json
+import logging
+import time
+from collections import deque
+
+# Load config
+CONFIG_FILE = "config.json"
+with open(CONFIG_FILE, "r") as file:
+    CONFIG = json.load(file)
+
+DASHBOARD_CONFIG = CONFIG.get("dashboard", {})
+
+CHANNELS = ("coins", "token_profiles", "alerts")
+
+
+class Subscription:
+    """Queue of (id, channel, payload) events for one viewer."""
+
+    def __init__(self, feed, channels, queue_size):
+        self.feed = feed
+        self.channels = set(channels)
+        self.queue = asyncio.Queue(maxsize=queue_size)
+        self.loop = asyncio.get_running_loop()
+        self.overflowed = False
+
+    def _offer(self, event):
+        if self.overflowed:
+            return
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # Too far behind; end the stream and let the client reconnect for a fresh snapshot
+            self.overflowed = True
+            self.feed.unsubscribe(self)
+            self.queue.get_nowait()
+            self.queue.put_nowait(None)
+
+    async def get(self):
+        """Next event, or None once the subscription has been dropped."""
+        return await self.queue.get()
+
+    def close(self):
+        self.feed.unsubscribe(self)
+
+
+class LiveFeed:
+    """Ring buffer per channel plus push fan-out to subscribers."""
+
+    def __init__(self, buffer_size=500, subscriber_queue=100):
+        self.buffers = {channel: deque(maxlen=buffer_size) for channel in CHANNELS}
+        self.subscriber_queue = subscriber_queue
+        self.subscribers = set()
+        self.published = 0
+        self._ids = itertools.count(1)
+
+    def publish(self, channel, items):
+        """
+        Record items on a channel and push them to subscribers. Safe to call from
+        worker threads; delivery is scheduled on each subscriber's event loop.
+        """
+        buffer = self.buffers[channel]
+        now = time.time()
+        events = []
+        for item in items:
+            event = (next(self._ids), channel, {"received_at": now, **item})
+            buffer.append(event)
+            events.append(event)
+        self.published += len(events)
+        if not events:
+            return
+
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        for subscriber in list(self.subscribers):
+            if channel not in subscriber.channels:
+                continue
+            for event in events:
+                if subscriber.loop is running:
+                    subscriber._offer(event)
+                elif not subscriber.loop.is_closed():
+                    subscriber.loop.call_soon_threadsafe(subscriber._offer, event)
+
+    def recent(self, channel, limit=None, after=0):
+        """Buffered events on a channel, oldest first, newer than event id `after`."""
+        events = [event for event in self.buffers[channel] if event[0] > after]
+        return events[-limit:] if limit else events
+
+    def subscribe(self, channels=CHANNELS):
+        subscription = Subscription(self, channels, self.subscriber_queue)
+        self.subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        self.subscribers.discard(subscription)
+
+    def stats(self):
+        return {
+            "published": self.published,
+            "subscribers": len(self.subscribers),
+            "buffered": {channel: len(buffer) for channel, buffer in self.buffers.items()},
+        }
+
+
+_live_feed = None
+
+
+def get_live_feed():
+    """Return the process-wide feed sized by the dashboard config block."""
+    global _live_feed
+    if _live_feed is None:
+        _live_feed = LiveFeed(
+            buffer_size=DASHBOARD_CONFIG.get("buffer_size", 500),
+            subscriber_queue=DASHBOARD_CONFIG.get("subscriber_queue", 100),
+        )
+    return _live_feed
+
+
+def publish(channel, items):
+    """Publish to the shared feed; never lets a dashboard problem break a pipeline."""
+    try:
+        get_live_feed().publish(channel, items)
+    except Exception as e:
+        logging.error(f"❌ Failed to publish to live feed {channel}: {e}")
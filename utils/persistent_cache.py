@@ -0,0 +1,126 @@
+# utils/persistent_cache.py
+# Optional SQLite-backed lookup cache that survives restarts, so a freshly started
+# process does not re-enrich every token against the Dexscreener API.
+
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from utils.response_cache import MISS
+
+# Load config
+CONFIG_FILE = "config.json"
+with open(CONFIG_FILE, "r") as file:
+    CONFIG = json.load(file)
+
+PERSISTENT_CONFIG = CONFIG.get("cache", {}).get("persistent", {})
+
+
+class PersistentCache:
+    """Key/value store in SQLite; entries without a TTL never expire."""
+
+    def __init__(self, path):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS lookup_cache (
+                namespace TEXT NOT NULL,
+                key TEXT NOT NULL,
+                value TEXT NOT NULL,
+                expires_at REAL,
+                PRIMARY KEY (namespace, key)
+            )
+        """)
+        self._conn.commit()
+
+    def get(self, namespace, key):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM lookup_cache WHERE namespace = ? AND key = ?",
+                (namespace, json.dumps(key))
+            ).fetchone()
+        if row is None:
+            return MISS
+        value, expires_at = row
+        if expires_at is not None and expires_at <= time.time():
+            return MISS
+        return json.loads(value)
+
+    def set(self, namespace, key, value, ttl=None):
+        expires_at = time.time() + ttl if ttl is not None else None
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO lookup_cache (namespace, key, value, expires_at) VALUES (?, ?, ?, ?)",
+                (namespace, json.dumps(key), json.dumps(value), expires_at)
+            )
+            self._conn.commit()
+
+    def purge_expired(self):
+        with self._lock:
+            deleted = self._conn.execute(
+                "DELETE FROM lookup_cache WHERE expires_at IS NOT NULL AND expires_at <= ?", (time.time(),)
+            ).rowcount
+            self._conn.commit()
+        return deleted
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+_persistent_cache = None
+_open_lock = threading.Lock()
+
+
+def get_persistent_cache():
+    """Return the shared persistent cache, or None when disabled in config. Blocking."""
+    global _persistent_cache
+    if not PERSISTENT_CONFIG.get("enabled", False):
+        return None
+    with _open_lock:
+        if _persistent_cache is None:
+            _persistent_cache = PersistentCache(PERSISTENT_CONFIG.get("path", "cache/lookup_cache.sqlite3"))
+            purged = _persistent_cache.purge_expired()
+            logging.info(f"Opened persistent lookup cache at {_persistent_cache.path} ({purged} expired entries purged).")
+    return _persistent_cache
+
+
+def _load(namespace, key):
+    return get_persistent_cache().get(namespace, key)
+
+
+def _save(namespace, key, value, ttl):
+    get_persistent_cache().set(namespace, key, value, ttl)
+
+
+async def load_persistent(namespace, key):
+    """
+    Cached value for `key`, or MISS if absent, expired or the cache is disabled.
+    SQLite work runs on a worker thread so it never blocks the event loop.
+    """
+    if not PERSISTENT_CONFIG.get("enabled", False):
+        return MISS
+    try:
+        return await asyncio.to_thread(_load, namespace, key)
+    except Exception as e:
+        logging.warning(f"Persistent cache read failed for {namespace}: {e}")
+        return MISS
+
+
+async def save_persistent(namespace, key, value, ttl=None):
+    """Store `value` off the event loop; `ttl=None` keeps it indefinitely (for immutable facts)."""
+    if not PERSISTENT_CONFIG.get("enabled", False):
+        return
+    try:
+        await asyncio.to_thread(_save, namespace, key, value, ttl)
+    except Exception as e:
+        logging.warning(f"Persistent cache write failed for {namespace}: {e}")
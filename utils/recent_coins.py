@@ -0,0 +1,113 @@
+# utils/recent_coins.py
+# Bounded in-process view of the most recently created coins, per source. Loaded from
+# the database on first use (and again once the snapshot is older than `ttl`), then kept
+# current write-through by store_coins, so readers never query the database directly.
+
+import heapq
+import itertools
+import logging
+import threading
+import time
+from bisect import insort
+from datetime import datetime
+
+
+def _created_at(value):
+    if isinstance(value, datetime):
+        return value
+    if isinstance(value, str):
+        try:
+            return datetime.fromisoformat(value)
+        except ValueError:
+            pass
+    return datetime.min
+
+
+class RecentCoinsCache:
+    """
+    Newest `max_per_source` coins for each source, ordered by created_at. A coin is
+    identified by (source, symbol, token_address); storing it again replaces the old
+    entry. With `ttl` set, the first read after the snapshot expires reloads it from
+    `loader`, picking up rows written by other processes.
+    """
+
+    def __init__(self, loader, max_per_source=200, ttl=300):
+        self.loader = loader
+        self.max_per_source = max_per_source
+        self.ttl = ttl
+        self.loaded_at = None
+        self.hits = 0
+        self.reloads = 0
+        self._lock = threading.Lock()
+        self._by_source = {}
+        self._entries = {}
+        # Tie-breaker so entries with equal created_at never compare their dicts
+        self._sequence = itertools.count()
+
+    def _add(self, coin, created_at):
+        source = coin.get("source")
+        key = (source, coin.get("symbol"), coin.get("token_address"))
+        entries = self._by_source.setdefault(source, [])
+
+        previous = self._entries.get(key)
+        if previous is not None:
+            entries.remove(previous)
+        entry = (created_at, next(self._sequence), key, coin)
+        insort(entries, entry)
+        self._entries[key] = entry
+
+        while len(entries) > self.max_per_source:
+            del self._entries[entries.pop(0)[2]]
+
+    def add_many(self, coins):
+        """Write-through: record coins that have just been committed."""
+        batches = {}
+        for coin in coins:
+            batches.setdefault(coin.get("source"), []).append((_created_at(coin.get("created_at")), coin))
+        with self._lock:
+            for batch in batches.values():
+                # Only the newest max_per_source of a large batch can survive eviction
+                if len(batch) > self.max_per_source:
+                    batch = heapq.nlargest(self.max_per_source, batch, key=lambda item: item[0])
+                    batch.reverse()
+                for created_at, coin in batch:
+                    self._add(coin, created_at)
+
+    def stale(self):
+        if self.loaded_at is None:
+            return True
+        return self.ttl is not None and time.monotonic() - self.loaded_at >= self.ttl
+
+    def reload(self):
+        """Replace the contents with the loader's rows."""
+        coins = self.loader()
+        with self._lock:
+            self._by_source = {}
+            self._entries = {}
+        self.add_many(coins)
+        with self._lock:
+            self.loaded_at = time.monotonic()
+            self.reloads += 1
+        logging.info(f"Recent coins cache loaded with {len(coins)} coins.")
+
+    def invalidate(self):
+        self.loaded_at = None
+
+    def get(self, source=None, limit=None):
+        """Cached coins newest first, optionally for one source only."""
+        if self.stale():
+            try:
+                self.reload()
+            except Exception as e:
+                logging.error(f"Error loading recent coins: {e}")
+        else:
+            self.hits += 1
+        with self._lock:
+            if source is not None:
+                newest_first = reversed(self._by_source.get(source, []))
+            else:
+                newest_first = heapq.merge(*(reversed(entries) for entries in self._by_source.values()), reverse=True)
+            return [dict(entry[3]) for entry in itertools.islice(newest_first, limit)]
+
+    def __len__(self):
+        return len(self._entries)
@@ -0,0 +1,141 @@
+# utils/request_scheduler.py
+# Token-bucket rate limiting per endpoint and coalescing of single-key lookups
+# into multi-key requests for APIs that accept comma-separated key lists.
+
+import asyncio
+import json
+import logging
+import time
+
+# Load config
+CONFIG_FILE = "config.json"
+with open(CONFIG_FILE, "r") as file:
+    CONFIG = json.load(file)
+
+RATE_LIMIT_CONFIG = CONFIG.get("rate_limits", {})
+
+
+class TokenBucket:
+    """Allows `rate` requests per second on average with bursts of up to `capacity`."""
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated_at = time.monotonic()
+        self.paused_until = 0.0
+        self.waits = 0
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+        return now
+
+    async def acquire(self):
+        while True:
+            now = self._refill()
+            if now < self.paused_until:
+                delay = self.paused_until - now
+            elif self.tokens >= 1:
+                self.tokens -= 1
+                return
+            else:
+                delay = (1 - self.tokens) / self.rate
+            self.waits += 1
+            await asyncio.sleep(delay)
+
+    def pause(self, seconds):
+        """Stop handing out tokens for `seconds`, e.g. after a 429 response."""
+        self._refill()
+        self.tokens = 0
+        self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+
+
+_rate_limiters = {}
+
+
+def get_rate_limiter(endpoint):
+    """Return the shared token bucket for `endpoint`, configured from the `rate_limits` block."""
+    limiter = _rate_limiters.get(endpoint)
+    if limiter is None:
+        settings = {**RATE_LIMIT_CONFIG.get("default", {}), **RATE_LIMIT_CONFIG.get(endpoint, {})}
+        rate = settings.get("rate", 5)
+        limiter = TokenBucket(rate, settings.get("burst", rate))
+        _rate_limiters[endpoint] = limiter
+    return limiter
+
+
+class BatchScheduler:
+    """
+    Coalesces concurrent `lookup(group, key)` calls into `fetch_batch(group, keys)` calls of
+    up to `max_batch_size` keys. A partial batch is sent after `max_delay` seconds.
+    `fetch_batch` returns a dict of key -> result; keys missing from it resolve to None.
+    """
+
+    def __init__(self, name, fetch_batch, max_batch_size=30, max_delay=0.05, rate_limiter=None):
+        self.name = name
+        self.fetch_batch = fetch_batch
+        self.max_batch_size = max_batch_size
+        self.max_delay = max_delay
+        self.rate_limiter = rate_limiter
+        self.batches_sent = 0
+        self.keys_requested = 0
+        self._pending = {}
+        self._timers = {}
+        # The loop only keeps weak references to tasks, so hold in-flight sends here
+        self._sending = set()
+        self._loop = None
+
+    async def lookup(self, group, key):
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._pending = {}
+            self._timers = {}
+            self._sending = set()
+            self._loop = loop
+
+        pending = self._pending.setdefault(group, {})
+        waiters = pending.get(key)
+        if waiters is None:
+            waiters = pending[key] = []
+        future = loop.create_future()
+        waiters.append(future)
+
+        if len(pending) >= self.max_batch_size:
+            self._dispatch(group)
+        elif group not in self._timers:
+            self._timers[group] = loop.call_later(self.max_delay, self._dispatch, group)
+        return await future
+
+    def _dispatch(self, group):
+        timer = self._timers.pop(group, None)
+        if timer is not None:
+            timer.cancel()
+        pending = self._pending.pop(group, {})
+        keys = list(pending)
+        for start in range(0, len(keys), self.max_batch_size):
+            batch = {key: pending[key] for key in keys[start:start + self.max_batch_size]}
+            task = self._loop.create_task(self._send(group, batch))
+            self._sending.add(task)
+            task.add_done_callback(self._sending.discard)
+
+    async def _send(self, group, batch):
+        try:
+            if self.rate_limiter is not None:
+                await self.rate_limiter.acquire()
+            self.batches_sent += 1
+            self.keys_requested += len(batch)
+            results = await self.fetch_batch(group, list(batch))
+        except Exception as e:
+            logging.warning(f"Batch lookup {self.name} failed for {len(batch)} keys: {e}")
+            for waiters in batch.values():
+                for future in waiters:
+                    if not future.done():
+                        future.set_exception(e)
+            return
+
+        for key, waiters in batch.items():
+            for future in waiters:
+                if not future.done():
+                    future.set_result(results.get(key))
@@ -0,0 +1,112 @@
+# utils/response_cache.py
+# Bounded in-memory TTL/LRU cache for API lookups, one cache per endpoint.
+# Negative results (e.g. 404 "no profile") are kept for a shorter TTL.
+
+import copy
+import json
+import logging
+import time
+from collections import OrderedDict
+
+# Load config
+CONFIG_FILE = "config.json"
+with open(CONFIG_FILE, "r") as file:
+    CONFIG = json.load(file)
+
+CACHE_CONFIG = CONFIG.get("cache", {})
+
+MISS = object()
+
+
+class TTLCache:
+    """LRU cache whose entries expire after `ttl` seconds (`negative_ttl` for negative results)."""
+
+    def __init__(self, name, max_entries=10_000, ttl=300, negative_ttl=60):
+        self.name = name
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key):
+        """Return the cached value, or MISS when absent or expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return MISS
+
+        value, expires_at, negative = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            self.expirations += 1
+            self.misses += 1
+            return MISS
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        if negative:
+            self.negative_hits += 1
+        return copy.deepcopy(value)
+
+    def set(self, key, value, negative=False):
+        ttl = self.negative_ttl if negative else self.ttl
+        self._entries[key] = (copy.deepcopy(value), time.monotonic() + ttl, negative)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "hits": self.hits,
+            "negative_hits": self.negative_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+    def __len__(self):
+        return len(self._entries)
+
+
+_caches = {}
+
+
+def get_cache(endpoint):
+    """Return the shared cache for `endpoint`, configured from the `cache` block in config."""
+    cache = _caches.get(endpoint)
+    if cache is None:
+        settings = {**CACHE_CONFIG.get("default", {}), **CACHE_CONFIG.get(endpoint, {})}
+        cache = TTLCache(
+            endpoint,
+            max_entries=settings.get("max_entries", 10_000),
+            ttl=settings.get("ttl", 300),
+            negative_ttl=settings.get("negative_ttl", 60),
+        )
+        _caches[endpoint] = cache
+    return cache
+
+
+def cache_stats():
+    """Hit/miss/eviction statistics for every endpoint cache."""
+    return {name: cache.stats() for name, cache in _caches.items()}
+
+
+def log_cache_stats():
+    for name, stats in cache_stats().items():
+        logging.info(
+            f"Cache {name}: size {stats['size']}, hits {stats['hits']} "
+            f"({stats['negative_hits']} negative), misses {stats['misses']}, "
+            f"evictions {stats['evictions']}, hit rate {stats['hit_rate']:.1%}"
+        )
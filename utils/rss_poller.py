@@ -0,0 +1,193 @@
+# utils/rss_poller.py
+# Conditional-GET RSS polling. Each poller remembers the feed's ETag/Last-Modified and
+# the GUIDs the caller has acknowledged as handled, persisted to disk so a restart does
+# not replay old announcements. Unchanged feeds (304) are neither downloaded nor parsed.
+
+import asyncio
+import json
+import logging
+import os
+from collections import OrderedDict
+import feedparser
+from utils.http_client import get_http_session
+
+# Load config
+CONFIG_FILE = "config.json"
+with open(CONFIG_FILE, "r") as file:
+    CONFIG = json.load(file)
+
+RSS_CONFIG = CONFIG.get("rss", {})
+
+
+def entry_guid(entry):
+    return entry.get("id") or entry.get("guid") or entry.get("link") or entry.get("title")
+
+
+class RSSPoller:
+    """
+    Polls one feed and returns the entries that have not been acknowledged yet. An
+    entry stays pending until the caller passes its GUID to acknowledge(), and is
+    returned again on later polls (up to `max_attempts` times) if it never is. While
+    entries are pending the feed is fetched unconditionally and the validators are not
+    persisted, so neither a 304 nor a restart can hide them.
+    """
+
+    def __init__(self, url, state_path, max_seen=5000, max_attempts=5):
+        self.url = url
+        self.state_path = state_path
+        self.max_seen = max_seen
+        self.max_attempts = max_attempts
+        self.etag = None
+        self.modified = None
+        self.seen = OrderedDict()
+        self.pending = {}
+        self.not_modified = 0
+        self._load_state()
+
+    # --------------------------------------------------------
+    # Persisted state
+    # --------------------------------------------------------
+    def _load_state(self):
+        try:
+            with open(self.state_path, "r") as f:
+                state = json.load(f)
+        except FileNotFoundError:
+            return
+        except ValueError as e:
+            logging.warning(f"Ignoring unreadable RSS state {self.state_path}: {e}")
+            return
+        if state.get("url") != self.url:
+            return
+        self.etag = state.get("etag")
+        self.modified = state.get("modified")
+        self.seen = OrderedDict.fromkeys(state.get("seen", []))
+
+    def _save_state(self):
+        directory = os.path.dirname(self.state_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.state_path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({
+                "url": self.url,
+                "etag": None if self.pending else self.etag,
+                "modified": None if self.pending else self.modified,
+                "seen": list(self.seen),
+            }, f)
+        os.replace(tmp_path, self.state_path)
+
+    def reset(self):
+        """Forget validators and seen entries, including the persisted copy."""
+        self.etag = None
+        self.modified = None
+        self.seen.clear()
+        self.pending.clear()
+        try:
+            os.remove(self.state_path)
+        except FileNotFoundError:
+            pass
+
+    def _mark_seen(self, guids):
+        for guid in guids:
+            self.pending.pop(guid, None)
+            self.seen[guid] = None
+        while len(self.seen) > self.max_seen:
+            self.seen.popitem(last=False)
+
+    def _take_new(self, entries):
+        new_entries = []
+        pending = {}
+        for entry in entries:
+            guid = entry_guid(entry)
+            if guid is None or guid in self.seen or guid in pending:
+                continue
+            attempts = self.pending.get(guid, 0) + 1
+            if attempts > self.max_attempts:
+                logging.warning(f"⚠️ Giving up on RSS entry {guid} after {self.max_attempts} unacknowledged polls")
+                self._mark_seen([guid])
+                continue
+            pending[guid] = attempts
+            new_entries.append(entry)
+        # Entries that dropped off the feed can no longer be retried
+        self.pending = pending
+        return new_entries
+
+    def acknowledge_sync(self, guids):
+        """Mark entries as handled so later polls skip them."""
+        guids = [guid for guid in guids if guid is not None]
+        if guids:
+            self._mark_seen(guids)
+            self._save_state()
+
+    async def acknowledge(self, guids):
+        guids = [guid for guid in guids if guid is not None]
+        if guids:
+            self._mark_seen(guids)
+            await asyncio.to_thread(self._save_state)
+
+    # --------------------------------------------------------
+    # Polling
+    # --------------------------------------------------------
+    async def poll(self):
+        """
+        Fetch the feed with If-None-Match/If-Modified-Since and return unacknowledged
+        entries. Parsing and state writes run in a worker thread, off the event loop.
+        """
+        headers = {}
+        if self.etag and not self.pending:
+            headers["If-None-Match"] = self.etag
+        if self.modified and not self.pending:
+            headers["If-Modified-Since"] = self.modified
+
+        session = get_http_session()
+        async with session.get(self.url, headers=headers) as response:
+            if response.status == 304:
+                self.not_modified += 1
+                logging.debug(f"RSS feed unchanged: {self.url}")
+                return []
+            response.raise_for_status()
+            body = await response.read()
+            etag = response.headers.get("ETag")
+            modified = response.headers.get("Last-Modified")
+
+        feed = await asyncio.to_thread(feedparser.parse, body)
+        if feed.bozo and not feed.entries:
+            raise ValueError(f"Unparseable RSS feed: {feed.bozo_exception}")
+
+        self.etag, self.modified = etag, modified
+        new_entries = self._take_new(feed.entries)
+        await asyncio.to_thread(self._save_state)
+        return new_entries
+
+    def poll_sync(self):
+        """Blocking variant for synchronous callers, using feedparser's own etag/modified support."""
+        if self.pending:
+            feed = feedparser.parse(self.url)
+        else:
+            feed = feedparser.parse(self.url, etag=self.etag, modified=self.modified)
+        if feed.get("status") == 304:
+            self.not_modified += 1
+            logging.debug(f"RSS feed unchanged: {self.url}")
+            return []
+        if feed.bozo and not feed.entries:
+            raise ValueError(f"Unparseable RSS feed: {feed.bozo_exception}")
+
+        self.etag = feed.get("etag")
+        self.modified = feed.get("modified")
+        new_entries = self._take_new(feed.entries)
+        self._save_state()
+        return new_entries
+
+
+_pollers = {}
+
+
+def get_rss_poller(name, url):
+    """Return the poller for `name`; each name keeps its own seen-entry store."""
+    poller = _pollers.get(name)
+    if poller is None or poller.url != url:
+        state_dir = RSS_CONFIG.get("state_dir", "cache/rss")
+        poller = RSSPoller(url, os.path.join(state_dir, f"{name}.json"), RSS_CONFIG.get("max_seen", 5000),
+                           RSS_CONFIG.get("max_attempts", 5))
+        _pollers[name] = poller
+    return poller
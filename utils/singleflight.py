@@ -0,0 +1,72 @@
+# utils/singleflight.py
+# In-flight request registry: concurrent callers asking for the same endpoint and
+# arguments share one outstanding request instead of each sending their own.
+
+import asyncio
+import copy
+import logging
+
+
+class SingleFlight:
+    """Coalesces concurrent calls with the same key onto one running call."""
+
+    def __init__(self, name):
+        self.name = name
+        self._in_flight = {}
+        self.calls = 0
+        self.coalesced = 0
+
+    async def do(self, key, func, *args):
+        """
+        Await func(*args), or join the identical call already running for `key`.
+        Joined callers get a deep copy of the result so they can mutate it freely;
+        an exception is raised to every caller. Cancelling one caller does not cancel
+        the shared call while others are still waiting on it.
+        """
+        self.calls += 1
+        loop = asyncio.get_running_loop()
+        entry = self._in_flight.get(key)
+        if entry is not None and entry.get_loop() is loop:
+            self.coalesced += 1
+            return copy.deepcopy(await asyncio.shield(entry))
+
+        task = loop.create_task(func(*args))
+        self._in_flight[key] = task
+        task.add_done_callback(lambda done: self._forget(key, done))
+        return await asyncio.shield(task)
+
+    def _forget(self, key, task):
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        if not task.cancelled():
+            # Mark the exception as retrieved when every caller has gone away
+            task.exception()
+
+    def stats(self):
+        return {
+            "calls": self.calls,
+            "coalesced": self.coalesced,
+            "in_flight": len(self._in_flight),
+        }
+
+
+_groups = {}
+
+
+def get_singleflight(endpoint):
+    """Return the shared in-flight registry for an endpoint."""
+    group = _groups.get(endpoint)
+    if group is None:
+        group = SingleFlight(endpoint)
+        _groups[endpoint] = group
+    return group
+
+
+def singleflight_stats():
+    """Call and coalesced-call counts for every endpoint."""
+    return {name: group.stats() for name, group in _groups.items()}
+
+
+def log_singleflight_stats():
+    for name, stats in singleflight_stats().items():
+        logging.info(f"Singleflight {name}: {stats['coalesced']} of {stats['calls']} calls coalesced")
@@ -0,0 +1,85 @@
+# utils/symbol_index.py
+# In-process index of already-listed symbols so dedup needs no database round trip.
+
+import hashlib
+import logging
+import math
+import threading
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings; may report false positives, never false negatives."""
+
+    def __init__(self, capacity, error_rate=0.0001):
+        self.num_bits = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self.bits = bytearray((self.num_bits + 7) // 8)
+
+    def _positions(self, item):
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        return ((first + i * second) % self.num_bits for i in range(self.num_hashes))
+
+    def add(self, item):
+        for position in self._positions(item):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, item):
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+
+class SymbolIndex:
+    """
+    Set of known symbols, warmed once from `loader` and updated as new symbols are stored.
+    With `use_bloom=True` only a Bloom filter is kept, trading a small false-positive
+    rate (a new symbol mistaken for a known one) for constant memory on large universes.
+    """
+
+    def __init__(self, loader, use_bloom=False, bloom_capacity=1_000_000, bloom_error_rate=0.0001):
+        self.loader = loader
+        self.use_bloom = use_bloom
+        self.bloom_capacity = bloom_capacity
+        self.bloom_error_rate = bloom_error_rate
+        self.warmed = False
+        self.size = 0
+        self._lock = threading.Lock()
+        self._symbols = self._empty()
+
+    def _empty(self):
+        if self.use_bloom:
+            return BloomFilter(self.bloom_capacity, self.bloom_error_rate)
+        return set()
+
+    def warm(self):
+        """Replace the index contents with the symbols returned by the loader."""
+        symbols = self._empty()
+        count = 0
+        for symbol in self.loader():
+            symbols.add(symbol)
+            count += 1
+        with self._lock:
+            self._symbols = symbols
+            self.size = count
+            self.warmed = True
+        logging.info(f"Symbol index warmed with {count} symbols.")
+
+    def add_many(self, symbols):
+        with self._lock:
+            for symbol in symbols:
+                if symbol not in self._symbols:
+                    self._symbols.add(symbol)
+                    self.size += 1
+
+    def snapshot(self):
+        """Copy of the known symbols; only available for the exact (non-Bloom) index."""
+        if self.use_bloom:
+            raise TypeError("A Bloom-filter symbol index cannot enumerate its symbols")
+        with self._lock:
+            return set(self._symbols)
+
+    def __contains__(self, symbol):
+        return symbol in self._symbols
+
+    def __len__(self):
+        return self.size